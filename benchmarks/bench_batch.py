@@ -0,0 +1,66 @@
+"""
+Throughput of visionslide batch: one process versus a pool of processes.
+
+Generates a video (or uses --video), then extracts its timeline with one
+detector process and again with --workers processes (default: one per
+core), with the real GestureDetector. Reports frames per second overall
+and per core, and the measured speedup of the pool over one process.
+
+Usage: python benchmarks/bench_batch.py [--video PATH] [--seconds S] [--workers N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.pipeline.batch import BatchProcessor
+
+
+def make_video(path, seconds, size=(640, 480), fps=30):
+    """Moving noise blobs: MediaPipe searches for a palm on every frame."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, size)
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+    for index in range(int(seconds * fps)):
+        writer.write(np.roll(background, index * 4, axis=1))
+    writer.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--video', help="video file to process (default: a generated one)")
+    parser.add_argument('--seconds', type=float, default=60.0, help="length of the generated video")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk-seconds', type=float, default=10.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        video = args.video
+        if video is None:
+            video = os.path.join(directory, "talk.avi")
+            make_video(video, args.seconds)
+
+        reports = {}
+        for workers in sorted({1, args.workers}):
+            processor = BatchProcessor(workers=workers, chunk_seconds=args.chunk_seconds)
+            start = time.perf_counter()
+            report = processor.run([video], os.path.join(directory, f"out{workers}"))
+            reports[workers] = time.perf_counter() - start
+            print(f"{workers:>2} process(es): {report['frames']} frames in {report['seconds']:.1f}s, "
+                  f"{report['fps']:.1f} FPS overall, {report['fps_per_core']:.1f} FPS per core, "
+                  f"{report['cores_busy']:.2f} cores busy, "
+                  f"{report['chunks']} chunks, {report['processed'] - report['frames']} warm-up frames")
+
+        if len(reports) > 1:
+            print(f"measured speedup with {args.workers} processes: "
+                  f"{reports[1] / reports[args.workers]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Micro-benchmark for gesture classification, rules versus trained model.
+
+Times classify_landmarks and GestureClassifier.predict per sample, one
+hand at a time (live frames) and in batches (recorded sessions), and
+how long a saved model takes to load. The model is trained on random
+hands: its accuracy is meaningless here, only its cost is measured.
+
+Usage: python benchmarks/bench_classifier.py [--samples N] [--hidden H]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.gestures.classifier import GestureClassifier
+from visionslide.gestures.landmarks import classify_landmarks
+
+BATCH_SIZES = [1, 32, 1024]
+
+
+def per_sample(func, hands, batch_size, repeat=3):
+    """Best of repeat: microseconds per hand through func in batches."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(0, len(hands), batch_size):
+            func(hands[i:i + batch_size])
+        best = min(best, time.perf_counter() - start)
+    return best / len(hands) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--samples', type=int, default=4096)
+    parser.add_argument('--hidden', type=int, default=32)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    hands = rng.random((args.samples, 21, 3), dtype=np.float32)
+    labels = np.array(["pointing", "open_hand", "unknown"], dtype=object)[rng.integers(0, 3, args.samples)]
+    classifier = GestureClassifier.train(hands[:1024], labels[:1024], hidden=args.hidden, epochs=50)
+
+    print(f"{'batch':>6} {'rules us':>9} {'model us':>9}")
+    for batch_size in BATCH_SIZES:
+        rules = per_sample(classify_landmarks, hands, batch_size)
+        model = per_sample(classifier.predict, hands, batch_size)
+        print(f"{batch_size:>6} {rules:>9.2f} {model:>9.2f}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "model.npz")
+        classifier.save(path)
+        start = time.perf_counter()
+        GestureClassifier.load(path)
+        print(f"Model load: {(time.perf_counter() - start) * 1000:.2f} ms "
+              f"({os.path.getsize(path) / 1024:.1f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Micro-benchmark for the color conversion done around hands.process.
+
+Compares the old BGR -> RGB -> BGR round trip (two fresh full-frame
+arrays per frame) with the conversion into GestureDetector's reusable
+RGB buffer, at 640x480 and 1280x720.
+
+Usage: python benchmarks/bench_color_conversion.py [--frames N]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RESOLUTIONS = [(640, 480), (1280, 720)]
+
+
+def round_trip(frame, _state):
+    """Old detect_gestures path."""
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    rgb_frame.flags.writeable = False
+    rgb_frame.flags.writeable = True
+    return cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
+
+
+def preallocated(frame, state):
+    """New detect_landmarks path (same logic as GestureDetector._to_rgb)."""
+    buffer = state.get('rgb')
+    if buffer is None or buffer.shape != frame.shape:
+        buffer = state['rgb'] = np.empty_like(frame)
+    buffer.flags.writeable = True
+    cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=buffer)
+    buffer.flags.writeable = False
+    return buffer
+
+
+def measure(func, frame, n_frames):
+    """Return (microseconds per frame, bytes and arrays allocated per frame)."""
+    state = {}
+    func(frame, state)  # Warm-up, allocates the persistent buffer
+
+    start = time.perf_counter()
+    for _ in range(n_frames):
+        func(frame, state)
+    elapsed = time.perf_counter() - start
+
+    # Allocation count: sum of the per-frame peaks above the baseline
+    tracemalloc.start()
+    allocated = 0
+    for _ in range(n_frames):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        func(frame, state)
+        _, peak = tracemalloc.get_traced_memory()
+        allocated += peak - baseline
+    tracemalloc.stop()
+
+    per_frame = allocated / n_frames
+    return elapsed / n_frames * 1e6, per_frame, per_frame / frame.nbytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'resolution':>11} {'path':>12} {'us/frame':>9} {'KiB/frame':>10} {'full frames':>13}")
+    for width, height in RESOLUTIONS:
+        frame = np.random.randint(0, 256, (height, width, 3), dtype=np.uint8)
+        for name, func in (('round trip', round_trip), ('prealloc', preallocated)):
+            us, nbytes, buffers = measure(func, frame, args.frames)
+            print(f"{width:>6}x{height:<4} {name:>12} {us:>9.1f} {nbytes / 1024:>10.1f} {buffers:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
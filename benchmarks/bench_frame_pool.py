@@ -0,0 +1,122 @@
+"""
+Allocation benchmark for capture: fresh frames versus the FramePool.
+
+Decodes a generated video in a loop, the way the pipeline consumes a
+camera: each frame gets a per-frame record, is converted to RGB for
+inference, and stays held by a few in-flight packets before it is
+dropped (fresh) or released back to the pool (pooled). The "fresh" path is the former one (cap.read() allocating, a
+dict per packet, a new RGB array); the "pooled" path reads into
+FramePool buffers, uses the __slots__ Frame record and converts into a
+reused RGB buffer. tracemalloc reports the bytes allocated per frame and
+the traced memory every --report frames, which stays flat when the
+steady state allocates nothing.
+
+Usage: python benchmarks/bench_frame_pool.py [--frames N] [--report N]
+"""
+import argparse
+import collections
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.camera.frame_pool import FramePool
+from visionslide.pipeline.frame import Frame
+
+IN_FLIGHT = 6  # Packets queued or being processed at once in the pipeline
+
+
+def make_video(path, frames=60, size=(640, 480)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, size)
+    rng = np.random.default_rng(0)
+    for _ in range(frames):
+        writer.write(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8))
+    writer.release()
+
+
+def fresh(cap, state, seq):
+    ret, image = cap.read()
+    if not ret:
+        return None
+    packet = {'seq': seq, 't_capture': time.monotonic(), 'frame': image, 'gesture': "no_hand"}
+    packet['rgb'] = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    return packet
+
+
+def pooled(cap, state, seq):
+    pool = state.setdefault('pool', FramePool())
+    ret, image = pool.read(cap)
+    if not ret:
+        return None
+    packet = Frame(seq, time.monotonic(), 0.0, image, pool=pool)
+    rgb = state.get('rgb')
+    if rgb is None or rgb.shape != image.shape:
+        rgb = state['rgb'] = np.empty_like(image)
+    cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb)
+    return packet
+
+
+def run(func, video, n_frames, report):
+    cap = cv2.VideoCapture(video)
+    state = {}
+    in_flight = collections.deque()
+
+    def step(seq):
+        packet = func(cap, state, seq)
+        if packet is None:
+            # End of the video: loop
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            packet = func(cap, state, seq)
+        if len(in_flight) == IN_FLIGHT:
+            done = in_flight.popleft()
+            if isinstance(done, Frame) and done.pool:
+                done.pool.release(done.image)
+        in_flight.append(packet)
+
+    for seq in range(IN_FLIGHT * 2):  # Warm-up: fill the pool and the pipeline
+        step(seq)
+
+    tracemalloc.start()
+    allocated = 0
+    samples = []
+    start = time.perf_counter()
+    for seq in range(n_frames):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        step(seq)
+        _, peak = tracemalloc.get_traced_memory()
+        allocated += peak - baseline
+        if (seq + 1) % report == 0:
+            samples.append(tracemalloc.get_traced_memory()[0])
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    cap.release()
+    return allocated / n_frames, samples, elapsed / n_frames, state.get('pool')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=3000)
+    parser.add_argument('--report', type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        video = os.path.join(directory, "session.avi")
+        make_video(video)
+        for name, func in (('fresh', fresh), ('pooled', pooled)):
+            per_frame, samples, seconds, pool = run(func, video, args.frames, args.report)
+            traced = " ".join(f"{sample / 1024:.0f}" for sample in samples)
+            print(f"{name:>7}: {per_frame / 1024:8.1f} KiB allocated/frame, {seconds * 1e3:.2f} ms/frame")
+            print(f"{'':>9}traced KiB every {args.report} frames: {traced}")
+            if pool:
+                print(f"{'':>9}pool: {pool.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
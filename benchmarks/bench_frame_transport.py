@@ -0,0 +1,102 @@
+"""
+Benchmark of handing camera frames to a detector process.
+
+Sends N frames to a child process running a no-op detector and waits for
+each result, either by pickling the frame through a multiprocessing
+Queue or through a shared memory FrameRing (ProcessDetector), and
+reports the round trip per frame. The difference is what moving
+MediaPipe out of the main process costs on top of the inference itself.
+
+Usage: python benchmarks/bench_frame_transport.py [--frames N] [--width W] [--height H]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.pipeline.process_detector import ProcessDetector
+
+
+class NullDetector:
+    last_handedness = (None, 0.0)
+
+    def detect_landmarks(self, frame):
+        return None
+
+    def get_landmark_array(self, hand_landmarks):
+        return None
+
+    def release(self):
+        pass
+
+
+def null_detector_factory():
+    return NullDetector()
+
+
+def _queue_worker(tasks, results):
+    detector = NullDetector()
+    while True:
+        frame = tasks.get()
+        if frame is None:
+            break
+        results.put(detector.detect_landmarks(frame))
+
+
+def bench_queue(frames):
+    context = multiprocessing.get_context("spawn")
+    tasks, results = context.Queue(), context.Queue()
+    process = context.Process(target=_queue_worker, args=(tasks, results), daemon=True)
+    process.start()
+    tasks.put(frames[0])
+    results.get()  # Warm-up: process started
+
+    start = time.perf_counter()
+    for frame in frames:
+        tasks.put(frame)
+        results.get()
+    elapsed = time.perf_counter() - start
+    tasks.put(None)
+    process.join()
+    return elapsed / len(frames)
+
+
+def bench_ring(frames):
+    detector = ProcessDetector(slots=4, detector_factory=null_detector_factory)
+    detector.detect_landmarks(frames[0])
+
+    ring = detector.frame_ring(frames[0].shape)
+    start = time.perf_counter()
+    for frame in frames:
+        slot = ring.put(frame)
+        detector.detect_slot(slot)
+        ring.release(slot)
+    elapsed = time.perf_counter() - start
+    detector.release()
+    return elapsed / len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=500)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 255, (args.height, args.width, 3), dtype=np.uint8)
+              for _ in range(min(args.frames, 16))]
+    frames = (frames * (args.frames // len(frames) + 1))[:args.frames]
+
+    print(f"{args.frames} frames of {args.width}x{args.height}, round trip to a no-op detector process")
+    for name, bench in (("pickled queue", bench_queue), ("shared memory ring", bench_ring)):
+        print(f"  {name:<20} {bench(frames) * 1000:7.3f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark of the multi-camera inference server against the worker count.
+
+Feeds S synthetic 30 FPS streams (or copies of a recorded video) to an
+InferenceServer with the real GestureDetector, for 1..N workers, and
+reports total throughput, per-stream FPS and capture-to-result latency.
+With more streams than the pool can serve, throughput should grow with
+the number of workers up to the number of physical cores.
+
+Usage: python benchmarks/bench_inference_server.py [--streams S] [--workers 1,2,4]
+                                                   [--seconds T] [--video FILE]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.config import FRAME_WIDTH, FRAME_HEIGHT
+from visionslide.pipeline.inference_server import InferenceServer
+
+
+class SyntheticStream:
+    """A paced 30 FPS source looping over a few frames."""
+
+    def __init__(self, frames, seconds, fps=30):
+        self.frames = frames
+        self.interval = 1.0 / fps
+        self.end = None
+        self.seconds = seconds
+        self.index = 0
+        self.next_time = None
+        self.last_frame_time = None
+
+    def read_frame(self):
+        now = time.monotonic()
+        if self.end is None:
+            self.end = now + self.seconds
+            self.next_time = now
+        if now >= self.end:
+            return None
+        if self.next_time > now:
+            time.sleep(self.next_time - now)
+        self.next_time += self.interval
+        frame = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        self.last_frame_time = time.monotonic()
+        return frame
+
+    def is_running(self):
+        return self.end is None or time.monotonic() < self.end
+
+    def release(self):
+        pass
+
+
+def load_frames(video):
+    if not video:
+        rng = np.random.default_rng(0)
+        return [rng.integers(0, 255, (FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8) for _ in range(8)]
+    cap = cv2.VideoCapture(video)
+    frames = []
+    while len(frames) < 300:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--streams', type=int, default=4)
+    parser.add_argument('--workers', default=None, help="comma-separated worker counts (default 1..cores)")
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--video', help="replay this recording in every stream instead of noise")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    worker_counts = ([int(n) for n in args.workers.split(",")] if args.workers
+                     else sorted({1, 2, 4, cores} & set(range(1, cores + 1))))
+    frames = load_frames(args.video)
+
+    print(f"{args.streams} streams at 30 FPS, {args.seconds:.0f}s per run, {cores} CPU cores")
+    print(f"  {'workers':>7} {'total FPS':>10} {'speedup':>8} {'FPS/stream':>11} {'p50 ms':>7} {'p95 ms':>7}")
+    baseline = None
+    for workers in worker_counts:
+        sources = [(f"s{i}", SyntheticStream(frames, args.seconds), None) for i in range(args.streams)]
+        server = InferenceServer(sources, workers=workers)
+        server.run(stats_interval=args.seconds * 10)
+        stats = server.get_stats()
+
+        streams = stats['streams'].values()
+        total = stats['throughput']
+        baseline = baseline or total
+        p50 = np.mean([s['latency_p50'] for s in streams]) * 1000
+        p95 = np.max([s['latency_p95'] for s in streams]) * 1000
+        per_stream = total / args.streams
+        print(f"  {workers:>7} {total:>10.1f} {total / baseline:>7.2f}x {per_stream:>11.1f} {p50:>7.1f} {p95:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark of key injection latency and throughput per backend.
+
+Each available backend presses a key that does nothing in most
+applications (F24 by default) and the time of every press() call is
+recorded. For XTest the call includes a server round trip, for uinput
+the write to the kernel, for pyautogui its own overhead (with PAUSE set
+to KEY_PRESS_PAUSE).
+
+Usage: python benchmarks/bench_key_backends.py [--presses N] [--key KEY] [--backends a,b]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.controls.key_backends import KEY_BACKENDS
+
+
+def bench(backend, key, presses):
+    """Per-press latencies (s) and overall presses per second."""
+    backend.press(key)  # Warm-up: key lookup, first round trip
+    latencies = np.empty(presses)
+    start = time.perf_counter()
+    for i in range(presses):
+        t0 = time.perf_counter()
+        backend.press(key)
+        latencies[i] = time.perf_counter() - t0
+    return latencies, presses / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--presses', type=int, default=500)
+    parser.add_argument('--key', default='f24')
+    parser.add_argument('--backends', default=",".join(KEY_BACKENDS),
+                        help="comma-separated backend names")
+    args = parser.parse_args()
+
+    print(f"Key injection, {args.presses} presses of '{args.key}':")
+    print(f"  {'backend':<10} {'p50':>9} {'p95':>9} {'max':>9} {'presses/s':>10}")
+    for name in args.backends.split(","):
+        backend_class = KEY_BACKENDS[name]
+        backend = backend_class()
+        if not backend_class.available() or not backend.open():
+            print(f"  {name:<10} not available")
+            continue
+        try:
+            latencies, rate = bench(backend, args.key, args.presses)
+        except Exception as e:
+            print(f"  {name:<10} failed: {e}")
+            continue
+        finally:
+            backend.close()
+        p50, p95 = np.percentile(latencies, [50, 95]) * 1e6
+        print(f"  {name:<10} {p50:>7.1f}us {p95:>7.1f}us {latencies.max() * 1e6:>7.1f}us {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Caller-side cost of a log call: synchronous StreamHandler versus LogBackend.
+
+Logs the same per-frame error the way a failing camera or detector does,
+into a stream that takes --write-ms per write (a busy terminal, a pipe
+nobody reads fast enough). The synchronous handler is the former
+setup_logger; the backend queues records for a listener thread, which
+writes a repeated warning once per window plus its count. Also times a disabled debug
+call with an f-string and with %-style arguments.
+
+Usage: python benchmarks/bench_logging.py [--calls N] [--write-ms MS]
+"""
+import argparse
+import io
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.utils.logger import LogBackend, StructuredFormatter, FORMAT
+
+
+class SlowStream(io.StringIO):
+    def __init__(self, write_time):
+        super().__init__()
+        self.write_time = write_time
+        self.writes = 0
+
+    def write(self, text):
+        time.sleep(self.write_time)
+        self.writes += 1
+        return len(text)
+
+
+def make_logger(name, handler):
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def per_call(logger, calls, message):
+    start = time.perf_counter()
+    for _ in range(calls):
+        logger.error(message, "bad frame")
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--write-ms', type=float, default=1.0)
+    args = parser.parse_args()
+    write_time = args.write_ms / 1000
+
+    stream = SlowStream(write_time)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(StructuredFormatter(FORMAT))
+    sync = per_call(make_logger('bench.sync', handler), args.calls, "Error in gesture detection: %s")
+    print(f"synchronous StreamHandler: {sync * 1e6:8.1f} us/call, {stream.writes} writes")
+
+    for window, label in ((0.0, "no dedup"), (5.0, "5 s dedup")):
+        stream = SlowStream(write_time)
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(StructuredFormatter(FORMAT))
+        backend = LogBackend([handler], dedup_window=window).start()
+        cost = per_call(make_logger(f'bench.async.{window}', backend.handler), args.calls,
+                        "Error in gesture detection: %s")
+        backend.stop()
+        print(f"LogBackend ({label}):     {cost * 1e6:8.1f} us/call, {stream.writes} writes, "
+              f"{backend.get_stats()}")
+
+    logger = make_logger('bench.disabled', logging.NullHandler())
+    landmarks = [(0.5, 0.5, 0.0)] * 21
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        logger.debug(f"Landmarks: {landmarks}")
+    eager = (time.perf_counter() - start) / args.calls
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        logger.debug("Landmarks: %s", landmarks)
+    lazy = (time.perf_counter() - start) / args.calls
+    print(f"disabled debug call: f-string {eager * 1e6:.2f} us, %-style {lazy * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+HUD cost per frame: cv2.putText every frame versus the cached Overlay.
+
+Draws N status lines on a 640x480 frame. The "putText" path draws every
+line on every frame, the way the pipeline used to; the "overlay" path
+goes through visionslide.pipeline.overlay.Overlay, which rasterizes a
+line only when its text changes and blends one cached layer per frame.
+One line changes every --change-every frames (like the gesture), the
+rest stay the same. Reports time per frame for growing numbers of lines.
+
+Usage: python benchmarks/bench_overlay.py [--frames N] [--change-every K]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.config import FRAME_WIDTH, FRAME_HEIGHT
+from visionslide.pipeline.overlay import Overlay
+
+GESTURES = ["open", "fist", "point_right", "point_left", "peace"]
+
+
+def texts(n_lines, i, change_every):
+    gesture = GESTURES[(i // change_every) % len(GESTURES)]
+    return [f"Gesture: {gesture}"] + [f"Status {line}: ok" for line in range(1, n_lines)]
+
+
+def put_text(frame, n_lines, frames, change_every):
+    start = time.perf_counter()
+    for i in range(frames):
+        for line, text in enumerate(texts(n_lines, i, change_every)):
+            cv2.putText(frame, text, (10, 30 + 22 * line), cv2.FONT_HERSHEY_SIMPLEX,
+                        0.6, (255, 255, 255), 2)
+    return (time.perf_counter() - start) / frames
+
+
+def overlay(frame, n_lines, frames, change_every):
+    hud = Overlay()
+    for line in range(n_lines):
+        hud.add(line, (10, 30 + 22 * line), (255, 255, 255), scale=0.6)
+    start = time.perf_counter()
+    for i in range(frames):
+        for line, text in enumerate(texts(n_lines, i, change_every)):
+            hud.set(line, text)
+        hud.draw(frame)
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--change-every', type=int, default=15)
+    args = parser.parse_args()
+
+    frame = np.zeros((FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8)
+    print(f"HUD cost per frame at {FRAME_WIDTH}x{FRAME_HEIGHT}, "
+          f"one line changing every {args.change_every} frames:")
+    print(f"{'lines':>6} {'putText':>10} {'overlay':>10}")
+    for n_lines in (2, 5, 10, 20):
+        old = put_text(frame, n_lines, args.frames, args.change_every)
+        new = overlay(frame, n_lines, args.frames, args.change_every)
+        print(f"{n_lines:>6} {old * 1e6:>8.1f}us {new * 1e6:>8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
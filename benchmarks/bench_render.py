@@ -0,0 +1,80 @@
+"""
+Benchmark of the per-frame render work that headless mode skips.
+
+Windowed mode draws the hand landmarks, formats and draws the HUD text
+and, with --show, pays for cv2.imshow + cv2.waitKey(1). Headless mode
+does none of it. Reports wall-clock and CPU time per frame and the
+render-bound frame rate ceiling.
+
+Usage: python benchmarks/bench_render.py [--frames N] [--show]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.config import FRAME_WIDTH, FRAME_HEIGHT
+from visionslide.pipeline.pipeline import VisionPipeline
+
+
+def make_hand():
+    """A plausible 21-point hand in normalized coordinates."""
+    rng = np.random.default_rng(0)
+    hand = landmark_pb2.NormalizedLandmarkList()
+    for x, y in rng.uniform(0.3, 0.7, size=(21, 2)):
+        hand.landmark.add(x=float(x), y=float(y), z=0.0)
+    return hand
+
+
+def render(frame, hand, hud, show):
+    """Same work as VisionPipeline._render for a frame with a hand and an action."""
+    mp.solutions.drawing_utils.draw_landmarks(
+        frame, hand, mp.solutions.hands.HAND_CONNECTIONS,
+        mp.solutions.drawing_styles.get_default_hand_landmarks_style(),
+        mp.solutions.drawing_styles.get_default_hand_connections_style()
+    )
+    hud.set('fps', f"FPS: {30}")
+    hud.set('gesture', f"Gesture: {'point_right'}")
+    hud.set('action', f"Action: {'next_slide'}")
+    hud.set('banner', "ACTION EXECUTED")
+    hud.draw(frame)
+    if show:
+        cv2.imshow('VisionSlide render benchmark', frame)
+        cv2.waitKey(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=1000)
+    parser.add_argument('--show', action='store_true', help="include cv2.imshow + cv2.waitKey(1)")
+    args = parser.parse_args()
+
+    frame = np.zeros((FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8)
+    hand = make_hand()
+    hud = VisionPipeline._create_hud()
+    render(frame, hand, hud, args.show)
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    for _ in range(args.frames):
+        render(frame, hand, hud, args.show)
+    wall = (time.perf_counter() - wall_start) / args.frames
+    cpu = (time.process_time() - cpu_start) / args.frames
+
+    if args.show:
+        cv2.destroyAllWindows()
+
+    what = "draw + HUD + imshow/waitKey" if args.show else "draw + HUD"
+    print(f"Windowed render cost ({what}) at {FRAME_WIDTH}x{FRAME_HEIGHT}:")
+    print(f"  wall {wall * 1e3:.3f} ms/frame, CPU {cpu * 1e3:.3f} ms/frame")
+    print(f"  render-bound ceiling {1.0 / wall:.0f} FPS; headless mode spends 0 ms here")
+
+
+if __name__ == "__main__":
+    main()
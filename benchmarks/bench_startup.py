@@ -0,0 +1,123 @@
+"""
+Startup benchmark: time to import and time to the first recognized frame.
+
+Each run is a fresh interpreter, started from nothing:
+
+- sequential: the former startup. `import visionslide` imports OpenCV,
+  MediaPipe and pyautogui, then the detector, the controllers and the
+  camera are set up one after another, and the first frame pays for the
+  lazy setup of the model.
+- overlapped: lazy package imports, then app.start_components (camera,
+  warmed-up detector and controllers at the same time).
+
+Without --camera, the camera is simulated: opening it waits
+--camera-delay seconds (a webcam driver typically takes 0.3 to 2 s) and
+it returns blank frames.
+
+Usage: python benchmarks/bench_startup.py [--repeat N] [--camera-delay S] [--camera INDEX]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SimulatedCamera:
+    """Camera that takes a while to open, like a real driver, then returns blank frames."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def initialize(self):
+        time.sleep(self.delay)  # Blocks like a driver call, without holding the GIL
+        return True
+
+    def read_frame(self):
+        import numpy as np
+        from visionslide.config import FRAME_WIDTH, FRAME_HEIGHT
+        return np.zeros((FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8)
+
+    def release(self):
+        pass
+
+
+def child(mode, camera_delay, camera_index):
+    """One startup in this (fresh) interpreter; prints its timings as JSON."""
+    start = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    import visionslide
+    if mode == "sequential":
+        # What the former visionslide/__init__.py imported
+        import visionslide.camera.camera_stream
+        import visionslide.gestures.gesture_detector
+        import visionslide.gestures.gesture_mapping
+        import visionslide.controls.ppt_controller
+        import visionslide.controls.os_controller
+    import_time = time.perf_counter() - start
+
+    from visionslide import app
+    args = app.parse_args([])
+    if camera_index is None:
+        camera = SimulatedCamera(camera_delay)
+    else:
+        from visionslide.camera.camera_stream import CameraStream
+        camera = CameraStream(camera_index)
+
+    if mode == "sequential":
+        from visionslide.gestures.gesture_detector import GestureDetector
+        detector = GestureDetector()
+        app.create_controllers(args)
+        camera_ok = camera.initialize()
+    else:
+        camera_ok, detector, _, _ = app.start_components(args, camera)
+    ready_time = time.perf_counter() - start
+
+    frame = camera.read_frame()
+    while frame is None and camera_ok:
+        frame = camera.read_frame()
+    landmarks = detector.get_landmark_array(detector.detect_landmarks(frame))
+    detector.recognize_gesture(landmarks, time.monotonic())
+    first_frame_time = time.perf_counter() - start
+
+    detector.release()
+    camera.release()
+    print(json.dumps({'import': import_time, 'ready': ready_time, 'first_frame': first_frame_time}))
+
+
+def run(mode, args):
+    command = [sys.executable, os.path.abspath(__file__), '--child', mode,
+               '--camera-delay', str(args.camera_delay)]
+    if args.camera is not None:
+        command += ['--camera', str(args.camera)]
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--camera-delay', type=float, default=0.5)
+    parser.add_argument('--camera', type=int, help="use this real camera instead of the simulated one")
+    parser.add_argument('--child', choices=['sequential', 'overlapped'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args.child, args.camera_delay, args.camera)
+
+    camera = f"camera {args.camera}" if args.camera is not None else f"simulated camera ({args.camera_delay:g}s to open)"
+    print(f"Median of {args.repeat} fresh interpreters, {camera}")
+    print(f"{'startup':>11} {'import ms':>10} {'ready ms':>9} {'first frame ms':>15}")
+    for mode in ('sequential', 'overlapped'):
+        runs = [run(mode, args) for _ in range(args.repeat)]
+        medians = {key: statistics.median(r[key] for r in runs) * 1000 for key in runs[0]}
+        print(f"{mode:>11} {medians['import']:>10.1f} {medians['ready']:>9.0f} "
+              f"{medians['first_frame']:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,9 +16,14 @@ setup(
         "pyautogui>=0.9.0",
         "numpy>=1.21.0"
     ],
+    extras_require={
+        # Faster key injection on Linux (XTest and uinput backends)
+        "linux": ["python-xlib>=0.33", "evdev>=1.6"],
+    },
     entry_points={
         "console_scripts": [
             "visionslide=visionslide.app:main",  
+            "visionslide-receiver=visionslide.controls.remote_receiver:main",
         ],
     },
     python_requires=">=3.9",
@@ -0,0 +1,160 @@
+"""
+Tests for offline batch processing of recorded videos.
+"""
+import sys
+import os
+
+import cv2
+import numpy as np
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.gestures.timeline_store import TimelineStore
+from visionslide.pipeline import batch
+from visionslide.pipeline.batch import BatchProcessor
+
+HAND_FRAMES = list(range(60, 150)) + list(range(210, 300))
+
+
+class FakeDetector:
+    """Bright frames contain a hand pointing right."""
+    last_handedness = ("Right", 0.9)
+
+    def detect_landmarks(self, frame):
+        return np.full((21, 3), 0.5, dtype=np.float32) if frame.mean() > 100 else None
+
+    def get_landmark_array(self, hand_landmarks):
+        return hand_landmarks
+
+    def recognize_gesture(self, landmarks, timestamp=None):
+        return "no_hand" if landmarks is None else "point_right"
+
+
+def fake_detector_factory():
+    return FakeDetector()
+
+
+class StatefulDetector(FakeDetector):
+    """Ignores hands until time goes past the last frame it saw, like a refractory period."""
+
+    def __init__(self):
+        self.blocked_until = float('-inf')
+
+    def recognize_gesture(self, landmarks, timestamp=None):
+        if timestamp < self.blocked_until:
+            return "no_hand"
+        self.blocked_until = timestamp
+        return super().recognize_gesture(landmarks, timestamp)
+
+    def reset_state(self):
+        self.blocked_until = float('-inf')
+
+
+def stateful_detector_factory():
+    return StatefulDetector()
+
+
+def make_video(path, frames=300, fourcc="MJPG"):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), 30, (32, 24))
+    for index in range(frames):
+        value = 200 if index in HAND_FRAMES else 0
+        writer.write(np.full((24, 32, 3), value, dtype=np.uint8))
+    writer.release()
+
+
+def test_plan_covers_every_frame_once_with_warmup():
+    processor = BatchProcessor(workers=2, chunk_seconds=4, warmup=1.0)
+    chunks = processor.plan(np.arange(300) / 30.0)
+    assert [(begin, end) for _, begin, end in chunks] == [(0, 120), (120, 240), (240, 300)]
+    assert [first for first, _, _ in chunks] == [0, 90, 210]
+
+
+def test_chunked_run_matches_a_single_pass(tmp_path):
+    video = str(tmp_path / "talk.avi")
+    make_video(video)
+
+    single = BatchProcessor(workers=1, detector_factory=fake_detector_factory,
+                            chunk_seconds=3600, warmup=1.0)
+    report = single.run([video], str(tmp_path / "single"))
+    assert report['chunks'] == 1 and report['frames'] == 300
+
+    chunked = BatchProcessor(workers=2, detector_factory=fake_detector_factory,
+                             chunk_seconds=4, warmup=1.0)
+    report = chunked.run([video], str(tmp_path / "chunked"))
+    assert report['chunks'] == 3 and report['workers'] == 2
+    assert report['frames'] == 300 and report['processed'] == 360
+
+    expected = TimelineStore(str(tmp_path / "single" / "talk"))
+    store = TimelineStore(str(tmp_path / "chunked" / "talk"))
+    assert np.allclose(store.timestamp, np.arange(300) / 30.0)
+    assert np.array_equal(store.hand_mask, np.isin(np.arange(300), HAND_FRAMES))
+    assert np.allclose(store.landmarks, expected.landmarks, equal_nan=True)
+    assert list(store.decode_gestures()) == list(expected.decode_gestures())
+    assert list(store.decode_actions()) == list(expected.decode_actions())
+    assert len(store.frames_with_action("next_slide")) >= 2
+
+    # A second run does not append to existing stores
+    assert chunked.run([video], str(tmp_path / "chunked"))['videos'] == 0
+
+
+def test_chunks_of_encoded_video_start_on_their_frame(tmp_path):
+    # Inter-frame codec: seeking may land on a keyframe, chunks must not shift
+    video = str(tmp_path / "talk.mp4")
+    make_video(video, fourcc="mp4v")
+
+    single = BatchProcessor(workers=1, detector_factory=fake_detector_factory,
+                            chunk_seconds=3600, warmup=0.0)
+    single.run([video], str(tmp_path / "single"))
+    chunked = BatchProcessor(workers=2, detector_factory=fake_detector_factory,
+                             chunk_seconds=4, warmup=0.0)
+    report = chunked.run([video], str(tmp_path / "chunked"))
+    assert report['chunks'] == 3 and report['frames'] == 300
+
+    expected = TimelineStore(str(tmp_path / "single" / "talk"))
+    store = TimelineStore(str(tmp_path / "chunked" / "talk"))
+    assert np.array_equal(store.hand_mask, expected.hand_mask)
+    assert np.array_equal(store.hand_mask, np.isin(np.arange(300), HAND_FRAMES))
+    assert list(store.decode_gestures()) == list(expected.decode_gestures())
+
+
+def test_open_at_falls_back_to_decoding_when_seek_is_off(tmp_path, monkeypatch):
+    video = str(tmp_path / "talk.mp4")
+    make_video(video, fourcc="mp4v")
+    video_capture = cv2.VideoCapture
+
+    class KeyframeSeekCapture:
+        """Lands on the previous multiple of 50 when asked to seek."""
+
+        def __init__(self, path):
+            self.cap = video_capture(path)
+
+        def set(self, prop, value):
+            return self.cap.set(prop, value // 50 * 50)
+
+        def __getattr__(self, name):
+            return getattr(self.cap, name)
+
+    monkeypatch.setattr(batch.cv2, "VideoCapture", KeyframeSeekCapture)
+    cap = batch._open_at(video, 210)
+    assert cap.get(cv2.CAP_PROP_POS_FRAMES) == 210
+    assert cap.read()[1].mean() > 100  # Frame 210 is a hand frame, 200 is not
+    cap.release()
+
+
+def test_detector_state_does_not_leak_between_chunks(tmp_path):
+    for name in ("first", "second"):
+        make_video(str(tmp_path / f"{name}.avi"))
+
+    # One worker runs every chunk of both videos, the second video's clock restarts at 0
+    processor = BatchProcessor(workers=1, detector_factory=stateful_detector_factory,
+                               chunk_seconds=4, warmup=1.0)
+    report = processor.run([str(tmp_path / "first.avi"), str(tmp_path / "second.avi")],
+                           str(tmp_path / "out"))
+    assert report['videos'] == 2 and report['workers'] == 1
+
+    first = TimelineStore(str(tmp_path / "out" / "first"))
+    second = TimelineStore(str(tmp_path / "out" / "second"))
+    expected = ["point_right" if index in HAND_FRAMES else "no_hand" for index in range(300)]
+    assert list(first.decode_gestures()) == expected
+    assert list(second.decode_gestures()) == expected
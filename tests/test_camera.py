@@ -3,6 +3,7 @@ Test script for camera functionality.
 """
 import sys
 import os
+import time
 
 # Add the project root to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -57,5 +58,109 @@ def test_camera():
         camera.release()
         print("✅ Camera test completed")
 
+
+class FakeCapture:
+    """Stand-in for cv2.VideoCapture producing numbered frames."""
+
+    def __init__(self, index, delay=0.001):
+        self.delay = delay
+        self.count = 0
+
+    def set(self, prop, value):
+        return True
+
+    def get(self, prop):
+        return 0
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        time.sleep(self.delay)
+        self.count += 1
+        return True, self.count
+
+    def release(self):
+        pass
+
+
+def test_threaded_capture_returns_latest_frame(monkeypatch):
+    """The threaded mode only hands out the newest frame and counts drops."""
+    import visionslide.camera.camera_stream as camera_stream
+    monkeypatch.setattr(camera_stream.cv2, "VideoCapture", FakeCapture)
+
+    camera = CameraStream(threaded=True, buffer_size=2)
+    assert camera.initialize()
+    try:
+        first = camera.read_frame()
+        time.sleep(0.05)  # Let the capture thread run ahead of us
+        second = camera.read_frame()
+        assert second > first
+        assert second >= camera.cap.count - 2
+
+        stats = camera.get_frame_stats()
+        assert stats['dropped'] > 0
+        assert stats['captured'] >= second
+    finally:
+        camera.release()
+    assert camera.read_frame() is None
+
+
+def test_motion_detector_ignores_static_scene():
+    import numpy as np
+    from visionslide.camera.motion_detector import MotionDetector
+
+    detector = MotionDetector()
+    frame = np.full((480, 640, 3), 100, dtype=np.uint8)
+    assert detector.update(frame)  # First frame always counts as motion
+    assert not detector.update(frame.copy())
+
+    moved = frame.copy()
+    moved[200:300, 250:350] = 255  # A bright patch appears
+    assert detector.update(moved)
+    assert not detector.update(moved)
+
+
+def test_frame_pool_reuses_only_released_buffers(tmp_path):
+    import numpy as np
+    from visionslide.camera.frame_pool import FramePool
+
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (64, 48))
+    for i in range(8):
+        writer.write(np.full((48, 64, 3), i * 30, dtype=np.uint8))
+    writer.release()
+
+    pool = FramePool(size=2)
+    cap = cv2.VideoCapture(path)
+    _, first = pool.read(cap)
+    _, second = pool.read(cap)
+    assert second is not first
+    pool.retain(second)  # A second holder, e.g. the recorder
+    pool.release(second)
+    assert pool.in_use() == 2
+
+    # Both buffers held: a fresh frame, the held ones are untouched
+    value = int(first[0, 0, 0])
+    _, third = pool.read(cap)
+    assert pool.exhausted == 1
+    assert int(first[0, 0, 0]) == value
+    pool.release(third)  # Unpooled: nothing to do
+
+    # Released buffers are decoded into again, once every holder is gone
+    pool.release(first)
+    _, fourth = pool.read(cap)
+    assert fourth is first
+    pool.release(second)
+    _, fifth = pool.read(cap)
+    assert fifth is second
+    assert pool.get_stats()['allocated'] == 2
+    assert pool.reused == 2
+    pool.release(fourth)
+    pool.release(fifth)
+    assert pool.in_use() == 0
+    cap.release()
+
+
 if __name__ == "__main__":
-    test_camera()
\ No newline at end of file
+    test_camera()
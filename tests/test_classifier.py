@@ -0,0 +1,114 @@
+"""
+Tests for the trainable gesture classifier.
+"""
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.gestures.classifier import GestureClassifier, landmark_features, load_classifier, main
+from visionslide.gestures.landmarks import classify_landmarks
+from visionslide.gestures.timeline_store import TimelineStore, TimelineWriter
+
+# Extended fingers (index, middle, ring, pinky) of each pose
+POSES = {
+    "pointing": (True, False, False, False),
+    "open_hand": (True, True, True, True),
+    "unknown": (False, False, False, False),
+}
+
+
+def make_hand(extended, wrist=(0.5, 0.7), angle=0.0, scale=0.15, rng=None):
+    """Hand skeleton (21, 3), tilted by angle (radians) around the wrist."""
+    points = np.zeros((21, 2))
+    # Thumb folded across the palm
+    points[1:5] = [(-0.3, -0.3), (-0.4, -0.6), (-0.3, -0.8), (-0.1, -0.9)]
+    for finger, is_extended in enumerate(extended):
+        mcp = np.array([-0.3 + 0.2 * finger, -1.0])
+        if is_extended:
+            joints = [mcp + (0, -0.4 * k) for k in range(4)]
+        else:
+            # Curled: the tip comes back down into the palm
+            joints = [mcp, mcp + (0, -0.35), mcp + (0.05, -0.15), mcp + (0.05, 0.1)]
+        points[5 + 4 * finger:9 + 4 * finger] = joints
+    if rng is not None:
+        points += rng.normal(0, 0.03, points.shape)
+
+    cos, sin = np.cos(angle), np.sin(angle)
+    points = points @ np.array([[cos, sin], [-sin, cos]])
+    hand = np.zeros((21, 3), dtype=np.float32)
+    hand[:, :2] = np.asarray(wrist) + points * scale
+    return hand
+
+
+def make_set(n, max_angle, seed):
+    rng = np.random.default_rng(seed)
+    names = list(POSES)
+    labels = [names[i % len(names)] for i in range(n)]
+    hands = np.stack([
+        make_hand(POSES[label], wrist=(0.5, 0.7), angle=rng.uniform(-max_angle, max_angle),
+                  scale=rng.uniform(0.1, 0.25), rng=rng)
+        for label in labels
+    ])
+    return hands, np.array(labels, dtype=object)
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    # Trained on upright hands only
+    hands, labels = make_set(300, np.radians(10), seed=0)
+    return GestureClassifier.train(hands, labels, epochs=200)
+
+
+def test_features_ignore_position_scale_and_rotation():
+    hand = make_hand(POSES["pointing"])
+    moved = make_hand(POSES["pointing"], wrist=(0.2, 0.4), angle=1.2, scale=0.3)
+    np.testing.assert_allclose(landmark_features(hand), landmark_features(moved), atol=1e-4)
+
+
+def test_tilted_hands_are_recognized(classifier):
+    hands, labels = make_set(150, np.radians(100), seed=1)
+    predicted = classifier.predict_poses(hands)
+    rules = classify_landmarks(hands)
+    accuracy = np.mean(predicted == labels)
+    rules_accuracy = np.mean(rules == labels)
+    assert accuracy > 0.95
+    assert rules_accuracy < accuracy
+
+
+def test_pointing_direction_comes_from_position(classifier):
+    hands = np.stack([make_hand(POSES["pointing"], wrist=(x, 0.7)) for x in (0.2, 0.5, 0.8)])
+    assert classifier.predict(hands).tolist() == ["point_left", "pointing", "point_right"]
+    # One hand as (21, 3) works too
+    assert classifier.predict(hands[0]).tolist() == ["point_left"]
+
+
+def test_save_load_round_trip(classifier, tmp_path):
+    path = str(tmp_path / "model.npz")
+    classifier.save(path)
+    loaded = load_classifier(path)
+    hands, _ = make_set(30, np.radians(45), seed=2)
+    np.testing.assert_allclose(loaded.predict_proba(hands), classifier.predict_proba(hands), rtol=1e-5)
+    assert load_classifier(str(tmp_path / "missing.npz")) is None
+    assert load_classifier(None) is None
+
+
+def test_train_cli_reads_timeline_stores(tmp_path, capsys):
+    hands, labels = make_set(240, np.radians(10), seed=3)
+    recorded = {"pointing": "point_right", "open_hand": "open_hand", "unknown": "unknown"}
+    with TimelineWriter(str(tmp_path / "session")) as writer:
+        for i, (hand, label) in enumerate(zip(hands, labels)):
+            writer.append(i / 30.0, hand, "Right", 0.9, recorded[label])
+            writer.append(i / 30.0 + 0.01, None)  # No hand: not a sample
+
+    model = str(tmp_path / "model.npz")
+    main([str(tmp_path / "session"), "-o", model, "--epochs", "150"])
+    assert "Validation accuracy" in capsys.readouterr().out
+
+    classifier = load_classifier(model)
+    assert sorted(classifier.classes) == ["open_hand", "pointing", "unknown"]
+    assert len(TimelineStore(str(tmp_path / "session"))) == 480
@@ -0,0 +1,125 @@
+"""
+Tests for the presentation controller and the action dispatcher.
+"""
+import sys
+import os
+import threading
+import time
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.controls.action_dispatcher import ActionDispatcher
+
+
+class RecordingController:
+    def __init__(self, delay=0.0, gate=None):
+        self.delay = delay
+        self.gate = gate
+        self.actions = []
+
+    def _do(self, action):
+        if self.gate:
+            self.gate.wait()
+        time.sleep(self.delay)
+        self.actions.append(action)
+        return True
+
+    def next_slide(self):
+        return self._do("next_slide")
+
+    def previous_slide(self):
+        return self._do("previous_slide")
+
+
+def test_submit_returns_before_the_key_is_sent():
+    controller = RecordingController(delay=0.2)
+    dispatcher = ActionDispatcher(controller).start()
+
+    start = time.monotonic()
+    assert dispatcher.submit("next_slide")
+    assert time.monotonic() - start < 0.01
+
+    assert dispatcher.wait_idle(timeout=1)
+    assert controller.actions == ["next_slide"]
+    dispatcher.close()
+
+
+def test_pending_actions_are_deduplicated_and_cancelled():
+    gate = threading.Event()
+    controller = RecordingController(gate=gate)
+    dispatcher = ActionDispatcher(controller).start()
+
+    dispatcher.submit("previous_slide")  # Picked up by the worker, blocked on the gate
+    time.sleep(0.05)
+    dispatcher.submit("next_slide")
+    dispatcher.submit("next_slide")      # Same as the pending one
+    dispatcher.submit("previous_slide")  # Undoes the pending next
+    dispatcher.submit("next_slide")
+    gate.set()
+
+    assert dispatcher.wait_idle(timeout=1)
+    assert controller.actions == ["previous_slide", "next_slide"]
+    stats = dispatcher.get_stats()
+    assert stats['deduplicated'] == 1
+    assert stats['cancelled'] == 2
+    dispatcher.close()
+
+
+def test_completion_is_reported_with_capture_time():
+    done = []
+    dispatcher = ActionDispatcher(RecordingController(),
+                                  on_complete=lambda *args: done.append(args)).start()
+
+    t_capture = time.monotonic()
+    dispatcher.submit("next_slide", t_capture)
+    dispatcher.submit("exit")  # Not a key press of this controller
+    dispatcher.close()
+
+    assert len(done) == 1
+    action, reported_capture, t_done = done[0]
+    assert action == "next_slide"
+    assert reported_capture == t_capture <= t_done
+
+
+def test_controller_sends_one_key_for_the_target():
+    from visionslide.controls.key_backends import MockKeyBackend
+    from visionslide.controls.ppt_controller import PPTController
+
+    backend = MockKeyBackend()
+    controller = PPTController(target="pdf", backend=backend)
+    controller.connect()
+    assert controller.next_slide()
+    assert backend.keys == ["pagedown"]
+
+    backend = MockKeyBackend()
+    controller = PPTController(target="unknown", backend=backend)
+    controller.connect()
+    assert controller.previous_slide()
+    assert backend.keys == ["left", "pageup"]
+
+
+def test_select_backend_falls_back_to_an_available_one(monkeypatch):
+    from visionslide.controls import key_backends
+
+    assert key_backends.select_backend("mock").name == "mock"
+
+    # Nothing but pyautogui works here: a failing request falls back to it
+    monkeypatch.setattr(key_backends.UInputBackend, "available", classmethod(lambda cls: False))
+    monkeypatch.setattr(key_backends.XTestBackend, "open", lambda self: False)
+    monkeypatch.setattr(key_backends.PyAutoGUIBackend, "open", lambda self: True)
+    assert key_backends.select_backend("xtest").name == "pyautogui"
+
+    monkeypatch.setattr(key_backends.PyAutoGUIBackend, "open", lambda self: False)
+    assert key_backends.select_backend("auto") is None
+
+
+def test_backend_without_press_cannot_be_created():
+    import pytest
+    from visionslide.controls.key_backends import KeyBackend
+
+    class NoPress(KeyBackend):
+        name = "nopress"
+
+    with pytest.raises(TypeError):
+        NoPress()
@@ -0,0 +1,146 @@
+"""
+Tests for the evidence-based gesture mapper and its evaluation on timelines.
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from visionslide.gestures.gesture_mapping import GestureMapper
+from visionslide.gestures.gesture_eval import HoldTimerMapper, evaluate
+from visionslide.gestures.swipe_detector import SwipeDetector
+from visionslide.gestures.timeline_store import TimelineWriter, TimelineStore
+
+FRAME = 1 / 30
+
+
+def feed(mapper, gestures, start=0.0, confidence=0.9):
+    """Feed one gesture per 30 FPS frame; returns [(frame index, action)]."""
+    fired = []
+    for i, gesture in enumerate(gestures):
+        action = mapper.update_gesture(gesture, None, None, start + i * FRAME, confidence=confidence)
+        if action:
+            fired.append((i, action))
+    return fired
+
+
+def test_steady_gesture_fires_once_well_before_the_old_hold_time():
+    fired = feed(GestureMapper(), ["point_right"] * 60)
+    assert len(fired) == 1  # Holding does not repeat the action
+    index, action = fired[0]
+    assert action == "next_slide"
+    assert index * FRAME < 0.4
+
+
+def test_dropouts_and_flickers_only_cost_their_own_votes():
+    gestures = (["point_right"] * 4 + ["no_hand"] + ["point_right"] * 3 + ["point_left"]
+                + ["point_right"] * 20)
+    fired = feed(GestureMapper(), gestures)
+    assert [action for _, action in fired] == ["next_slide"]
+    assert fired[0][0] < 14
+
+    # Low confidence frames do not vote at all
+    assert feed(GestureMapper(), ["point_right"] * 30, confidence=0.3) == []
+
+
+def test_brief_blip_and_mixed_votes_do_not_fire():
+    assert feed(GestureMapper(), ["no_hand"] * 5 + ["open_hand"] * 3 + ["no_hand"] * 30) == []
+    assert feed(GestureMapper(), ["point_right", "point_left"] * 20) == []
+
+
+def test_gesture_fires_again_only_after_fading():
+    gestures = ["point_right"] * 20 + ["no_hand"] * 25 + ["point_right"] * 20
+    fired = feed(GestureMapper(), gestures)
+    assert [action for _, action in fired] == ["next_slide", "next_slide"]
+    assert fired[1][0] >= 45
+
+
+def test_evaluation_reports_latency_and_false_triggers(tmp_path):
+    gestures = (["no_hand"] * 30
+                + ["point_right"] * 10 + ["point_left"] + ["point_right"] * 25  # One flicker
+                + ["no_hand"] * 30
+                + ["open_hand"] * 4                                            # Blip
+                + ["no_hand"] * 30
+                + ["point_left"] * 40)
+    with TimelineWriter(str(tmp_path)) as writer:
+        for i, gesture in enumerate(gestures):
+            writer.append(i * FRAME, None, "Right", 0.9, gesture)
+    store = TimelineStore(str(tmp_path))
+
+    result = evaluate(store, GestureMapper())
+    assert result['gestures'] == 2
+    assert result['missed'] == 0 and result['false_triggers'] == 0
+    assert max(result['latencies']) < 0.4
+
+    # The hold timer restarts on the flicker and repeats while the gesture is held
+    baseline = evaluate(store, HoldTimerMapper())
+    assert min(baseline['latencies']) > max(result['latencies'])
+    assert baseline['false_triggers'] > 0
+
+
+def hand_at(x, y=0.5, spread=0.05):
+    hand = np.zeros((21, 3), dtype=np.float32)
+    hand[:, 0] = x + np.linspace(-spread, spread, 21)
+    hand[:, 1] = y
+    return hand
+
+
+def run_swipes(xs, ys=None, fingers_only=False):
+    """Feed a wrist trajectory at 30 FPS; returns [(frame index, swipe)]."""
+    detector = SwipeDetector()
+    swipes = []
+    for i, x in enumerate(xs):
+        y = 0.5 if ys is None else ys[i]
+        hand = hand_at(xs[0] if fingers_only else x, y)
+        if fingers_only:
+            hand[[8, 12, 16, 20], 0] += x - xs[0]
+        swipe = detector.update(hand, i * FRAME)
+        if swipe:
+            swipes.append((i, swipe))
+    return swipes
+
+
+def test_swipe_fires_mid_motion_and_ignores_the_return():
+    # Rest, sweep right at 1.5 frame widths/s, rest, come back
+    xs = [0.3] * 5 + [0.3 + 0.05 * i for i in range(1, 9)] + [0.7] * 3 + [0.7 - 0.05 * i for i in range(1, 9)]
+    swipes = run_swipes(xs)
+    assert swipes == [(9, "swipe_right")]  # 5 frames (167 ms) into the motion
+
+    left = run_swipes([0.7 - 0.05 * i for i in range(10)])
+    assert [swipe for _, swipe in left] == ["swipe_left"]
+
+    # A long sweep fires once: the refractory period blocks both directions
+    long_sweep = run_swipes([0.05 + 0.05 * i for i in range(19)])
+    assert [swipe for _, swipe in long_sweep] == ["swipe_right"]
+
+
+def test_reset_state_clears_the_refractory_period():
+    detector = SwipeDetector()
+    sweep = [0.3 + 0.05 * i for i in range(8)]
+    assert [detector.update(hand_at(x), i * FRAME) for i, x in enumerate(sweep)].count("swipe_right") == 1
+
+    # Another video starting over at t=0: blocked until reset_state()
+    detector.reset()
+    assert not any(detector.update(hand_at(x), i * FRAME) for i, x in enumerate(sweep))
+    detector.reset_state()
+    assert [detector.update(hand_at(x), i * FRAME) for i, x in enumerate(sweep)].count("swipe_right") == 1
+
+
+def test_slow_drift_finger_motion_and_vertical_moves_are_not_swipes():
+    assert run_swipes([0.3 + 0.01 * i for i in range(40)]) == []
+    assert run_swipes([0.3 + 0.05 * i for i in range(8)], fingers_only=True) == []
+    xs = [0.3 + 0.05 * i for i in range(8)]
+    assert run_swipes(xs, ys=[0.2 + 0.08 * i for i in range(8)]) == []
+    assert run_swipes([0.3, 0.4, 0.3, 0.45, 0.35, 0.5, 0.4, 0.55, 0.45, 0.6]) == []
+
+
+def test_swipe_fires_at_once_without_a_second_pose_action():
+    mapper = GestureMapper()
+    assert mapper.update_gesture("swipe_right", None, None, 0.0) == "next_slide"
+    # The hand ends up pointing right: no second slide change
+    assert feed(mapper, ["point_right"] * 30, start=FRAME) == []
+    assert feed(mapper, ["no_hand"] * 25, start=2.0) == []
+    assert mapper.update_gesture("swipe_left", None, None, 3.0) == "previous_slide"
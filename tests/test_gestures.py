@@ -86,5 +86,57 @@ def test_gestures():
         camera.release()
         print("✅ Gesture test completed")
 
+
+class FakeHands:
+    """Stand-in for mp.solutions.hands.Hands returning one fixed hand."""
+
+    def __init__(self, points):
+        self.points = points
+        self.shapes = []
+
+    def process(self, rgb_frame):
+        from types import SimpleNamespace
+        from mediapipe.framework.formats import landmark_pb2
+
+        self.shapes.append(rgb_frame.shape)
+        hand = landmark_pb2.NormalizedLandmarkList()
+        for x, y in self.points:
+            hand.landmark.add(x=x, y=y, z=0.0)
+        return SimpleNamespace(multi_hand_landmarks=[hand] if self.points else None,
+                               multi_handedness=None)
+
+    def close(self):
+        pass
+
+
+def test_roi_inference_maps_landmarks_to_full_frame():
+    """ROI crops are downscaled and landmarks come back in full-frame coordinates."""
+    import numpy as np
+
+    detector = GestureDetector(roi_mode=True, roi_max_size=64)
+    detector.hands.close()
+    # A hand spanning the middle of the crop / frame
+    points = [(0.4 + 0.01 * i, 0.5) for i in range(21)]
+    detector.hands = FakeHands(points)
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+    first = detector.get_landmark_array(detector.detect_landmarks(frame))
+    assert detector.hands.shapes[-1] == (480, 640, 3)
+    x0, y0, x1, y1 = detector._roi
+    assert x1 - x0 == y1 - y0 < 480
+
+    second = detector.get_landmark_array(detector.detect_landmarks(frame))
+    assert detector.hands.shapes[-1] == (64, 64, 3)
+    size = x1 - x0
+    np.testing.assert_allclose(second[:, 0], (x0 + first[:, 0] * size) / 640, rtol=1e-5)
+    np.testing.assert_allclose(second[:, 1], (y0 + 0.5 * size) / 480, rtol=1e-5)
+
+    # Losing the hand in the ROI falls back to a full-frame search
+    detector.hands.points = []
+    assert detector.detect_landmarks(frame) is None
+    assert detector.hands.shapes[-1] == (480, 640, 3)
+    assert detector.get_inference_stats() == {'roi_frames': 1, 'roi_misses': 1, 'full_frames': 2}
+
+
 if __name__ == "__main__":
-    test_gestures()
\ No newline at end of file
+    test_gestures()
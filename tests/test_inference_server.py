@@ -0,0 +1,121 @@
+"""
+Tests for the multi-camera inference server.
+"""
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.camera.frame_pool import FramePool
+from visionslide.pipeline.inference_server import InferenceServer, _Worker
+
+
+class FakeDetector:
+    """Frames with a non-zero first pixel contain a hand pointing right."""
+    last_handedness = ("Right", 0.9)
+
+    def detect_landmarks(self, frame):
+        time.sleep(0.002)
+        return np.zeros((21, 3), dtype=np.float32) if frame[0, 0, 0] else None
+
+    def get_landmark_array(self, hand_landmarks):
+        return hand_landmarks
+
+    def recognize_gesture(self, landmarks):
+        return "point_right"
+
+    def release(self):
+        pass
+
+
+def fake_detector_factory():
+    return FakeDetector()
+
+
+class FakeSource:
+    def __init__(self, frames, hand=True):
+        self.frames = frames
+        self.hand = hand
+        self.index = 0
+        self.last_frame_time = None
+
+    def read_frame(self):
+        if self.index >= self.frames:
+            return None
+        time.sleep(0.005)
+        frame = np.full((4, 4, 3), 1 if self.hand else 0, dtype=np.uint8)
+        self.last_frame_time = self.index / 30.0  # Scene time: 30 FPS
+        self.index += 1
+        return frame
+
+    def is_running(self):
+        return self.index < self.frames
+
+    def release(self):
+        pass
+
+
+class RecordingController:
+    def __init__(self):
+        self.actions = []
+
+    def next_slide(self):
+        self.actions.append("next_slide")
+        return True
+
+    def previous_slide(self):
+        self.actions.append("previous_slide")
+        return True
+
+
+def test_streams_share_the_pool_and_keep_their_own_mapper():
+    controllers = [RecordingController() for _ in range(3)]
+    sources = [
+        ("room-a", FakeSource(120), controllers[0]),
+        ("room-b", FakeSource(120), controllers[1]),
+        ("room-c", FakeSource(120, hand=False), controllers[2]),
+    ]
+    server = InferenceServer(sources, workers=2, detector_factory=fake_detector_factory)
+    server.run(stats_interval=60)
+
+    stats = server.get_stats()
+    processed = [stats['streams'][name]['processed'] for name in ("room-a", "room-b", "room-c")]
+    # Fair share: no stream gets starved
+    assert min(processed) > 0.5 * max(processed)
+    assert sum(stats['workers'].values()) == sum(processed)
+
+    # A 4 s point_right session triggers the mapper of the rooms with a hand only
+    assert controllers[0].actions and controllers[1].actions
+    assert controllers[2].actions == []
+    assert stats['streams']['room-a']['latency_p50'] > 0
+
+
+class DeadProcess:
+    exitcode = -9
+
+    def is_alive(self):
+        return False
+
+
+def test_restarting_a_dead_worker_releases_its_frame():
+    source = FakeSource(0)
+    source.frame_pool = FramePool(size=2)
+    server = InferenceServer([("room-a", source, None)], workers=1,
+                             detector_factory=fake_detector_factory)
+    session = server.sessions[0]
+    frame = source.frame_pool.acquire((4, 4, 3))
+    session.in_flight = (1, 0.0, 0.0, frame)
+
+    worker = _Worker(0, DeadProcess(), None)
+    worker.session = session
+    server._workers = [worker]
+    server._spawn_worker = lambda worker_id: _Worker(worker_id, None, None)
+    server._check_workers()
+
+    assert session.in_flight is None
+    assert server._workers[0] is not worker
+    assert source.frame_pool.in_use() == 0
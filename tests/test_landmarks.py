@@ -0,0 +1,122 @@
+"""
+Tests for the NumPy landmark representation and vectorized features.
+"""
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.gestures.landmarks import (
+    classify_landmarks, finger_states, hand_positions, fingertip_distances,
+    landmarks_to_array, FINGER_TIPS, FINGER_PIPS
+)
+
+
+def make_hand(extended=(False, False, False, False), wrist_x=0.5):
+    """Synthetic (21, 3) hand: extended fingers have their tip above the PIP."""
+    hand = np.zeros((21, 3), dtype=np.float32)
+    hand[:, 0] = wrist_x
+    hand[:, 1] = 0.6
+    hand[0, 1] = 0.7  # Wrist
+    hand[9, 1] = 0.5  # Middle finger MCP
+    for i, is_extended in enumerate(extended):
+        hand[FINGER_PIPS[i], 1] = 0.5
+        hand[FINGER_TIPS[i], 1] = 0.3 if is_extended else 0.55
+    return hand
+
+
+def test_finger_states_and_positions():
+    hand = make_hand((True, False, True, False), wrist_x=0.2)
+    assert finger_states(hand).tolist() == [True, False, True, False]
+    assert hand_positions(hand) == -1
+    assert hand_positions(make_hand(wrist_x=0.5)) == 0
+    assert hand_positions(make_hand(wrist_x=0.8)) == 1
+
+
+def test_classify_matches_rules():
+    batch = np.stack([
+        make_hand((True, False, False, False), wrist_x=0.8),
+        make_hand((True, False, False, False), wrist_x=0.2),
+        make_hand((True, False, False, False), wrist_x=0.5),
+        make_hand((True, True, True, True)),
+        make_hand((True, True, False, False)),
+    ])
+    expected = ["point_right", "point_left", "pointing", "open_hand", "unknown"]
+    assert classify_landmarks(batch).tolist() == expected
+    # Single hands go through the same code path
+    assert [classify_landmarks(hand)[0] for hand in batch] == expected
+
+
+def test_fingertip_distances_are_scale_invariant():
+    hand = make_hand((True, True, True, True))
+    small = hand.copy()
+    small[:, :2] *= 0.5
+    np.testing.assert_allclose(fingertip_distances(hand), fingertip_distances(small), rtol=1e-5)
+
+
+def test_landmarks_to_array_from_mediapipe():
+    landmark_pb2 = pytest.importorskip('mediapipe.framework.formats.landmark_pb2')
+    hand_landmarks = landmark_pb2.NormalizedLandmarkList()
+    for i in range(21):
+        hand_landmarks.landmark.add(x=i / 21, y=0.5, z=-0.1)
+
+    array = landmarks_to_array(hand_landmarks)
+    assert array.shape == (21, 3)
+    assert array.dtype == np.float32
+    np.testing.assert_allclose(array[:, 0], np.arange(21) / 21, rtol=1e-6)
+
+
+def test_one_euro_filter_smooths_jitter_and_follows_motion():
+    from visionslide.gestures.landmark_filter import OneEuroFilter
+
+    rng = np.random.default_rng(0)
+    hand = make_hand((True, False, False, False), wrist_x=0.38)
+    landmark_filter = OneEuroFilter()
+    raw_flips = filtered_flips = 0
+    previous_raw = previous_filtered = None
+    for i in range(90):
+        noisy = hand + rng.normal(0, 0.01, hand.shape).astype(np.float32)
+        filtered = landmark_filter.update(noisy, i / 30)
+        raw, smooth = int(hand_positions(noisy)), int(hand_positions(filtered))
+        raw_flips += previous_raw is not None and raw != previous_raw
+        filtered_flips += previous_filtered is not None and smooth != previous_filtered
+        previous_raw, previous_filtered = raw, smooth
+    assert filtered_flips < raw_flips / 3
+
+    # A hand sweeping at half a frame width per second is tracked closely,
+    # and the speed estimate extrapolates it
+    landmark_filter.reset()
+    for i in range(30):
+        filtered = landmark_filter.update(hand + [0.5 * i / 30, 0, 0], i / 30)
+    assert abs(filtered[0, 0] - (hand[0, 0] + 0.5 * 29 / 30)) < 0.02
+    predicted = landmark_filter.predict(1.0 + 0.1)
+    assert predicted[0, 0] > filtered[0, 0] + 0.03
+
+
+def test_tracker_skips_inference_only_while_the_hand_is_steady():
+    from visionslide.gestures.landmark_filter import LandmarkTracker
+
+    tracker = LandmarkTracker(keyframe_interval=3)
+    hand = make_hand(wrist_x=0.5)
+    inferred = []
+    for i in range(30):
+        if tracker.needs_inference():
+            inferred.append(i)
+            tracker.update(hand, i / 30)
+        else:
+            assert np.allclose(tracker.fill(i / 30), hand)
+
+    # Once settled, one frame in three goes through inference
+    assert inferred[:2] == [0, 1]
+    assert np.diff(inferred[-4:]).tolist() == [3, 3, 3]
+    assert tracker.get_stats()['filled_frames'] == 30 - len(inferred)
+
+    # A moving hand or a lost hand forces inference again
+    tracker.update(hand + 0.2, 1.0)
+    assert tracker.needs_inference()
+    tracker.update(None, 1.1)
+    assert tracker.needs_inference()
@@ -0,0 +1,130 @@
+"""
+Tests for the asynchronous, deduplicating logging backend.
+"""
+import sys
+import os
+import logging
+import threading
+import time
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.utils.logger import LogBackend, StructuredFormatter, fields, FORMAT
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(StructuredFormatter('%(message)s'))
+        self.lines = []
+        self.threads = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+        self.threads.append(threading.current_thread())
+
+
+def make_logger(name, backend):
+    logger = logging.getLogger(name)
+    logger.handlers = [backend.handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def test_repeated_warnings_are_written_once_with_a_count():
+    handler = RecordingHandler()
+    backend = LogBackend([handler], dedup_window=60).start()
+    logger = make_logger('test.dedup', backend)
+
+    for i in range(100):
+        logger.error("Error in gesture detection: %s", "bad frame")
+    logger.error("Error in gesture detection: %s", "no hand model")  # Same template, other message
+    for i in range(3):
+        logger.info("Gesture 'point_right' triggered action: next_slide")  # Audit lines are all kept
+    backend.stop()
+
+    assert handler.lines == [
+        "Error in gesture detection: bad frame",
+        "Error in gesture detection: no hand model",
+    ] + ["Gesture 'point_right' triggered action: next_slide"] * 3 + [
+        "Error in gesture detection: bad frame repeated=99",
+    ]
+    assert backend.get_stats()['suppressed'] == 99
+    # Written by the listener thread, not the caller
+    assert threading.current_thread() not in handler.threads[:2]
+
+
+def test_count_is_written_when_the_window_ends():
+    handler = RecordingHandler()
+    backend = LogBackend([handler], dedup_window=0.2).start()
+    logger = make_logger('test.window', backend)
+
+    for _ in range(10):
+        logger.warning("Failed to read frame from camera")
+    time.sleep(0.9)  # Nothing logged: the listener wakes up on its own
+    assert handler.lines == [
+        "Failed to read frame from camera",
+        "Failed to read frame from camera repeated=9",
+    ]
+
+    logger.warning("Camera stopped delivering frames")
+    logger.warning("Failed to read frame from camera")  # A new window
+    backend.stop()
+    assert handler.lines[2:] == [
+        "Camera stopped delivering frames",
+        "Failed to read frame from camera",
+    ]
+
+
+def test_structured_fields_and_disabled_levels():
+    handler = RecordingHandler()
+    backend = LogBackend([handler], dedup_window=0).start()
+    logger = make_logger('test.fields', backend)
+
+    class Expensive:
+        def __str__(self):
+            raise AssertionError("formatted a disabled message")
+
+    logger.debug("Landmarks: %s", Expensive())
+    logger.info("Camera initialized", extra=fields(width=640, fps=30))
+    backend.stop()
+
+    assert handler.lines == ["Camera initialized width=640 fps=30"]
+    assert "%(message)s" in FORMAT
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = RecordingHandler()
+    backend = LogBackend([handler], queue_size=2, dedup_window=0)  # Listener not started
+    logger = make_logger('test.full', backend)
+
+    for i in range(5):
+        logger.warning("Failed to read frame %d", i)
+
+    assert backend.get_stats()['dropped'] == 3
+    backend.start()
+    backend.stop()
+    assert handler.lines[:2] == ["Failed to read frame 0", "Failed to read frame 1"]
+    assert handler.lines[-1] == "Log queue full, messages dropped dropped=3"
+
+
+def test_queued_records_do_not_see_later_changes():
+    handler = RecordingHandler()
+    backend = LogBackend([handler], queue_size=4, dedup_window=0)  # Listener not started
+    logger = make_logger('test.prepare', backend)
+
+    landmarks = [0.5, 0.5]
+    logger.info("Landmarks: %s", landmarks)
+    landmarks[0] = 0.0  # Reused buffer, changed before the listener runs
+    try:
+        raise ValueError("bad frame")
+    except ValueError:
+        logger.exception("Error in gesture detection")
+
+    backend.start()
+    backend.stop()
+    assert handler.lines[0] == "Landmarks: [0.5, 0.5]"
+    assert handler.lines[1].startswith("Error in gesture detection\nTraceback")
+    assert handler.lines[1].endswith("ValueError: bad frame")
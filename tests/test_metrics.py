@@ -0,0 +1,92 @@
+"""
+Tests for the latency histograms and metrics exporters.
+"""
+import sys
+import os
+import urllib.request
+
+import numpy as np
+import pytest
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.utils.metrics import (
+    LatencyHistogram, MetricsRegistry, MetricsExporter, PrometheusExporter, LogExporter,
+    format_prometheus
+)
+
+
+def test_histogram_percentiles_within_bucket_resolution():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(mean=np.log(0.015), sigma=0.5, size=20000)
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(float(value))
+
+    for q in (0.5, 0.95, 0.99):
+        expected = np.quantile(values, q)
+        assert abs(histogram.percentile(q) - expected) / expected < 0.05
+    assert histogram.snapshot().count == len(values)
+
+
+def test_windowed_summary_only_counts_new_values():
+    registry = MetricsRegistry(enabled=True)
+    for _ in range(100):
+        registry.record("render", 0.001)
+    before = registry.snapshot()
+    for _ in range(10):
+        registry.record("render", 0.1)
+
+    window = registry.summary(since=before)["render"]
+    assert window['count'] == 10
+    assert abs(window['p50'] - 0.1) / 0.1 < 0.05
+    assert registry.summary()["render"]['count'] == 110
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    with registry.timer("capture"):
+        pass
+    assert registry.summary() == {}
+
+
+def test_prometheus_endpoint_serves_text_format():
+    registry = MetricsRegistry(enabled=True)
+    registry.record("hands_process", 0.012)
+    registry.increment("actions")
+    exporter = PrometheusExporter(port=0, registry=registry).start()
+    try:
+        url = f"http://127.0.0.1:{exporter.port}/metrics"
+        body = urllib.request.urlopen(url, timeout=2).read().decode()
+    finally:
+        exporter.stop()
+
+    assert body == format_prometheus(registry)
+    assert 'visionslide_latency_seconds{stage="hands_process",quantile="0.99"}' in body
+    assert 'visionslide_latency_seconds_count{stage="hands_process"} 1' in body
+    assert "visionslide_actions_total 1" in body
+
+
+def test_log_exporter_logs_each_window(caplog):
+    registry = MetricsRegistry(enabled=True)
+    exporter = LogExporter(interval=60, registry=registry)
+    exporter.logger.propagate = True
+
+    registry.record("render", 0.002)
+    with caplog.at_level("INFO"):
+        exporter.log_once()
+        exporter.log_once()  # Nothing new: no line
+
+    lines = [record.getMessage() for record in caplog.records if "latency" in record.getMessage()]
+    assert len(lines) == 1
+    assert "render p50=" in lines[0] and "n=1" in lines[0]
+
+
+def test_exporter_without_stop_cannot_be_created():
+    class StartOnly(MetricsExporter):
+        def start(self):
+            return self
+
+    with pytest.raises(TypeError):
+        StartOnly(MetricsRegistry())
@@ -0,0 +1,420 @@
+"""
+Tests for the pipelined main loop.
+"""
+import sys
+import os
+import threading
+import time
+
+import numpy as np
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.pipeline.stage_queue import StageQueue, BLOCK, DROP_NEWEST, DROP_OLDEST
+
+
+def test_drop_oldest_keeps_newest_items():
+    queue = StageQueue('test', maxsize=2, policy=DROP_OLDEST)
+    for i in range(5):
+        assert queue.put(i)
+    assert queue.get(timeout=0) == 3
+    assert queue.get(timeout=0) == 4
+    assert queue.dropped == 3
+
+
+def test_drop_newest_rejects_when_full():
+    queue = StageQueue('test', maxsize=2, policy=DROP_NEWEST)
+    assert queue.put(1)
+    assert queue.put(2)
+    assert not queue.put(3)
+    assert queue.get(timeout=0) == 1
+    assert queue.dropped == 1
+
+
+def test_block_applies_backpressure():
+    queue = StageQueue('test', maxsize=1, policy=BLOCK)
+    queue.put(1)
+
+    def consume():
+        time.sleep(0.05)
+        queue.get(timeout=1)
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    start = time.monotonic()
+    assert queue.put(2)
+    assert time.monotonic() - start >= 0.04
+    consumer.join()
+    assert queue.get(timeout=0) == 2
+
+
+def test_block_with_timeout_drops():
+    queue = StageQueue('test', maxsize=1, policy=BLOCK, put_timeout=0.01)
+    queue.put(1)
+    assert not queue.put(2)
+    assert queue.dropped == 1
+
+
+def test_close_wakes_consumers():
+    queue = StageQueue('test')
+    threading.Timer(0.02, queue.close).start()
+    assert queue.get(timeout=1) is None
+    assert queue.closed
+    assert not queue.put(1)
+
+
+class FakeCamera:
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    def read_frame(self):
+        time.sleep(0.001)
+        return self.frames.pop(0) if self.frames else None
+
+    def get_fps(self):
+        return 0
+
+
+class FakeDetector:
+    last_handedness = ("Right", 0.9)
+
+    def detect_landmarks(self, frame):
+        return frame
+
+    def get_landmark_array(self, hand_landmarks):
+        return hand_landmarks
+
+    def recognize_gesture(self, hand_landmarks, timestamp=None):
+        return "no_hand" if hand_landmarks is None else hand_landmarks
+
+
+class FakeMapper:
+    def update_gesture(self, gesture_name, hand_landmarks, gesture_detector, timestamp=None,
+                       confidence=1.0):
+        return "next_slide" if gesture_name == "point_right" else None
+
+
+class SlowController:
+    def __init__(self):
+        self.calls = 0
+
+    def next_slide(self):
+        time.sleep(0.2)  # Blocking key injection
+        self.calls += 1
+        return True
+
+
+def test_pipeline_does_not_wait_on_actions():
+    from visionslide.pipeline.pipeline import VisionPipeline
+
+    frames = ["point_right"] + ["open"] * 20
+    controller = SlowController()
+    pipeline = VisionPipeline(FakeCamera(frames), FakeDetector(), FakeMapper(), controller)
+    pipeline.start()
+
+    last_seq = 0
+    last_seen = None
+    start = time.monotonic()
+    while time.monotonic() - start < 1:
+        packet = pipeline.queues['render'].get(timeout=0.1)
+        if packet is None:
+            if pipeline.queues['render'].closed:
+                break
+            continue
+        last_seq = packet.seq
+        last_seen = time.monotonic() - start
+
+    # Every frame went through while the controller was still pressing keys
+    assert last_seq == len(frames)
+    assert last_seen < 0.2
+    assert pipeline.dispatcher.wait_idle(timeout=1)
+    assert controller.calls == 1
+    assert pipeline.last_action == "next_slide"
+    pipeline.stop()
+    pipeline.dispatcher.close()
+
+
+def test_headless_pipeline_never_renders():
+    from visionslide.pipeline.pipeline import VisionPipeline
+
+    controller = SlowController()
+    pipeline = VisionPipeline(FakeCamera(["point_right", "open"]), FakeDetector(),
+                              FakeMapper(), controller, headless=True)
+    pipeline._render = None  # Any render call would fail
+
+    pipeline.run()  # Returns once the camera runs out of frames
+
+    assert len(pipeline.queues['render']) == 0
+    assert not pipeline.is_running()
+
+
+class FakeMotion:
+    def __init__(self):
+        self.motion = False
+
+    def update(self, frame):
+        return self.motion
+
+
+class FakePowerTargets:
+    def __init__(self):
+        self.fps = None
+        self.complexity = None
+
+    def set_fps(self, fps):
+        self.fps = fps
+
+    def set_model_complexity(self, complexity):
+        self.complexity = complexity
+
+
+def test_power_manager_gates_and_idles():
+    from visionslide.config import IDLE_FPS, FPS_TARGET, IDLE_MODEL_COMPLEXITY, MODEL_COMPLEXITY
+    from visionslide.pipeline.power_manager import PowerManager, ACTIVE, IDLE
+
+    targets = FakePowerTargets()
+    motion = FakeMotion()
+    manager = PowerManager(targets, targets, idle_timeout=5.0, motion_detector=motion)
+    start = 100.0
+
+    # Static scene without a hand: skip inference
+    assert not manager.should_infer(None, now=start)
+    # A hand held still keeps being tracked
+    manager.report_hand(True, now=start + 1)
+    assert manager.should_infer(None, now=start + 2)
+
+    # Hand gone long enough: idle
+    manager.report_hand(False, now=start + 2)
+    manager.report_hand(False, now=start + 7.5)
+    assert manager.state == IDLE
+    assert (targets.fps, targets.complexity) == (IDLE_FPS, IDLE_MODEL_COMPLEXITY)
+
+    # Motion wakes everything up
+    motion.motion = True
+    assert manager.should_infer(None, now=start + 10)
+    assert manager.state == ACTIVE
+    assert (targets.fps, targets.complexity) == (FPS_TARGET, MODEL_COMPLEXITY)
+
+    stats = manager.get_stats(now=start + 10)
+    assert stats['skipped_frames'] == 1
+    assert stats['wake_count'] == 1
+    assert abs(stats['idle_time'] - 2.5) < 1e-6
+
+
+class FakeTunable(FakePowerTargets):
+    def __init__(self):
+        super().__init__()
+        self.scale = None
+
+    def set_inference_scale(self, scale):
+        self.scale = scale
+
+
+def test_auto_tuner_steps_down_fast_and_up_slowly():
+    from visionslide.gestures.landmark_filter import LandmarkTracker
+    from visionslide.pipeline.auto_tuner import AutoTuner
+    from visionslide.utils.metrics import MetricsRegistry, FRAME_TO_DECISION
+
+    registry = MetricsRegistry(enabled=True)
+    detector = FakeTunable()
+    tracker = LandmarkTracker()
+    ladder = [(1, 1.0, 1), (0, 1.0, 1), (0, 0.5, 2)]
+    tuner = AutoTuner(detector, tracker, target_latency=0.05, ladder=ladder,
+                      interval=1.0, registry=registry)
+    now = [0.0]
+
+    def window(latency):
+        # One second of 30 frames at this latency, then the decision
+        for _ in range(30):
+            registry.record(FRAME_TO_DECISION, latency)
+        now[0] += 1.0
+        return tuner.update(now[0])
+
+    tuner.update(now[0])
+    assert (detector.complexity, detector.scale, tracker.keyframe_interval) == (1, 1.0, 1)
+
+    # Over budget: one step cheaper per window
+    assert window(0.1)
+    assert window(0.1)
+    assert (detector.complexity, detector.scale, tracker.keyframe_interval) == (0, 0.5, 2)
+    assert not window(0.1)  # Already the cheapest level
+
+    # Within budget but without headroom: stay
+    for _ in range(5):
+        assert not window(0.04)
+    # Well under budget: back up only after several windows (twice as many,
+    # since level 1 already failed once)
+    steps = [window(0.01) for _ in range(6)]
+    assert steps == [False] * 5 + [True]
+    assert tuner.level == 1
+    assert detector.scale == 1.0 and tracker.keyframe_interval == 1
+
+    # Failing again doubles the wait once more
+    assert window(0.1)
+    steps = [window(0.01) for _ in range(12)]
+    assert steps == [False] * 11 + [True]
+    assert tuner.get_stats()['changes'] == 5
+
+
+def test_frame_ring_reuses_slots_once_released():
+    from visionslide.pipeline.frame_ring import FrameRing
+
+    ring = FrameRing(2, (4, 4, 3))
+    try:
+        first = ring.put(np.full((4, 4, 3), 7, dtype=np.uint8))
+        second = ring.acquire()
+        assert ring.acquire() is None and ring.exhausted == 1
+
+        ring.retain(first)  # A second reader, e.g. the recorder
+        ring.release(first)
+        assert ring.acquire() is None
+        ring.release(first)
+        assert ring.acquire() == first
+        assert ring.array(first)[0, 0, 0] == 7
+        assert ring.put(np.zeros((2, 2, 3), dtype=np.uint8)) is None  # Wrong shape
+        assert second is not None
+    finally:
+        ring.close()
+
+
+class FakeFrameDetector:
+    """Runs in the detector process: the landmarks encode the first pixel."""
+    last_handedness = ("Left", 0.8)
+
+    def detect_landmarks(self, frame):
+        value = int(frame[0, 0, 0])
+        return np.full((21, 3), value, dtype=np.float32) if value else None
+
+    def get_landmark_array(self, hand_landmarks):
+        return hand_landmarks
+
+    def get_inference_stats(self):
+        return {'full_frames': 1}
+
+    def release(self):
+        pass
+
+
+def fake_frame_detector_factory():
+    return FakeFrameDetector()
+
+
+class FakeRecorder:
+    def __init__(self):
+        self.values = []
+
+    def write(self, frame, timestamp, release=None):
+        self.values.append((int(frame[0, 0, 0]), release is not None))
+        release()
+
+    def get_stats(self):
+        return {'written': len(self.values), 'dropped': 0, 'queued': 0}
+
+
+class FakeTimeline:
+    def __init__(self):
+        self.rows = []
+
+    def append(self, timestamp, landmarks, handedness, score, gesture, action):
+        self.rows.append((None if landmarks is None else float(landmarks[0, 0]), handedness))
+
+
+def test_process_detector_reads_frames_from_shared_slots():
+    from visionslide.pipeline.pipeline import VisionPipeline
+    from visionslide.pipeline.process_detector import ProcessDetector
+
+    detector = ProcessDetector(slots=3, detector_factory=fake_frame_detector_factory)
+    frames = [np.full((8, 8, 3), value, dtype=np.uint8) for value in (10, 0, 30)]
+    recorder, timeline = FakeRecorder(), FakeTimeline()
+    try:
+        pipeline = VisionPipeline(FakeCamera(frames), detector, FakeMapper(), SlowController(),
+                                  queue_config={'detect': (1, BLOCK), 'recognize': (1, BLOCK)},
+                                  headless=True, recorder=recorder, timeline=timeline)
+        pipeline.run()
+
+        # Only landmark arrays came back; every slot was given back
+        assert timeline.rows == [(10.0, "Left"), (None, None), (30.0, "Left")]
+        assert recorder.values == [(10, True), (0, True), (30, True)]
+        assert pipeline.frame_ring.in_use() == 0
+        assert detector.get_inference_stats() == {'full_frames': 1}
+    finally:
+        detector.release()
+
+
+class InProcessFrameDetector(FakeFrameDetector):
+    def recognize_gesture(self, hand_landmarks, timestamp=None):
+        return "no_hand" if hand_landmarks is None else "open"
+
+
+class PooledCamera(FakeCamera):
+    def __init__(self, values):
+        from visionslide.camera.frame_pool import FramePool
+
+        super().__init__(values)
+        self.frame_pool = FramePool(size=4)
+
+    def read_frame(self):
+        time.sleep(0.001)
+        if not self.frames:
+            return None
+        frame = self.frame_pool.acquire((8, 8, 3))
+        frame[:] = self.frames.pop(0)
+        return frame
+
+
+def test_pipeline_gives_camera_buffers_back():
+    from visionslide.pipeline.pipeline import VisionPipeline
+
+    camera, recorder = PooledCamera([10, 0, 30] * 10), FakeRecorder()
+    pipeline = VisionPipeline(camera, InProcessFrameDetector(), FakeMapper(), SlowController(),
+                              queue_config={'detect': (1, BLOCK), 'recognize': (1, BLOCK)},
+                              headless=True, recorder=recorder)
+    pipeline.run()
+
+    assert [value for value, _ in recorder.values] == [10, 0, 30] * 10
+    assert camera.frame_pool.in_use() == 0
+    assert camera.frame_pool.exhausted == 0
+    assert camera.frame_pool.reused == 30 - camera.frame_pool.allocated
+
+
+def test_overlay_rasterizes_only_changed_elements():
+    from visionslide.pipeline.overlay import Overlay
+
+    hud = Overlay()
+    hud.add('fps', (10, 30), (0, 255, 0))
+    hud.add('gesture', (10, 60), (255, 255, 255))
+    frame = np.zeros((120, 200, 3), dtype=np.uint8)
+    for _ in range(5):
+        hud.set('fps', "FPS: 30")
+        hud.set('gesture', "Gesture: open")
+        hud.draw(frame)
+    assert hud.get_stats() == {'rasterized': 2, 'rebuilt': 1, 'composited': 5}
+    assert frame[:40, :, 1].max() == 255 and frame[:40, :, 0].max() == 0  # Green FPS line
+    assert frame[40:, :, 0].max() == 255
+
+    # Hiding an element removes it from the composited layer; the
+    # background between the letters is left untouched
+    hud.set('gesture', None)
+    frame[:] = 100
+    hud.draw(frame)
+    assert (frame[40:] == 100).all()
+    assert (frame[:40, 0] == 100).all() and frame[:40, :, 1].max() > 100
+    assert hud.rebuilt == 2
+
+
+def test_render_rate_is_independent_of_inference():
+    from visionslide.pipeline.pipeline import VisionPipeline
+
+    frames = ["open"] * 60  # About 1 ms apart, far above the render rate
+    pipeline = VisionPipeline(FakeCamera(frames), FakeDetector(), FakeMapper(),
+                              SlowController(), render_fps=20)
+    rendered = []
+    pipeline._render = lambda packet: rendered.append(packet.seq) or True
+
+    pipeline.run()
+
+    assert pipeline.stages[1].processed == len(frames)
+    assert len(rendered) < len(frames) // 2
+    assert rendered == sorted(rendered) and rendered[-1] == len(frames)
+    assert pipeline.render_skipped > 0
@@ -0,0 +1,95 @@
+"""
+Loopback tests for remote presenter control.
+"""
+import sys
+import os
+
+import pytest
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.controls import remote_protocol as protocol
+from visionslide.controls.key_backends import MockKeyBackend
+from visionslide.controls.ppt_controller import PPTController
+from visionslide.controls.remote_controller import RemoteController
+from visionslide.controls.remote_receiver import RemoteReceiver
+
+
+def make_receiver(transport, secret=None):
+    backend = MockKeyBackend()
+    controller = PPTController(target="powerpoint", backend=backend)
+    controller.connect()
+    controller.action_cooldown = 0.0
+    receiver = RemoteReceiver(controller, host="127.0.0.1", port=0, transport=transport,
+                              secret=secret).start()
+    return receiver, backend
+
+
+@pytest.mark.parametrize("transport", ["tcp", "udp"])
+def test_actions_round_trip_on_loopback(transport):
+    receiver, backend = make_receiver(transport)
+    sender = RemoteController("127.0.0.1", receiver.port, transport=transport)
+    sender.connect()
+    try:
+        assert sender.next_slide()
+        assert sender.next_slide()
+        assert sender.previous_slide()
+        assert sender.wait_acked(timeout=2)
+    finally:
+        sender.release()
+        receiver.stop()
+
+    assert backend.keys == ["right", "right", "left"]
+    stats = sender.get_stats()
+    assert stats['acked'] == 3 and stats['pending'] == 0
+    assert 0 < stats['rtt_last'] < 1
+
+
+def test_receiver_drops_duplicate_sequence_numbers():
+    receiver, backend = make_receiver("tcp")
+    receiver.stop()
+    message = protocol.pack(protocol.KIND_ACTION, protocol.ACTION_CODES["next_slide"], 7, 1, 0.0)
+
+    first = protocol.unpack(receiver.handle_message(message))
+    again = protocol.unpack(receiver.handle_message(message))
+
+    assert first[1] == protocol.STATUS_OK
+    assert again[1] == protocol.STATUS_DUPLICATE
+    assert backend.keys == ["right"]
+
+
+def test_unsigned_messages_are_rejected_with_a_secret():
+    receiver, backend = make_receiver("udp", secret="room-42")
+    receiver.stop()
+    code = protocol.ACTION_CODES["next_slide"]
+
+    assert receiver.handle_message(protocol.pack(protocol.KIND_ACTION, code, 1, 1, 0.0)) is None
+    signed = protocol.pack(protocol.KIND_ACTION, code, 1, 1, 0.0, secret=b"room-42")
+    assert receiver.handle_message(signed) is not None
+    assert backend.keys == ["right"]
+
+
+def test_sender_never_blocks_without_receiver():
+    import time
+
+    sender = RemoteController("127.0.0.1", 9, transport="tcp")  # Nothing listens there
+    sender.connect()
+    try:
+        start = time.monotonic()
+        for _ in range(10):
+            assert sender.next_slide()
+        assert time.monotonic() - start < 0.01
+    finally:
+        sender.release()
+
+
+def test_receiver_refuses_network_address_without_secret(capsys):
+    from visionslide.controls import remote_receiver
+
+    assert remote_receiver.is_loopback("127.0.0.1")
+    assert remote_receiver.is_loopback("localhost")
+    assert not remote_receiver.is_loopback("0.0.0.0")
+    with pytest.raises(SystemExit):
+        remote_receiver.main(["--host", "0.0.0.0", "--key-backend", "mock"])
+    assert "--secret" in capsys.readouterr().err
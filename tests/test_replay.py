@@ -0,0 +1,102 @@
+"""
+Tests for session recording and replay.
+"""
+import sys
+import os
+import threading
+import time
+
+import numpy as np
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.camera.session_recorder import SessionRecorder, timestamps_path
+from visionslide.camera.replay_stream import ReplayStream
+
+
+def record_session(path, n_frames=10, interval=0.02):
+    recorder = SessionRecorder(str(path), fps=1.0 / interval)
+    for i in range(n_frames):
+        frame = np.full((120, 160, 3), i * 20, dtype=np.uint8)
+        recorder.write(frame, 50.0 + i * interval)
+        frame[:] = 0  # The recorder works on its own copy
+    recorder.close()
+    return recorder
+
+
+def test_record_and_replay_fast(tmp_path):
+    path = tmp_path / "session.mp4"
+    recorder = record_session(path)
+    assert recorder.frames_written == 10
+    assert os.path.exists(timestamps_path(str(path)))
+
+    replay = ReplayStream(str(path), realtime=False)
+    assert replay.initialize()
+    assert replay.get_resolution() == (160, 120)
+
+    frames, times = [], []
+    while True:
+        frame = replay.read_frame()
+        if frame is None:
+            break
+        frames.append(frame)
+        times.append(replay.last_frame_time)
+    replay.release()
+
+    assert len(frames) == 10
+    np.testing.assert_allclose(times, np.arange(10) * 0.02, atol=1e-6)
+    # Lossy codec, but brightness ramps like the recorded frames
+    means = [frame.mean() for frame in frames]
+    assert all(abs(mean - i * 20) < 8 for i, mean in enumerate(means))
+    assert not replay.is_running()
+
+
+def test_replay_realtime_follows_timestamps(tmp_path):
+    path = tmp_path / "session.mp4"
+    record_session(path, n_frames=6, interval=0.05)
+
+    replay = ReplayStream(str(path), realtime=True)
+    assert replay.initialize()
+    start = time.monotonic()
+    while replay.read_frame() is not None:
+        pass
+    elapsed = time.monotonic() - start
+    replay.release()
+
+    assert elapsed >= 0.24
+
+
+class StalledWriter:
+    def __init__(self):
+        self.release_event = threading.Event()
+
+    def write(self, frame):
+        self.release_event.wait(2)
+
+    def release(self):
+        pass
+
+
+def test_stalled_encoder_drops_frames_instead_of_blocking_capture(tmp_path, monkeypatch):
+    from visionslide.camera import session_recorder
+
+    monkeypatch.setattr(session_recorder, "RECORDING_QUEUE_SIZE", 2)
+    recorder = SessionRecorder(str(tmp_path / "stalled.avi"), put_timeout=0.01)
+    writer = StalledWriter()
+
+    def open_stalled(frame):
+        recorder._writer = writer
+        recorder._timestamps = open(timestamps_path(recorder.path), "w")
+
+    recorder._open = open_stalled
+    frame = np.zeros((8, 8, 3), dtype=np.uint8)
+    start = time.monotonic()
+    accepted = [recorder.write(frame, i / 30.0) for i in range(20)]
+    assert time.monotonic() - start < 1.0
+    assert not all(accepted)
+    assert recorder.get_stats()['dropped'] == accepted.count(False)
+
+    writer.release_event.set()
+    recorder.close()
+    assert recorder.frames_written == accepted.count(True)
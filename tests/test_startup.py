@@ -0,0 +1,92 @@
+"""
+Tests for the lazy package imports and the overlapped startup.
+"""
+import sys
+import os
+import subprocess
+import threading
+import time
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_visionslide_is_lazy():
+    code = (
+        "import sys, visionslide\n"
+        "heavy = [m for m in ('cv2', 'mediapipe', 'pyautogui') if m in sys.modules]\n"
+        "assert not heavy, heavy\n"
+        "assert visionslide.GestureMapper.__name__ == 'GestureMapper'\n"
+        "assert 'GestureDetector' in dir(visionslide)\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.environ.get('PYTHONPATH', '')]))
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+class SlowCamera:
+    def __init__(self):
+        self.thread = None
+
+    def initialize(self):
+        self.thread = threading.current_thread()
+        time.sleep(0.3)
+        return True
+
+
+def test_start_components_overlaps_camera_and_model(monkeypatch):
+    from visionslide import app
+
+    def slow_detector(args):
+        time.sleep(0.3)
+        return "detector"
+
+    monkeypatch.setattr(app, "create_detector", slow_detector)
+    monkeypatch.setattr(app, "create_controllers", lambda args: ("ppt", "os"))
+    camera = SlowCamera()
+
+    start = time.perf_counter()
+    result = app.start_components(app.parse_args([]), camera)
+    elapsed = time.perf_counter() - start
+
+    assert result == (True, "detector", "ppt", "os")
+    assert camera.thread is not threading.main_thread()
+    assert elapsed < 0.55
+
+
+def test_subcommands_are_listed_and_forward_their_arguments(capsys):
+    import pytest
+    from visionslide import app
+
+    with pytest.raises(SystemExit):
+        app.parse_args(["--help"])
+    usage = capsys.readouterr().out
+    assert all(name in usage for name in ("serve", "train", "batch"))
+
+    args = app.parse_args(["batch", "talk.mp4", "-o", "out", "--help"])
+    assert args.command == "batch"
+    assert args.command_args == ["talk.mp4", "-o", "out", "--help"]
+    assert app.parse_args([]).command is None
+    with pytest.raises(SystemExit):
+        app.parse_args(["--no-such-option"])
+
+
+class Releasable:
+    def __init__(self):
+        self.released = False
+
+    def release(self):
+        self.released = True
+
+
+def test_camera_is_released_when_it_fails_to_open(monkeypatch):
+    from visionslide import app
+
+    camera, detector, controller = Releasable(), Releasable(), Releasable()
+    monkeypatch.setattr(app, "CameraStream", lambda: camera)
+    monkeypatch.setattr(app, "start_components",
+                        lambda args, cam: (False, detector, controller, None))
+    app.main(["--headless"])
+    assert camera.released and detector.released and controller.released
@@ -0,0 +1,108 @@
+"""
+Tests for the memory-mapped gesture timeline store.
+"""
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visionslide.gestures.timeline_store import TimelineWriter, TimelineStore
+from visionslide.gestures.landmarks import classify_landmarks
+
+
+def write_session(path, n_frames=1000):
+    rng = np.random.default_rng(0)
+    gestures = ["no_hand"] * 100 + ["point_right"] * 30 + ["unknown"] * 70
+    with TimelineWriter(str(path), chunk_size=64) as writer:
+        for i in range(n_frames):
+            gesture = gestures[i % len(gestures)]
+            landmarks = None if gesture == "no_hand" else rng.random((21, 3), dtype=np.float32)
+            action = "next_slide" if i % len(gestures) == 125 else None
+            writer.append(i / 30.0, landmarks, "Right" if landmarks is not None else None,
+                          0.9, gesture, action)
+    return writer
+
+
+def test_round_trip_and_queries(tmp_path):
+    write_session(tmp_path / "session")
+    store = TimelineStore(str(tmp_path / "session"))
+
+    assert len(store) == 1000
+    assert isinstance(store.landmarks, np.memmap)
+    assert store.landmarks.shape == (1000, 21, 3)
+    assert store.hand_mask.sum() == 500
+
+    rows = store.time_range(10.0, 20.0)
+    assert store.timestamp[rows.start] >= 10.0 > store.timestamp[rows.start - 1]
+    assert store.timestamp[rows.stop - 1] < 20.0
+
+    pointing = store.frames_with_gesture("point_right")
+    assert len(pointing) == 150
+    assert set(store.decode_gestures(pointing)) == {"point_right"}
+    assert len(store.frames_with_gesture("open_hand")) == 0
+
+    assert store.frames_with_action("next_slide").tolist() == [125, 325, 525, 725, 925]
+    segments = store.gesture_segments("point_right")
+    np.testing.assert_allclose(segments[0], [100 / 30.0, 129 / 30.0])
+    assert len(segments) == 5
+
+
+def test_store_feeds_batch_recognition_without_copy(tmp_path):
+    write_session(tmp_path / "session", n_frames=200)
+    store = TimelineStore(str(tmp_path / "session"))
+
+    batch = np.asarray(store.landmarks, dtype=np.float32)
+    assert np.shares_memory(batch, store.landmarks)
+    assert len(classify_landmarks(store.landmarks)) == 200
+
+
+def test_reader_ignores_partial_rows(tmp_path):
+    path = tmp_path / "session"
+    writer = write_session(path, n_frames=100)
+    with open(os.path.join(str(path), "timestamp.bin"), "ab") as f:
+        f.write(b"\0" * 8)  # A row only half written by a live writer
+
+    assert len(TimelineStore(str(path))) == writer.rows_written == 100
+
+
+def test_reopened_writer_drops_rows_missing_from_some_columns(tmp_path):
+    path = tmp_path / "session"
+    write_session(path, n_frames=100)
+    for name, size in (("landmarks", 21 * 3 * 4), ("gesture", 1)):
+        with open(os.path.join(str(path), f"{name}.bin"), "ab") as f:
+            f.write(b"\1" * size * 3)  # A writer that died mid-chunk
+
+    with TimelineWriter(str(path)) as writer:
+        assert writer.rows_written == 100
+        writer.append(100.0, None, None, 0.0, "point_right")
+
+    store = TimelineStore(str(path))
+    assert len(store) == 101
+    assert store.timestamp[100] == 100.0
+    assert store.decode_gestures([100]).tolist() == ["point_right"]
+
+
+def test_time_queries_stay_within_a_session(tmp_path):
+    path = tmp_path / "rooms"
+    write_session(path, n_frames=300)      # First room: 0 .. 10 s
+    with TimelineWriter(str(path)) as writer:
+        for i in range(300):               # Second room: a new clock, 5 .. 15 s
+            writer.append(5.0 + i / 30.0, None, None, 0.0, "point_right")
+        writer.append(0.0, gesture="point_right")  # Clock reset inside one writer
+
+    store = TimelineStore(str(path))
+    assert store.sessions == [slice(0, 300), slice(300, 600), slice(600, 601)]
+    assert store.time_range(6.0, 7.0, session=0) == slice(180, 210)
+    assert store.time_range(6.0, 7.0, session=1) == slice(330, 360)
+    with pytest.raises(ValueError):
+        store.time_range(6.0, 7.0)
+
+    # The first room points from 100/30 s to 130/30 s, the second all along
+    pointing = store.frames_with_gesture("point_right", 6.0, 7.0)
+    assert pointing.tolist() == list(range(330, 360))
+    runs = store.gesture_segments("point_right")
+    assert runs[1:].tolist() == [[5.0, 5.0 + 299 / 30.0], [0.0, 0.0]]  # Split at the reset
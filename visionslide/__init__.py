@@ -6,15 +6,33 @@ __version__ = "1.0.0"
 __author__ = "Nelson Galley"
 __email__ = "nelsgalley@gmail.com"
 
-# Import des modules principaux
-from visionslide.camera.camera_stream import CameraStream
-from visionslide.gestures.gesture_detector import GestureDetector
-from visionslide.gestures.gesture_mapping import GestureMapper
-from visionslide.controls.ppt_controller import PPTController
+import importlib
+
+# Import des modules principaux, à la demande : `import visionslide` ne
+# charge ni OpenCV, ni MediaPipe, ni pyautogui (PEP 562)
+_LAZY_IMPORTS = {
+    "CameraStream": "visionslide.camera.camera_stream",
+    "GestureDetector": "visionslide.gestures.gesture_detector",
+    "GestureMapper": "visionslide.gestures.gesture_mapping",
+    "PPTController": "visionslide.controls.ppt_controller",
+}
 
 __all__ = [
     "CameraStream",
-    "GestureDetector", 
+    "GestureDetector",
     "GestureMapper",
     "PPTController",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # Next accesses skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
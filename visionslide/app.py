@@ -2,115 +2,237 @@
 VisionSlide - Main Application Entry Point
 Control PowerPoint presentations with hand gestures.
 """
+import argparse
 import cv2
+import importlib
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the visionslide package to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from .camera.camera_stream import CameraStream
-from .gestures.gesture_detector import GestureDetector
+from .camera.replay_stream import ReplayStream
+from .camera.session_recorder import SessionRecorder
 from .gestures.gesture_mapping import GestureMapper
+from .gestures.landmark_filter import LandmarkTracker
+from .gestures.timeline_store import TimelineWriter
 from .controls.ppt_controller import PPTController
-from .controls.os_controller import OSController
+from .controls.key_backends import KEY_BACKENDS, select_backend
+from .controls.remote_controller import RemoteController
+from .pipeline.pipeline import VisionPipeline
+from .pipeline.auto_tuner import AutoTuner
+from .pipeline.power_manager import PowerManager
+from .utils.metrics import LogExporter, PrometheusExporter
 from .config import *
 
-def main():
+# Subcommands: module with a main(argv) and the help line shown by --help
+COMMANDS = {
+    "serve": (".pipeline.inference_server", "watch several cameras with one pool of detector processes"),
+    "train": (".gestures.classifier", "train a gesture classifier on recorded timelines"),
+    "batch": (".pipeline.batch", "extract gesture timelines from video files, in parallel"),
+}
+
+def parse_args(argv=None):
+    """
+    Parse command line options. With a subcommand, args.command names it and
+    args.command_args holds the rest of the line for that command's parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="visionslide",
+        description="Control PowerPoint presentations with hand gestures. "
+                    "Without a command, runs the gesture control."
+    )
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND", title="commands")
+    for name, (_, help_text) in COMMANDS.items():
+        # The command parses its own options, --help included
+        commands.add_parser(name, help=f"{help_text} (visionslide {name} --help)", add_help=False)
+    parser.add_argument(
+        "--headless", action="store_true",
+        help="run without preview window or overlay drawing; stop with Ctrl+C or SIGTERM"
+    )
+    parser.add_argument(
+        "--render-fps", metavar="FPS", type=float, default=RENDER_FPS,
+        help=f"refresh the preview window at most FPS times per second (default {RENDER_FPS})"
+    )
+    parser.add_argument(
+        "--record", metavar="VIDEO",
+        help="save the camera frames to VIDEO (plus a .timestamps.csv sidecar)"
+    )
+    parser.add_argument(
+        "--timeline", metavar="DIR",
+        help="log per-frame landmarks, gestures and actions to a timeline store in DIR"
+    )
+    parser.add_argument(
+        "--replay", metavar="VIDEO",
+        help="use a recorded session instead of the webcam"
+    )
+    parser.add_argument(
+        "--fast", action="store_true",
+        help="with --replay, process every frame as fast as possible instead of in real time"
+    )
+    parser.add_argument(
+        "--keyframes", metavar="K", type=int, default=KEYFRAME_INTERVAL,
+        help="while the hand is steady, run hand detection on one frame in K "
+             "and predict the landmarks in between"
+    )
+    parser.add_argument(
+        "--gesture-model", metavar="MODEL", default=GESTURE_MODEL,
+        help="classify hand poses with a trained model (visionslide train) instead of the rules"
+    )
+    parser.add_argument(
+        "--autotune", metavar="MS", type=float, nargs="?",
+        const=AUTOTUNE_TARGET_LATENCY * 1000,
+        default=AUTOTUNE_TARGET_LATENCY * 1000 if AUTOTUNE else None,
+        help=f"adjust model complexity, inference resolution and skipped frames at runtime "
+             f"to keep the p95 latency under MS milliseconds (default {AUTOTUNE_TARGET_LATENCY * 1000:.0f})"
+    )
+    parser.add_argument(
+        "--inference-process", action="store_true", default=INFERENCE_PROCESS,
+        help="run hand detection in a separate process, fed through shared memory"
+    )
+    parser.add_argument(
+        "--key-backend", choices=["auto"] + sorted(KEY_BACKENDS), default=KEY_BACKEND,
+        help="how key presses are sent (default: fastest available)"
+    )
+    parser.add_argument(
+        "--remote", metavar="HOST[:PORT]",
+        help="send actions to a visionslide-receiver on another machine instead of pressing keys here"
+    )
+    parser.add_argument(
+        "--remote-udp", action="store_true",
+        help="with --remote, use UDP instead of a persistent TCP connection"
+    )
+    parser.add_argument(
+        "--metrics-port", metavar="PORT", type=int, nargs="?", const=METRICS_PORT,
+        help=f"serve per-stage latency in Prometheus text format on localhost:PORT "
+             f"(default {METRICS_PORT})"
+    )
+    parser.add_argument(
+        "--metrics-interval", metavar="SECONDS", type=float, default=METRICS_LOG_INTERVAL,
+        help="log per-stage latency percentiles every SECONDS (0 to disable)"
+    )
+    args, rest = parser.parse_known_args(argv)
+    if rest and args.command is None:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    args.command_args = rest
+    return args
+
+def create_detector(args):
+    """Hand detector with its model built and warmed up (imports MediaPipe)."""
+    if args.inference_process:
+        from .pipeline.process_detector import ProcessDetector
+        return ProcessDetector(gesture_model=args.gesture_model)  # Warms up in its process
+    from .gestures.gesture_detector import GestureDetector
+    gesture_detector = GestureDetector(gesture_model=args.gesture_model)
+    gesture_detector.warm_up()
+    return gesture_detector
+
+def create_controllers(args):
+    """Presentation and OS controllers (imports the key injection backend)."""
+    if args.remote:
+        host, _, port = args.remote.partition(":")
+        ppt_controller = RemoteController(host, int(port or REMOTE_PORT),
+                                          transport="udp" if args.remote_udp else "tcp")
+    else:
+        ppt_controller = PPTController(backend=select_backend(args.key_backend))
+    from .controls.os_controller import OSController
+    return ppt_controller, OSController()
+
+def start_components(args, camera):
+    """
+    Open the camera, build the hand model and set up the controllers at the
+    same time: opening a webcam mostly waits on the driver, MediaPipe mostly
+    on imports and model setup. Returns (camera_ok, gesture_detector,
+    ppt_controller, os_controller).
+    """
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix='Startup') as executor:
+        camera_ready = executor.submit(camera.initialize)
+        detector = executor.submit(create_detector, args)
+        controllers = executor.submit(create_controllers, args)
+        ppt_controller, os_controller = controllers.result()
+        return camera_ready.result(), detector.result(), ppt_controller, os_controller
+
+def main(argv=None):
     """Main application function."""
+    args = parse_args(argv)
+    if args.command:
+        module = importlib.import_module(COMMANDS[args.command][0], __package__)
+        return module.main(args.command_args)
+    
     print("🎭 VisionSlide - PowerPoint Gesture Control")
     print("=" * 40)
     print("Gesture Controls:")
     print("👉 Point RIGHT → Next slide")
     print("👈 Point LEFT → Previous slide") 
+    print("👋 Swipe RIGHT / LEFT → Next / Previous slide")
     print("✋ Open hand → Exit application")
-    print("Press 'q' or ESC to quit")
+    if args.headless:
+        print("Headless mode: press Ctrl+C or send SIGTERM to quit")
+    else:
+        print("Press 'q' or ESC to quit")
     print("=" * 40)
     print("IMPORTANT: Start PowerPoint slideshow first!")
     print()
     
     # Initialize components
-    camera = CameraStream()
-    gesture_detector = GestureDetector()
+    start = time.perf_counter()
+    if args.replay:
+        camera = ReplayStream(args.replay, realtime=not args.fast)
+    else:
+        camera = CameraStream()
     gesture_mapper = GestureMapper()
-    ppt_controller = PPTController()
-    os_controller = OSController()
+    camera_ok, gesture_detector, ppt_controller, os_controller = start_components(args, camera)
     
-    # Initialize camera
-    if not camera.initialize():
+    if not camera_ok:
         print("❌ Failed to initialize camera. Please check your webcam.")
+        camera.release()
+        gesture_detector.release()
+        ppt_controller.release()
         return
     
     # Connect to PowerPoint
     ppt_controller.connect()
     
-    print("✅ VisionSlide started successfully!")
+    print(f"✅ VisionSlide started successfully! ({time.perf_counter() - start:.1f}s)")
     print("🎮 Gesture controls are now active...")
     
+    queue_config = None
+    if args.replay and args.fast:
+        # Lossless: every recorded frame goes through detection and mapping
+        queue_config = {name: (PIPELINE_QUEUES[name][0], "block")
+                        for name in ("detect", "recognize")}
+    
+    recorder = SessionRecorder(args.record) if args.record else None
+    timeline = TimelineWriter(args.timeline) if args.timeline else None
+    power_manager = PowerManager(camera, gesture_detector) if MOTION_GATING else None
+    tracker = None
+    autotune_skips = args.autotune is not None and any(level[2] > 1 for level in AUTOTUNE_LADDER)
+    if LANDMARK_FILTER or args.keyframes > 1 or autotune_skips:
+        tracker = LandmarkTracker(keyframe_interval=args.keyframes)
+    auto_tuner = None
+    if args.autotune is not None:
+        auto_tuner = AutoTuner(gesture_detector, tracker, power_manager,
+                               target_latency=args.autotune / 1000)
+    pipeline = VisionPipeline(camera, gesture_detector, gesture_mapper, ppt_controller,
+                              queue_config=queue_config, headless=args.headless,
+                              power_manager=power_manager, recorder=recorder,
+                              timeline=timeline, tracker=tracker, auto_tuner=auto_tuner,
+                              render_fps=args.render_fps)
+    
+    exporters = []
+    if args.metrics_interval > 0:
+        exporters.append(LogExporter(args.metrics_interval))
+    if args.metrics_port is not None:
+        exporters.append(PrometheusExporter(args.metrics_port))
+    
     try:
-        while camera.is_running():
-            # Read frame from camera
-            frame = camera.read_frame()
-            if frame is None:
-                break
-            
-            # Detect gestures
-            processed_frame, hand_landmarks = gesture_detector.detect_gestures(frame)
-            
-            gesture_name = "no_hand"  # Default value
-            action_performed = False
-            
-            if hand_landmarks:
-                gesture_name = gesture_detector.recognize_gesture(hand_landmarks)
-            
-            # Display information on frame
-            fps = camera.get_fps()
-            cv2.putText(processed_frame, f"FPS: {fps}", (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            
-            status_text = f"Gesture: {gesture_name}"
-            cv2.putText(processed_frame, status_text, (10, 60), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            
-            # Check and execute actions (with error handling)
-            if gesture_name and gesture_name not in ["unknown", "no_hand", "pointing"]:
-                try:
-                    action = gesture_mapper.update_gesture(gesture_name, hand_landmarks, gesture_detector)
-                    
-                    if action:
-                        action_text = f"Action: {action}"
-                        cv2.putText(processed_frame, action_text, (10, 90), 
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-                        
-                        # Execute the action
-                        if action == "next_slide":
-                            ppt_controller.next_slide()
-                            action_performed = True
-                        elif action == "previous_slide":
-                            ppt_controller.previous_slide()
-                            action_performed = True
-                        elif action == "exit":
-                            print("Exit gesture detected - stopping VisionSlide")
-                            break
-                except Exception as e:
-                    # Log error but continue running
-                    error_text = f"Error: {str(e)[:20]}..."
-                    cv2.putText(processed_frame, error_text, (10, 120), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
-            
-            # Show action confirmation
-            if action_performed:
-                cv2.putText(processed_frame, "ACTION EXECUTED", (10, 150), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-            
-            # Display frame
-            cv2.imshow('VisionSlide - PowerPoint Gesture Control', processed_frame)
-            
-            # Check for quit key
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q') or key == 27:  # 'q' or ESC
-                print("Quit signal received")
-                break
+        for exporter in exporters:
+            exporter.start()
+        
+        pipeline.run()
                 
     except KeyboardInterrupt:
         print("\nApplication interrupted by user")
@@ -119,9 +241,19 @@ def main():
     
     finally:
         # Cleanup
+        pipeline.stop()
+        for exporter in exporters:
+            exporter.stop()
+        # The recorder may still be writing frames from shared memory
+        if recorder:
+            recorder.close()
         gesture_detector.release()
+        ppt_controller.release()
         camera.release()
-        cv2.destroyAllWindows()
+        if timeline:
+            timeline.close()
+        if not args.headless:
+            cv2.destroyAllWindows()
         print("✅ VisionSlide stopped successfully")
 
 if __name__ == "__main__":
@@ -3,21 +3,47 @@ Camera management module for VisionSlide.
 Handles video capture and frame processing.
 """
 import cv2
+import threading
 import time
 from visionslide.config import *
-from visionslide.utils.logger import setup_logger
+from visionslide.camera.frame_pool import FramePool
+from visionslide.utils.logger import setup_logger, fields
+from visionslide.utils.metrics import get_metrics, CAPTURE
 
 class CameraStream:
     """Manages camera capture and frame processing."""
     
-    def __init__(self, camera_index=CAMERA_INDEX):
+    def __init__(self, camera_index=CAMERA_INDEX, threaded=CAMERA_THREADED,
+                 buffer_size=CAMERA_BUFFER_SIZE):
         self.logger = setup_logger('CameraStream')
+        self.metrics = get_metrics()
         self.camera_index = camera_index
         self.cap = None
         self.frame_count = 0
         self.fps = 0
         self.last_time = time.time()
         self._is_running = False
+        # Frames are decoded into reused buffers instead of new arrays;
+        # whoever reads a frame gives it back with frame_pool.release(frame)
+        self.frame_pool = FramePool()
+        
+        # Threaded latest-frame mode
+        self.threaded = threaded
+        self.buffer_size = max(1, buffer_size)
+        self._ring = [None] * self.buffer_size
+        self._write_seq = 0      # Number of frames captured by the thread
+        self._read_seq = 0       # Sequence number of the last frame handed out
+        self._last_frame = None
+        self.last_frame_time = None  # Monotonic capture time of the last frame handed out
+        self._frame_ready = threading.Condition()
+        self._capture_thread = None
+        self.dropped_frames = 0  # Captured but overwritten before being read
+        self.stale_frames = 0    # Reads that got no new frame in time
+        
+        # Runtime frame rate (lowered in idle mode)
+        self.target_fps = FPS_TARGET
+        self._min_frame_interval = 0.0
+        self._last_capture_time = 0.0
         
     def initialize(self):
         """Initialize camera capture."""
@@ -32,7 +58,17 @@ class CameraStream:
                 return False
             
             self._is_running = True
-            self.logger.info(f"Camera initialized: {FRAME_WIDTH}x{FRAME_HEIGHT} @ {FPS_TARGET}FPS")
+            
+            if self.threaded:
+                # Keep the driver queue short, the ring buffer does the rest
+                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                self._capture_thread = threading.Thread(
+                    target=self._capture_loop, name='CameraCapture', daemon=True
+                )
+                self._capture_thread.start()
+                
+            mode = "threaded" if self.threaded else "synchronous"
+            self.logger.info(f"Camera initialized: {FRAME_WIDTH}x{FRAME_HEIGHT} @ {FPS_TARGET}FPS ({mode})")
             return True
             
         except Exception as e:
@@ -44,30 +80,136 @@ class CameraStream:
         if not self._is_running or not self.cap:
             return None
         
+        if self.threaded:
+            return self._read_latest_frame()
+            
         try:
-            ret, frame = self.cap.read()
+            self._throttle()
+            start = time.perf_counter()
+            ret, frame = self.frame_pool.read(self.cap)
             if not ret:
                 self.logger.warning("Failed to read frame from camera")
                 return None
-            
-            # Calculate FPS
-            self.frame_count += 1
-            current_time = time.time()
-            if current_time - self.last_time >= 1.0:
-                self.fps = self.frame_count
-                self.frame_count = 0
-                self.last_time = current_time
-            
+
+            self.metrics.record(CAPTURE, time.perf_counter() - start)
+            self.last_frame_time = time.monotonic()
+            self._update_fps()
             return frame
         
         except Exception as e:
-            self.logger.error(f"Error reading frame: {e}")
+            self.logger.error("Error reading frame: %s", e)
             return None
     
+    def _capture_loop(self):
+        """Capture thread: keep pulling frames into the ring buffer."""
+        failures = 0
+        while self._is_running:
+            self._throttle()
+            start = time.perf_counter()
+            try:
+                ret, frame = self.frame_pool.read(self.cap)
+            except Exception as e:
+                self.logger.error("Error reading frame: %s", e)
+                ret, frame = False, None
+                
+            if not ret:
+                failures += 1
+                if failures == 1:
+                    self.logger.warning("Failed to read frame from camera")
+                if failures >= CAMERA_MAX_READ_FAILURES:
+                    self.logger.error("Camera stopped delivering frames", extra=fields(failures=failures))
+                    break
+                time.sleep(0.01)
+                continue
+                
+            failures = 0
+            self.metrics.record(CAPTURE, time.perf_counter() - start)
+            with self._frame_ready:
+                index = self._write_seq % self.buffer_size
+                if self._ring[index] is not None:
+                    # The ring's hold on the frame it overwrites
+                    self.frame_pool.release(self._ring[index][0])
+                self._ring[index] = (frame, time.monotonic())
+                self._write_seq += 1
+                self._frame_ready.notify_all()
+                
+        # Wake up a consumer waiting on a dead stream
+        with self._frame_ready:
+            self._is_running = False
+            self._frame_ready.notify_all()
+            
+    def _read_latest_frame(self):
+        """Return the newest captured frame, skipping any older ones."""
+        with self._frame_ready:
+            self._frame_ready.wait_for(
+                lambda: self._write_seq > self._read_seq or not self._is_running,
+                timeout=CAMERA_READ_TIMEOUT
+            )
+            
+            if self._write_seq == self._read_seq:
+                if not self._is_running or self._last_frame is None:
+                    return None
+                # Camera hiccup: hand out the previous frame again
+                self.stale_frames += 1
+                self.frame_pool.retain(self._last_frame)
+                return self._last_frame
+                
+            latest_seq = self._write_seq - 1
+            self.dropped_frames += latest_seq - self._read_seq
+            self._read_seq = self._write_seq
+            frame, self.last_frame_time = self._ring[latest_seq % self.buffer_size]
+            # One hold for the caller, one kept for a hiccup
+            self.frame_pool.retain(frame)
+            self.frame_pool.retain(frame)
+            if self._last_frame is not None:
+                self.frame_pool.release(self._last_frame)
+            self._last_frame = frame
+            
+        self._update_fps()
+        return frame
+        
+    def _throttle(self):
+        """Sleep so frames are not read faster than the runtime frame rate."""
+        if self._min_frame_interval:
+            delay = self._last_capture_time + self._min_frame_interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        self._last_capture_time = time.monotonic()
+    
+    @property
+    def last_capture_time(self):
+        """Monotonic capture time of the last frame, for end-to-end latency."""
+        return self.last_frame_time
+    
+    def set_fps(self, fps):
+        """Change the capture frame rate at runtime."""
+        self.target_fps = fps
+        # Many webcams ignore CAP_PROP_FPS once open, so also pace the reads
+        self._min_frame_interval = 1.0 / fps if fps < FPS_TARGET else 0.0
+        try:
+            if self.cap:
+                self.cap.set(cv2.CAP_PROP_FPS, fps)
+        except Exception as e:
+            self.logger.warning(f"Could not set camera FPS to {fps}: {e}")
+    
+    def _update_fps(self):
+        """Calculate FPS of frames handed to the consumer."""
+        self.frame_count += 1
+        current_time = time.time()
+        if current_time - self.last_time >= 1.0:
+            self.fps = self.frame_count
+            self.frame_count = 0
+            self.last_time = current_time
+            
     def release(self):
         """Release camera resources."""
-        self._is_running = False
+        with self._frame_ready:
+            self._is_running = False
+            self._frame_ready.notify_all()
         try:
+            if self._capture_thread and self._capture_thread is not threading.current_thread():
+                self._capture_thread.join(timeout=2.0)
+            self._capture_thread = None
             if self.cap:
                 self.cap.release()
             cv2.destroyAllWindows()
@@ -91,6 +233,16 @@ class CameraStream:
         """Get current FPS."""
         return self.fps
     
+    def get_frame_stats(self):
+        """Get capture counters (captured, dropped and stale frames, buffer pool)."""
+        with self._frame_ready:
+            return {
+                'captured': self._write_seq,
+                'dropped': self.dropped_frames,
+                'stale': self.stale_frames,
+                'pool': self.frame_pool.get_stats(),
+            }
+            
     def is_running(self):
         """Check if camera is running."""
         return self._is_running
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""
+Reusable frame buffers for capture.
+
+cap.read() allocates a new frame every call. FramePool keeps a few
+buffers of the capture size and hands out a free one for
+cap.read(image=buffer) to decode into. Like FrameRing slots, buffers
+are reference counted: whoever gets a frame from the pool owns one
+reference and gives it back with release(frame); retain(frame) adds a
+holder, e.g. the recorder. A buffer is reused once its count is back
+to zero. A frame that is never released is simply never reused, and
+when every buffer is in use the pool allocates a fresh, unpooled frame
+instead of blocking.
+"""
+import threading
+import numpy as np
+from visionslide.config import *
+
+
+class FramePool:
+    """Fixed set of frame buffers with reference counts."""
+
+    def __init__(self, size=FRAME_POOL_SIZE, dtype=np.uint8):
+        self.size = size
+        self.dtype = dtype
+        self.shape = None
+        self._buffers = []
+        self._refs = []
+        self._index = {}  # id(buffer) -> position in _buffers
+        self._next = 0
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.reused = 0
+        self.allocated = 0
+        self.exhausted = 0  # Every buffer busy: an unpooled frame was allocated
+
+    def _reset(self, shape):
+        # New capture size: forget the old buffers (releasing them becomes a no-op)
+        self.shape = shape
+        self._buffers = []
+        self._refs = []
+        self._index = {}
+        self._next = 0
+
+    def _add(self, buffer):
+        """Pool a buffer its caller already holds (reference count 1)."""
+        if len(self._buffers) >= self.size:
+            return False
+        self._index[id(buffer)] = len(self._buffers)
+        self._buffers.append(buffer)
+        self._refs.append(1)
+        self.allocated += 1
+        return True
+
+    def _position(self, frame):
+        position = self._index.get(id(frame))
+        if position is not None and self._buffers[position] is frame:
+            return position
+        return None
+
+    def acquire(self, shape):
+        """A free buffer of this shape (reference count 1); new ones while the pool grows."""
+        shape = tuple(shape)
+        with self._lock:
+            if shape != self.shape:
+                self._reset(shape)
+
+            count = len(self._buffers)
+            for offset in range(count):
+                position = (self._next + offset) % count
+                if not self._refs[position]:
+                    self._refs[position] = 1
+                    self._next = (position + 1) % count
+                    self.reused += 1
+                    return self._buffers[position]
+
+            buffer = np.empty(shape, dtype=self.dtype)
+            if not self._add(buffer):
+                self.exhausted += 1
+            return buffer
+
+    def retain(self, frame):
+        """Add a holder to a pooled frame (no-op for unpooled frames)."""
+        with self._lock:
+            position = self._position(frame)
+            if position is not None:
+                self._refs[position] += 1
+
+    def release(self, frame):
+        """Drop a holder; the buffer is reused once the last one is gone."""
+        with self._lock:
+            position = self._position(frame)
+            if position is not None and self._refs[position] > 0:
+                self._refs[position] -= 1
+
+    def read(self, cap):
+        """
+        cap.read() into a pooled buffer; returns (ret, frame) like cap.read().
+        The caller owns the frame and releases it when done with it.
+        """
+        if self.shape is None:
+            # Frame size unknown until the first frame
+            ret, frame = cap.read()
+            if ret and isinstance(frame, np.ndarray):
+                self.adopt(frame)
+            return ret, frame
+        buffer = self.acquire(self.shape)
+        ret, frame = cap.read(image=buffer)
+        if not ret or frame is not buffer:
+            self.release(buffer)
+            if ret:
+                self.adopt(frame)  # The source changed size
+        return ret, frame
+
+    def adopt(self, frame):
+        """Take a frame allocated elsewhere, and held by the caller, into the pool."""
+        with self._lock:
+            if frame.shape != self.shape:
+                self._reset(frame.shape)
+            if self._position(frame) is None:
+                self._add(frame)
+
+    def in_use(self):
+        with self._lock:
+            return sum(1 for refs in self._refs if refs)
+
+    def get_stats(self):
+        return {
+            'buffers': len(self._buffers),
+            'in_use': self.in_use(),
+            'reused': self.reused,
+            'allocated': self.allocated,
+            'exhausted': self.exhausted,
+        }
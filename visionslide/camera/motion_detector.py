@@ -0,0 +1,46 @@
+"""
+Cheap motion detection used to gate hand inference.
+"""
+import cv2
+import numpy as np
+from visionslide.config import *
+
+
+class MotionDetector:
+    """Frame differencing on a tiny grayscale thumbnail."""
+
+    def __init__(self, thumbnail_size=MOTION_THUMBNAIL_SIZE,
+                 pixel_threshold=MOTION_PIXEL_THRESHOLD,
+                 area_threshold=MOTION_AREA_THRESHOLD):
+        self.thumbnail_size = thumbnail_size  # (width, height)
+        self.pixel_threshold = pixel_threshold
+        self.area_threshold = area_threshold
+
+        width, height = thumbnail_size
+        self._thumbnail = np.empty((height, width, 3), dtype=np.uint8)
+        self._gray = np.empty((height, width), dtype=np.uint8)
+        self._previous = np.empty((height, width), dtype=np.uint8)
+        self._diff = np.empty((height, width), dtype=np.uint8)
+        self._has_previous = False
+        self.last_score = 0.0
+
+    def update(self, frame):
+        """Return True if the frame differs enough from the previous one."""
+        # INTER_LINEAR only samples a few pixels per output pixel: ~5 us vs
+        # ~300 us for INTER_AREA at 640x480, and plenty for motion detection
+        cv2.resize(frame, self.thumbnail_size, dst=self._thumbnail, interpolation=cv2.INTER_LINEAR)
+        cv2.cvtColor(self._thumbnail, cv2.COLOR_BGR2GRAY, dst=self._gray)
+
+        if not self._has_previous:
+            self._gray, self._previous = self._previous, self._gray
+            self._has_previous = True
+            return True
+
+        cv2.absdiff(self._gray, self._previous, dst=self._diff)
+        self.last_score = np.count_nonzero(self._diff > self.pixel_threshold) / self._diff.size
+        self._gray, self._previous = self._previous, self._gray
+        return self.last_score > self.area_threshold
+
+    def reset(self):
+        """Forget the previous thumbnail (next frame counts as motion)."""
+        self._has_previous = False
@@ -0,0 +1,105 @@
+"""
+Raw video frames from a pipe, with the CameraStream interface.
+"""
+import sys
+import time
+from visionslide.config import *
+from visionslide.camera.frame_pool import FramePool
+from visionslide.utils.logger import setup_logger
+
+
+class PipeStream:
+    """
+    Reads raw BGR24 frames of a fixed size from a pipe, FIFO or stdin ("-"),
+    e.g. from `ffmpeg -i rtsp://... -f rawvideo -pix_fmt bgr24 -`.
+    """
+
+    def __init__(self, path="-", width=FRAME_WIDTH, height=FRAME_HEIGHT):
+        self.logger = setup_logger('PipeStream')
+        self.path = path
+        self.width = width
+        self.height = height
+        self._file = None
+        self.last_frame_time = None
+        self.frame_count = 0
+        self.fps = 0
+        self.frames_read = 0
+        self.last_time = time.time()
+        self._is_running = False
+        self.frame_pool = FramePool()
+
+    def initialize(self):
+        """Open the pipe."""
+        try:
+            self._file = sys.stdin.buffer if self.path == "-" else open(self.path, "rb", buffering=0)
+            self._is_running = True
+            self.logger.info(f"Reading {self.width}x{self.height} BGR frames from {self.path}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Could not open pipe {self.path}: {e}")
+            return False
+
+    def read_frame(self):
+        """Read the next frame, or None when the writer closed the pipe."""
+        if not self._is_running:
+            return None
+
+        # Never a buffer the consumer still holds
+        frame = self.frame_pool.acquire((self.height, self.width, 3))
+        view = memoryview(frame.reshape(-1))
+        filled = 0
+        try:
+            while filled < len(view):
+                count = self._file.readinto(view[filled:])
+                if not count:
+                    self.logger.info(f"End of pipe {self.path}")
+                    self._is_running = False
+                    self.frame_pool.release(frame)
+                    return None
+                filled += count
+        except Exception as e:
+            self.logger.error("Error reading pipe %s: %s", self.path, e)
+            self._is_running = False
+            self.frame_pool.release(frame)
+            return None
+
+        self.last_frame_time = time.monotonic()
+        self.frames_read += 1
+        self._update_fps()
+        return frame
+
+    def _update_fps(self):
+        self.frame_count += 1
+        current_time = time.time()
+        if current_time - self.last_time >= 1.0:
+            self.fps = self.frame_count
+            self.frame_count = 0
+            self.last_time = current_time
+
+    @property
+    def last_capture_time(self):
+        return self.last_frame_time
+
+    def release(self):
+        """Close the pipe."""
+        self._is_running = False
+        try:
+            if self._file and self._file is not sys.stdin.buffer:
+                self._file.close()
+        except Exception as e:
+            self.logger.error(f"Error closing pipe: {e}")
+
+    def set_fps(self, fps):
+        """The writer sets the frame rate."""
+
+    def get_resolution(self):
+        return self.width, self.height
+
+    def get_fps(self):
+        return self.fps
+
+    def get_frame_stats(self):
+        return {'captured': self.frames_read, 'dropped': 0, 'stale': 0}
+
+    def is_running(self):
+        return self._is_running
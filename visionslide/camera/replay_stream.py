@@ -0,0 +1,135 @@
+"""
+Replay source for recorded sessions, with the CameraStream interface.
+"""
+import os
+import time
+import cv2
+import numpy as np
+from visionslide.camera.frame_pool import FramePool
+from visionslide.camera.session_recorder import read_timestamps
+from visionslide.utils.logger import setup_logger
+
+
+class ReplayStream:
+    """
+    Feeds frames of a recorded session in place of a live camera.
+
+    realtime=True paces frames by their recorded timestamps;
+    realtime=False returns them as fast as they are read.
+    last_frame_time is the recorded timestamp of the last frame, so
+    anything timed on it behaves the same at any replay speed.
+    """
+
+    def __init__(self, path, realtime=True):
+        self.logger = setup_logger('ReplayStream')
+        self.path = path
+        self.realtime = realtime
+        self.cap = None
+        self.timestamps = None
+        self.frame_index = 0
+        self.last_frame_time = None
+        self.frame_count = 0
+        self.fps = 0
+        self.last_time = time.time()
+        self._start_wall = None
+        self._is_running = False
+        self.frame_pool = FramePool()
+
+    def initialize(self):
+        """Open the recording and its timestamp sidecar."""
+        try:
+            if not os.path.exists(self.path):
+                self.logger.error(f"Recording not found: {self.path}")
+                return False
+
+            self.cap = cv2.VideoCapture(self.path)
+            if not self.cap.isOpened():
+                self.logger.error(f"Could not open recording {self.path}")
+                return False
+
+            self.timestamps = read_timestamps(self.path)
+            if self.timestamps is None:
+                # No sidecar: fall back on the nominal frame rate
+                fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+                count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+                self.timestamps = np.arange(count) / fps
+                self.logger.warning(f"No timestamp sidecar for {self.path}, assuming {fps:.1f} FPS")
+
+            self._is_running = True
+            mode = "real time" if self.realtime else "as fast as possible"
+            self.logger.info(f"Replaying {self.path}: {len(self.timestamps)} frames, {mode}")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Replay initialization failed: {e}")
+            return False
+
+    def read_frame(self):
+        """Return the next recorded frame, or None at the end of the recording."""
+        if not self._is_running or not self.cap:
+            return None
+
+        try:
+            ret, frame = self.frame_pool.read(self.cap)
+            if not ret or self.frame_index >= len(self.timestamps):
+                if ret:
+                    self.frame_pool.release(frame)
+                self.logger.info("End of recording")
+                self._is_running = False
+                return None
+
+            timestamp = float(self.timestamps[self.frame_index])
+            if self.realtime:
+                if self._start_wall is None:
+                    self._start_wall = time.monotonic() - timestamp
+                delay = self._start_wall + timestamp - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+            self.frame_index += 1
+            self.last_frame_time = timestamp
+            self._update_fps()
+            return frame
+
+        except Exception as e:
+            self.logger.error("Error reading recorded frame: %s", e)
+            return None
+
+    def _update_fps(self):
+        self.frame_count += 1
+        current_time = time.time()
+        if current_time - self.last_time >= 1.0:
+            self.fps = self.frame_count
+            self.frame_count = 0
+            self.last_time = current_time
+
+    def release(self):
+        """Close the recording."""
+        self._is_running = False
+        try:
+            if self.cap:
+                self.cap.release()
+        except Exception as e:
+            self.logger.error(f"Error releasing recording: {e}")
+
+    def set_fps(self, fps):
+        """Recorded sessions keep their own timing."""
+
+    def get_resolution(self):
+        """Get the recording resolution."""
+        if self.cap and self.cap.isOpened():
+            return (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                    int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        return 0, 0
+
+    def get_fps(self):
+        """Get current FPS."""
+        return self.fps
+
+    def get_frame_stats(self):
+        """Get replay counters."""
+        return {'captured': self.frame_index, 'dropped': 0, 'stale': 0}
+
+    def is_running(self):
+        """Check if frames remain."""
+        return self._is_running
@@ -0,0 +1,129 @@
+"""
+Session recording: compressed video plus a timestamp sidecar.
+"""
+import os
+import threading
+import cv2
+import numpy as np
+from visionslide.config import *
+from visionslide.pipeline.stage_queue import StageQueue, BLOCK
+from visionslide.utils.logger import setup_logger
+
+
+def timestamps_path(video_path):
+    """Path of the timestamp sidecar that goes with a recorded video."""
+    return os.path.splitext(video_path)[0] + ".timestamps.csv"
+
+
+def read_timestamps(video_path):
+    """Recorded timestamp of every frame of a video, or None without a sidecar."""
+    sidecar = timestamps_path(video_path)
+    if not os.path.exists(sidecar):
+        return None
+    data = np.loadtxt(sidecar, delimiter=",", skiprows=1, ndmin=2)
+    return data[:, 1] if len(data) else np.empty(0)
+
+
+class SessionRecorder:
+    """Saves timestamped frames to disk on a background thread."""
+
+    def __init__(self, path, fps=FPS_TARGET, fourcc=RECORDING_FOURCC,
+                 put_timeout=RECORDING_PUT_TIMEOUT):
+        self.logger = setup_logger('SessionRecorder')
+        self.path = path
+        self.fps = fps
+        self.fourcc = fourcc
+        self.frames_written = 0
+
+        self._writer = None
+        self._timestamps = None
+        self._first_timestamp = None
+        # A stalled encoder costs capture at most put_timeout per frame, then frames are dropped
+        self._queue = StageQueue('recorder', maxsize=RECORDING_QUEUE_SIZE, policy=BLOCK,
+                                 put_timeout=put_timeout)
+        self._thread = threading.Thread(target=self._write_loop, name='SessionRecorder', daemon=True)
+        self._thread.start()
+
+    def write(self, frame, timestamp, release=None):
+        """
+        Queue a frame for writing. timestamp is the monotonic capture time.
+        Returns False when the frame was dropped (encoder too far behind).
+        The frame is copied, so the caller may draw on it afterwards, unless
+        a release callback is given: then the frame (e.g. a shared memory
+        slot or a pooled camera buffer) is written as is and release() is
+        called once it is on disk.
+        """
+        if release is None:
+            return self._queue.put((frame.copy(), timestamp, None))
+        if not self._queue.put((frame, timestamp, release)):
+            release()
+            return False
+        return True
+
+    def _open(self, frame):
+        height, width = frame.shape[:2]
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._writer = cv2.VideoWriter(
+            self.path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (width, height)
+        )
+        if not self._writer.isOpened():
+            raise IOError(f"Could not open video writer for {self.path}")
+
+        self._timestamps = open(timestamps_path(self.path), "w")
+        self._timestamps.write("frame,timestamp\n")
+        self.logger.info(f"Recording session to {self.path} ({width}x{height})")
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get(timeout=0.5)
+            if item is None:
+                if self._queue.closed:
+                    break
+                continue
+
+            frame, timestamp, release = item
+            try:
+                if self._writer is None:
+                    self._open(frame)
+                    self._first_timestamp = timestamp
+
+                self._writer.write(frame)
+                self._timestamps.write(f"{self.frames_written},{timestamp - self._first_timestamp:.6f}\n")
+                self.frames_written += 1
+            except Exception as e:
+                self.logger.error(f"Error recording frame: {e}")
+                break
+            finally:
+                if release:
+                    release()
+
+        # After an error, refuse new frames and free the slots still queued
+        self._queue.close()
+        for _, _, release in self._queue.drain():
+            if release:
+                release()
+
+    def close(self):
+        """Flush the queued frames and close the files."""
+        self._queue.close()
+        self._thread.join()
+        try:
+            if self._writer is not None:
+                self._writer.release()
+            if self._timestamps is not None:
+                self._timestamps.close()
+            self.logger.info(f"Recording closed: {self.frames_written} frames in {self.path} "
+                             f"({self._queue.dropped} dropped)")
+        except Exception as e:
+            self.logger.error(f"Error closing recording: {e}")
+
+    def get_stats(self):
+        """Frames written, dropped because the encoder lagged, and still queued."""
+        return {
+            'written': self.frames_written,
+            'dropped': self._queue.dropped,
+            'queued': len(self._queue),
+        }
@@ -3,20 +3,155 @@ Configuration settings for VisionSlide application.
 """
 
 # Gesture Recognition Settings
-GESTURE_CONFIDENCE_THRESHOLD = 0.7
-GESTURE_HOLD_DURATION = 0.7          # Temps de maintien raisonnable
+GESTURE_CONFIDENCE_THRESHOLD = 0.7  # Une image moins sûre ne vote pas
 GESTURE_COOLDOWN = 0.4               # Évite les déclenchements accidentels
+GESTURE_WINDOW = 0.6                 # Fenêtre glissante des votes (secondes)
+GESTURE_TRIGGER_EVIDENCE = 0.25      # Secondes de votes (pondérés par la confiance) pour déclencher
+GESTURE_EVIDENCE_OVERRIDES = {"open_hand": 0.45}  # Quitter demande plus de certitude
+GESTURE_RELEASE_EVIDENCE = 0.1       # Hystérésis : le geste doit retomber sous ce seuil avant de redéclencher
+GESTURE_MAJORITY = 0.7               # Part minimale des votes avec geste pour le geste gagnant
+GESTURE_MAX_FRAME_GAP = 0.1          # Une image ne vaut jamais plus que ça (caméra bloquée)
+GESTURE_BUFFER_SIZE = 64             # Votes gardés (≥ fenêtre × FPS)
+GESTURE_MODEL = None                 # Classifieur entraîné (.npz, python -m visionslide.gestures.classifier) ; None = règles
+GESTURE_MODEL_MIN_PROBABILITY = 0.6  # Probabilité minimale du classifieur, sinon "unknown"
+HAND_POSITION_LEFT = 0.4             # Poignet à gauche de ce seuil (x normalisé) → "left"
+HAND_POSITION_RIGHT = 0.6            # Poignet à droite de ce seuil → "right"
 
 # Camera Configuration
 CAMERA_INDEX = 0
 FRAME_WIDTH = 640
 FRAME_HEIGHT = 480
 FPS_TARGET = 30
+CAMERA_THREADED = True               # Capture sur un thread dédié, on ne garde que l'image la plus récente
+CAMERA_BUFFER_SIZE = 2               # Taille du ring buffer de capture
+CAMERA_READ_TIMEOUT = 1.0            # Secondes d'attente max pour une nouvelle image
+CAMERA_MAX_READ_FAILURES = 30        # Échecs consécutifs avant d'arrêter la capture
+FRAME_POOL_SIZE = 12                 # Buffers d'image réutilisés (≥ images en vol dans le pipeline)
 
 # Performance Tuning
 MODEL_COMPLEXITY = 1
 MIN_DETECTION_CONFIDENCE = 0.6
 MIN_TRACKING_CONFIDENCE = 0.5
+ROI_INFERENCE = False                # Inférence sur une zone autour de la main précédente
+ROI_PADDING = 0.5                    # Marge ajoutée de chaque côté (fraction de la taille de la main)
+ROI_MIN_SIZE = 128                   # Taille minimale de la zone (pixels)
+ROI_ALIGN = 32                       # Taille arrondie à ce multiple pour réutiliser les buffers
+ROI_MAX_SIZE = 256                   # Zone réduite à ce côté max avant l'inférence (None = pas de réduction)
+
+# Landmark Filtering
+LANDMARK_FILTER = True               # Lissage One Euro des landmarks (moins de tremblement)
+LANDMARK_MIN_CUTOFF = 1.0            # Fréquence de coupure au repos (Hz, plus bas = plus lisse)
+LANDMARK_BETA = 10.0                 # Hausse de la coupure avec la vitesse (plus haut = moins de retard)
+LANDMARK_D_CUTOFF = 1.0              # Coupure du filtre sur la vitesse (Hz)
+LANDMARK_PREDICTION = 0.0            # Anticipation des landmarks (secondes, 0 = aucune)
+LANDMARK_PREDICTION_MAX = 0.2        # Extrapolation maximale (secondes)
+KEYFRAME_INTERVAL = 1                # Inférence 1 image sur k quand la main est stable (1 = toujours)
+KEYFRAME_STABLE_SPEED = 0.3          # Vitesse max d'un landmark (largeurs d'image/s) pour sauter l'inférence
+
+# Swipe Gestures
+SWIPE_GESTURES = True                # Balayage horizontal de la main → diapositive suivante/précédente
+SWIPE_WINDOW = 0.4                   # Historique analysé (secondes)
+SWIPE_MIN_DISTANCE = 0.25            # Déplacement horizontal minimal (largeur d'image)
+SWIPE_MIN_SPEED = 1.0                # Vitesse de pointe minimale (largeurs d'image/s)
+SWIPE_MAX_DRIFT = 0.5                # Déplacement vertical max, relatif à l'horizontal
+SWIPE_CONSISTENCY = 0.8              # Rectitude : déplacement net / chemin parcouru
+SWIPE_REFRACTORY = 0.6               # Pas de nouveau swipe pendant le retour de la main (secondes)
+SWIPE_BUFFER_SIZE = 32               # Positions gardées (≥ fenêtre × FPS)
+
+# Power Saving
+MOTION_GATING = True                 # Pas d'inférence sans mouvement quand aucune main n'est visible
+MOTION_THUMBNAIL_SIZE = (32, 24)     # Vignette en niveaux de gris pour la détection de mouvement
+MOTION_PIXEL_THRESHOLD = 15          # Différence de niveau de gris d'un pixel "en mouvement"
+MOTION_AREA_THRESHOLD = 0.01         # Fraction de pixels en mouvement pour déclencher
+IDLE_TIMEOUT = 10.0                  # Secondes sans main avant le mode veille
+IDLE_FPS = 5                         # FPS de capture en veille
+IDLE_MODEL_COMPLEXITY = 0            # Modèle MediaPipe en veille
+
+# Auto-Tuning (--autotune : coût de la détection ajusté à la machine)
+AUTOTUNE = False                     # Ajuster modèle, résolution et images sautées en cours d'exécution
+AUTOTUNE_TARGET_LATENCY = 0.08       # Budget p95 capture → décision (secondes)
+AUTOTUNE_INTERVAL = 2.0              # Durée d'une fenêtre de mesure (secondes)
+AUTOTUNE_MIN_SAMPLES = 20            # Images minimales dans une fenêtre pour décider
+AUTOTUNE_HEADROOM = 0.6              # Remonter en qualité seulement sous cette fraction du budget
+AUTOTUNE_UP_WINDOWS = 3              # Fenêtres sous le budget d'affilée avant de remonter
+AUTOTUNE_MAX_BACKOFF = 8             # Attente max (× AUTOTUNE_UP_WINDOWS) avant de retenter un niveau abandonné
+# Niveaux, du meilleur au moins coûteux : (complexité du modèle, échelle de l'image d'inférence, inférence 1 image sur k)
+AUTOTUNE_LADDER = [
+    (1, 1.0, 1),
+    (0, 1.0, 1),
+    (0, 0.75, 1),
+    (0, 0.75, 2),
+    (0, 0.5, 2),
+    (0, 0.5, 3),
+]
+
+# Recording
+RECORDING_FOURCC = "mp4v"            # Codec de la vidéo enregistrée
+RECORDING_QUEUE_SIZE = 120           # Images en attente d'encodage (~4 s à 30 FPS)
+RECORDING_PUT_TIMEOUT = 0.02         # Attente max de la capture si l'encodeur est en retard (au-delà : image ignorée et comptée)
+
+# Pipeline Settings
+# Queue en entrée de chaque étage : (taille, politique quand la queue est pleine)
+# Politiques : "block" (backpressure), "drop_oldest", "drop_newest"
+PIPELINE_QUEUES = {
+    "detect": (1, "drop_oldest"),     # L'inférence prend toujours l'image la plus récente
+    "recognize": (2, "drop_oldest"),
+    "render": (1, "drop_oldest"),
+}
+ACTION_BANNER_DURATION = 0.5          # Durée d'affichage de "ACTION EXECUTED"
+RENDER_FPS = 30                       # Images affichées par seconde dans l'aperçu (indépendant de l'inférence)
+
+# Presentation Control
+PRESENTATION_TARGET = "powerpoint"    # Logiciel piloté : une seule touche envoyée par action
+PRESENTATION_KEYS = {
+    "powerpoint": {"next_slide": "right", "previous_slide": "left", "exit_presentation": "esc"},
+    "keynote": {"next_slide": "right", "previous_slide": "left", "exit_presentation": "esc"},
+    "google_slides": {"next_slide": "right", "previous_slide": "left", "exit_presentation": "esc"},
+    "pdf": {"next_slide": "pagedown", "previous_slide": "pageup", "exit_presentation": "esc"},
+    # Ancien comportement : deux touches par action, pour une cible inconnue
+    "compat": {"next_slide": ("right", "pagedown"), "previous_slide": ("left", "pageup"),
+               "exit_presentation": "esc"},
+}
+KEY_BACKEND = "auto"                  # "auto", "uinput", "xtest", "pyautogui" ou "mock"
+KEY_PRESS_PAUSE = 0.0                 # Pause pyautogui après chaque touche (tout se passe hors de la boucle vidéo)
+ACTION_QUEUE_SIZE = 4                 # Actions en attente d'envoi
+
+# Remote Control (caméra et présentation sur deux machines)
+REMOTE_PORT = 9109                    # Port du récepteur (visionslide-receiver)
+REMOTE_LISTEN_HOST = "127.0.0.1"      # Adresse d'écoute du récepteur (autre que locale : --secret obligatoire)
+REMOTE_TRANSPORT = "tcp"              # "tcp" (connexion persistante) ou "udp"
+REMOTE_SECRET = None                  # Clé partagée pour signer les messages (None = pas de signature)
+REMOTE_CONNECT_TIMEOUT = 1.0          # Secondes pour établir la connexion TCP
+REMOTE_ACK_TIMEOUT = 0.25             # UDP : renvoi si pas d'accusé de réception après ce délai
+REMOTE_MAX_RETRIES = 3                # UDP : renvois avant abandon
+REMOTE_ACTION_TTL = 2.0               # Une action plus vieille que ça n'est plus envoyée
+
+# Inference Server (visionslide serve : plusieurs caméras, un pool de workers)
+SERVER_WORKERS = None                 # Processus de détection (None = un par cœur)
+SERVER_GRAPHS_PER_WORKER = 8          # Graphes MediaPipe gardés par worker (un par flux servi)
+SERVER_START_TIMEOUT = 60.0           # Secondes max pour que les workers soient prêts
+SERVER_STATS_INTERVAL = 10.0          # Secondes entre deux lignes FPS/latence par flux
+
+# Batch Processing (visionslide batch : vidéos enregistrées, hors temps réel)
+BATCH_WORKERS = None                  # Processus de détection (None = un par cœur)
+BATCH_CHUNK_SECONDS = 60.0            # Durée max d'un morceau de vidéo confié à un processus
+BATCH_WARMUP = 1.5                    # Secondes traitées avant chaque morceau (suivi, filtre, votes), non écrites
+
+# Process Inference (--inference-process : MediaPipe dans un processus séparé)
+INFERENCE_PROCESS = False             # Capture et inférence sur deux cœurs différents
+SHARED_FRAME_SLOTS = 8                # Images en mémoire partagée (détection, aperçu et enregistrement)
+PROCESS_START_TIMEOUT = 60.0          # Secondes max pour que le processus de détection soit prêt
+
+# Metrics
+METRICS_ENABLED = True                # Histogrammes de latence par étage
+METRICS_LOG_INTERVAL = 30.0           # Secondes entre deux lignes de latence dans le log
+METRICS_PORT = 9108                   # Port HTTP de l'export Prometheus (--metrics-port)
+
+# Logging
+LOG_LEVEL = "INFO"                    # Niveau minimal écrit (les appels en dessous ne coûtent presque rien)
+LOG_ASYNC = True                      # Écriture sur un thread de fond (QueueListener) : un log ne bloque jamais la boucle vidéo
+LOG_QUEUE_SIZE = 1000                 # Messages en attente d'écriture (au-delà : ignorés et comptés)
+LOG_DEDUP_WINDOW = 5.0                # Un même avertissement/erreur n'est écrit qu'une fois par fenêtre, puis son nombre de répétitions
 
 # Application Settings
 DEBUG_MODE = True
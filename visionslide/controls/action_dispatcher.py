@@ -0,0 +1,156 @@
+"""
+Asynchronous key injection for VisionSlide.
+The vision loop submits actions and returns immediately; a worker thread
+presses the keys.
+"""
+import collections
+import threading
+import time
+from visionslide.config import *
+from visionslide.utils.logger import setup_logger
+from visionslide.utils.metrics import get_metrics, ACTION, FRAME_TO_KEYSTROKE
+
+# Actions that undo each other while both are still pending
+OPPOSITE_ACTIONS = {
+    "next_slide": "previous_slide",
+    "previous_slide": "next_slide",
+}
+
+
+class ActionDispatcher:
+    """
+    Runs controller actions on a worker thread.
+
+    Pending actions are coalesced: submitting the action already waiting
+    at the back of the queue is a no-op, and a next/previous pair that was
+    never sent cancels out. on_complete(action, t_capture, t_done) is
+    called on the worker thread after each key press.
+    """
+
+    def __init__(self, controller, maxsize=ACTION_QUEUE_SIZE, on_complete=None):
+        self.logger = setup_logger('ActionDispatcher')
+        self.metrics = get_metrics()
+        self.controller = controller
+        self.maxsize = maxsize
+        self.on_complete = on_complete
+
+        self._handlers = {
+            action: getattr(controller, action)
+            for action in ("next_slide", "previous_slide", "exit_presentation")
+            if hasattr(controller, action)
+        }
+
+        self._pending = collections.deque()  # (action, t_capture)
+        self._cond = threading.Condition()
+        self._closed = False
+        self._busy = False
+        self._thread = None
+
+        # Statistics
+        self.submitted = 0
+        self.executed = 0
+        self.failed = 0
+        self.deduplicated = 0
+        self.cancelled = 0
+        self.dropped = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='ActionDispatcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, action, t_capture=None):
+        """
+        Queue an action without waiting for it.
+        t_capture is the monotonic capture time of the frame that triggered it.
+        Returns False if the action was rejected.
+        """
+        if action not in self._handlers:
+            return False
+
+        with self._cond:
+            if self._closed:
+                return False
+            self.submitted += 1
+
+            if self._pending:
+                last_action = self._pending[-1][0]
+                if last_action == action:
+                    self.deduplicated += 1
+                    return True
+                if OPPOSITE_ACTIONS.get(last_action) == action:
+                    self._pending.pop()
+                    self.cancelled += 2
+                    return True
+
+            if len(self._pending) >= self.maxsize:
+                self.dropped += 1
+                return False
+
+            self._pending.append((action, t_capture))
+            self._cond.notify()
+            return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                action, t_capture = self._pending.popleft()
+                self._busy = True
+
+            self._execute(action, t_capture)
+
+    def _execute(self, action, t_capture):
+        start = time.perf_counter()
+        try:
+            performed = self._handlers[action]()
+        except Exception as e:
+            self.logger.error(f"Action '{action}' failed: {e}")
+            performed = False
+        self.metrics.record(ACTION, time.perf_counter() - start)
+
+        if not performed:
+            self.failed += 1
+            return
+
+        t_done = time.monotonic()
+        self.executed += 1
+        if t_capture is not None:
+            self.metrics.record(FRAME_TO_KEYSTROKE, t_done - t_capture)
+        if self.on_complete:
+            try:
+                self.on_complete(action, t_capture, t_done)
+            except Exception as e:
+                self.logger.error(f"Error in action callback: {e}")
+
+    def wait_idle(self, timeout=None):
+        """Wait until every pending action has been sent."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def close(self, timeout=2.0):
+        """Send what is still pending, then stop the worker."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                self.logger.warning("Action worker still busy after close timeout")
+
+    def get_stats(self):
+        """Get submitted, executed and coalesced action counts."""
+        with self._cond:
+            return {
+                'submitted': self.submitted,
+                'executed': self.executed,
+                'failed': self.failed,
+                'deduplicated': self.deduplicated,
+                'cancelled': self.cancelled,
+                'dropped': self.dropped,
+                'pending': len(self._pending),
+            }
@@ -0,0 +1,254 @@
+"""
+Key injection backends for VisionSlide.
+
+Every backend presses one key by its pyautogui-style name ("right",
+"pagedown", "esc", ...). Third-party modules are imported on open(), so
+a missing library or display only rules out that backend.
+"""
+import abc
+import os
+import sys
+import time
+from visionslide.config import *
+from visionslide.utils.logger import setup_logger
+
+
+class KeyBackend(abc.ABC):
+    """
+    Base class for key injection backends.
+    rank is a fixed preference order for automatic selection, lowest
+    first, from the expected cost of a press; nothing is measured.
+    Backends with rank None are never picked automatically.
+    """
+
+    name = None
+    rank = None
+
+    def __init__(self):
+        self.logger = setup_logger(f'KeyBackend.{self.name}')
+
+    @classmethod
+    def available(cls):
+        """Cheap check that the backend can work on this machine."""
+        return True
+
+    def open(self):
+        """Acquire the device or connection. Returns False on failure."""
+        return True
+
+    @abc.abstractmethod
+    def press(self, key):
+        """Press and release one key."""
+
+    def close(self):
+        """Release the device or connection."""
+
+
+class PyAutoGUIBackend(KeyBackend):
+    """Cross-platform fallback through pyautogui."""
+
+    name = "pyautogui"
+    rank = 30
+
+    def __init__(self):
+        super().__init__()
+        self._pyautogui = None
+
+    def open(self):
+        try:
+            import pyautogui
+        except Exception as e:
+            # pyautogui raises more than ImportError without a display
+            self.logger.warning(f"pyautogui unavailable: {e}")
+            return False
+
+        pyautogui.FAILSAFE = True  # Move mouse to corner to abort
+        pyautogui.PAUSE = KEY_PRESS_PAUSE
+        self._pyautogui = pyautogui
+        return True
+
+    def press(self, key):
+        self._pyautogui.press(key)
+
+
+# pyautogui key names -> X11 keysym names
+_XTEST_KEYSYMS = {
+    "right": "Right", "left": "Left", "up": "Up", "down": "Down",
+    "pagedown": "Next", "pageup": "Prior", "home": "Home", "end": "End",
+    "esc": "Escape", "escape": "Escape", "enter": "Return", "return": "Return",
+    "space": "space", "backspace": "BackSpace", "tab": "Tab", "f24": "F24",
+}
+
+
+class XTestBackend(KeyBackend):
+    """Direct X11 XTest requests through python-xlib (X11 and XWayland clients)."""
+
+    name = "xtest"
+    rank = 20
+
+    def __init__(self):
+        super().__init__()
+        self._display = None
+        self._xtest = None
+        self._keycodes = {}
+
+    @classmethod
+    def available(cls):
+        return sys.platform.startswith("linux") and bool(os.environ.get("DISPLAY"))
+
+    def open(self):
+        try:
+            from Xlib import display
+            from Xlib.ext import xtest
+            self._display = display.Display()
+            if not self._display.has_extension("XTEST"):
+                self.logger.warning("X server has no XTEST extension")
+                self._display.close()
+                self._display = None
+                return False
+            self._xtest = xtest
+            return True
+        except Exception as e:
+            self.logger.warning(f"XTest unavailable: {e}")
+            return False
+
+    def _keycode(self, key):
+        keycode = self._keycodes.get(key)
+        if keycode is None:
+            from Xlib import XK
+            keysym = XK.string_to_keysym(_XTEST_KEYSYMS.get(key, key))
+            keycode = self._display.keysym_to_keycode(keysym)
+            if not keycode:
+                raise ValueError(f"No keycode for key '{key}'")
+            self._keycodes[key] = keycode
+        return keycode
+
+    def press(self, key):
+        from Xlib import X
+        keycode = self._keycode(key)
+        self._xtest.fake_input(self._display, X.KeyPress, keycode)
+        self._xtest.fake_input(self._display, X.KeyRelease, keycode)
+        # Round trip: the server has processed both events when this returns
+        self._display.sync()
+
+    def close(self):
+        if self._display:
+            self._display.close()
+            self._display = None
+
+
+# pyautogui key names -> Linux input event codes
+_UINPUT_KEYS = {
+    "right": "KEY_RIGHT", "left": "KEY_LEFT", "up": "KEY_UP", "down": "KEY_DOWN",
+    "pagedown": "KEY_PAGEDOWN", "pageup": "KEY_PAGEUP", "home": "KEY_HOME", "end": "KEY_END",
+    "esc": "KEY_ESC", "escape": "KEY_ESC", "enter": "KEY_ENTER", "return": "KEY_ENTER",
+    "space": "KEY_SPACE", "backspace": "KEY_BACKSPACE", "tab": "KEY_TAB", "f24": "KEY_F24",
+}
+
+# New uinput devices are ignored for a moment while the system picks them up
+UINPUT_SETTLE_TIME = 0.2
+
+
+class UInputBackend(KeyBackend):
+    """
+    Virtual keyboard through the Linux uinput device (python-evdev).
+    Works under X11, Wayland and the console; needs write access to
+    /dev/uinput.
+    """
+
+    name = "uinput"
+    rank = 10
+
+    def __init__(self):
+        super().__init__()
+        self._device = None
+        self._ecodes = None
+
+    @classmethod
+    def available(cls):
+        return sys.platform.startswith("linux") and os.access("/dev/uinput", os.W_OK)
+
+    def open(self):
+        try:
+            from evdev import UInput, ecodes
+            codes = [ecodes.ecodes[name] for name in _UINPUT_KEYS.values()]
+            self._device = UInput({ecodes.EV_KEY: codes}, name="visionslide-keyboard")
+            self._ecodes = ecodes
+            time.sleep(UINPUT_SETTLE_TIME)
+            return True
+        except Exception as e:
+            self.logger.warning(f"uinput unavailable: {e}")
+            return False
+
+    def press(self, key):
+        code = self._ecodes.ecodes[_UINPUT_KEYS[key]]
+        self._device.write(self._ecodes.EV_KEY, code, 1)
+        self._device.write(self._ecodes.EV_KEY, code, 0)
+        self._device.syn()
+
+    def close(self):
+        if self._device:
+            self._device.close()
+            self._device = None
+
+
+class MockKeyBackend(KeyBackend):
+    """Records key presses instead of sending them, for tests and benchmarks."""
+
+    name = "mock"
+
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.delay = delay
+        self.presses = []  # (key, monotonic time)
+
+    def press(self, key):
+        if self.delay:
+            time.sleep(self.delay)
+        self.presses.append((key, time.monotonic()))
+
+    @property
+    def keys(self):
+        return [key for key, _ in self.presses]
+
+
+KEY_BACKENDS = {
+    backend.name: backend
+    for backend in (UInputBackend, XTestBackend, PyAutoGUIBackend, MockKeyBackend)
+}
+
+
+def select_backend(name=KEY_BACKEND):
+    """
+    Open the requested backend, or with "auto" the first one that works
+    here in a fixed preference order: uinput (one write() to the kernel),
+    XTest (one X round trip), then pyautogui. The order is not measured on
+    the machine, probing would send real keys to the focused window;
+    compare them with benchmarks/bench_key_backends.py and force one with
+    KEY_BACKEND. Returns None when none can be opened.
+    """
+    logger = setup_logger('KeyBackend')
+
+    if name != "auto":
+        backend_class = KEY_BACKENDS.get(name)
+        if backend_class is None:
+            logger.warning(f"Unknown key backend '{name}', selecting automatically")
+        else:
+            backend = backend_class()
+            if backend.open():
+                logger.info(f"Key backend: {name}")
+                return backend
+            logger.warning(f"Key backend '{name}' could not be opened, selecting automatically")
+
+    ranked = sorted((cls for cls in KEY_BACKENDS.values() if cls.rank is not None),
+                    key=lambda cls: cls.rank)
+    for backend_class in ranked:
+        if not backend_class.available():
+            continue
+        backend = backend_class()
+        if backend.open():
+            logger.info(f"Key backend: {backend.name}")
+            return backend
+
+    logger.error("No key injection backend available")
+    return None
@@ -2,24 +2,32 @@
 PowerPoint control module for VisionSlide.
 Simulates keyboard inputs to control PowerPoint presentations.
 """
-import pyautogui
 import time
+from visionslide.config import *
+from visionslide.controls.key_backends import select_backend
 from visionslide.utils.logger import setup_logger
 
 class PPTController:
     """Controls PowerPoint presentations using keyboard simulations."""
     
-    def __init__(self):
+    def __init__(self, target=PRESENTATION_TARGET, backend=None):
         self.logger = setup_logger('PPTController')
         self.is_connected = False
         self.last_action_time = 0
         self.action_cooldown = 0.5  # Prevent multiple rapid actions
         
-        # Configure pyautogui for safety
-        pyautogui.FAILSAFE = True  # Move mouse to corner to abort
-        pyautogui.PAUSE = 0.1      # Small pause between actions
+        # Keys of the presentation software being driven
+        if target not in PRESENTATION_KEYS:
+            self.logger.warning(f"Unknown presentation target '{target}', sending compatibility keys")
+            target = "compat"
+        self.target = target
+        self.keys = PRESENTATION_KEYS[target]
         
-        self.logger.info("PPT Controller initialized")
+        # Key injection backend (fastest available unless one is given)
+        self.backend = backend or select_backend()
+        
+        backend_name = self.backend.name if self.backend else "none"
+        self.logger.info(f"PPT Controller initialized (target: {target}, keys: {backend_name})")
     
     def check_powerpoint_running(self):
         """
@@ -46,9 +54,7 @@ class PPTController:
             return False
         
         try:
-            pyautogui.press('right')
-            pyautogui.press('pagedown')
-            # Try both keys for compatibility
+            self._press('next_slide')
             self.logger.info("Next slide action performed")
             self.last_action_time = time.time()
             return True
@@ -62,9 +68,7 @@ class PPTController:
             return False
         
         try:
-            pyautogui.press('left')
-            pyautogui.press('pageup')
-            # Try both keys for compatibility
+            self._press('previous_slide')
             self.logger.info("Previous slide action performed")
             self.last_action_time = time.time()
             return True
@@ -78,7 +82,7 @@ class PPTController:
             return False
         
         try:
-            pyautogui.press('esc')
+            self._press('exit_presentation')
             self.logger.info("Exit presentation action performed")
             self.last_action_time = time.time()
             return True
@@ -86,6 +90,14 @@ class PPTController:
             self.logger.error(f"Exit presentation failed: {e}")
             return False
     
+    def _press(self, action):
+        """Press the key (or keys) the target uses for an action."""
+        if self.backend is None:
+            raise RuntimeError("no key injection backend")
+        keys = self.keys[action]
+        for key in ([keys] if isinstance(keys, str) else keys):
+            self.backend.press(key)
+    
     def _can_perform_action(self):
         """Check if we can perform an action (cooldown and connection)."""
         if not self.is_connected:
@@ -101,4 +113,11 @@ class PPTController:
     def disconnect(self):
         """Disconnect from PowerPoint."""
         self.is_connected = False
-        self.logger.info("Disconnected from PowerPoint")
\ No newline at end of file
+        self.logger.info("Disconnected from PowerPoint")
+    
+    def release(self):
+        """Close the key injection backend."""
+        self.disconnect()
+        if self.backend:
+            self.backend.close()
+            self.backend = None
\ No newline at end of file
@@ -0,0 +1,294 @@
+"""
+Network presentation controller for VisionSlide.
+Sends actions to a remote_receiver daemon on the presentation machine.
+"""
+import collections
+import os
+import socket
+import threading
+import time
+from visionslide.config import *
+from visionslide.controls import remote_protocol as protocol
+from visionslide.utils.logger import setup_logger
+from visionslide.utils.metrics import get_metrics, REMOTE_RTT
+
+
+class RemoteController:
+    """
+    PPTController replacement that sends actions over TCP or UDP.
+
+    Action methods only queue a message and return at once; a sender
+    thread keeps the connection open, reconnects when it drops and
+    resends unacknowledged messages (the receiver drops duplicates by
+    sequence number). Actions older than REMOTE_ACTION_TTL are given up.
+    """
+
+    def __init__(self, host, port=REMOTE_PORT, transport=REMOTE_TRANSPORT, secret=REMOTE_SECRET):
+        self.logger = setup_logger('RemoteController')
+        self.metrics = get_metrics()
+        self.host = host
+        self.port = port
+        self.transport = transport
+        self.secret = secret.encode() if isinstance(secret, str) else secret
+        self.is_connected = False
+
+        self.session = int.from_bytes(os.urandom(4), "big")
+        self._seq = 0
+        self._queue = collections.deque()  # (seq, action code, queued time)
+        self._in_flight = {}               # seq -> [action code, queued time, last send (0 = due), tries]
+        self._cond = threading.Condition()
+        self._sock = None
+        self._running = False
+        self._sender = None
+        self._receiver = None
+        self._unreachable = False
+
+        # Statistics
+        self.sent = 0
+        self.acked = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.retransmits = 0
+        self.expired = 0
+        self.reconnects = 0
+        self.last_rtt = None
+
+        self.logger.info(f"Remote controller for {host}:{port} ({transport}), session {self.session:08x}")
+
+    # ---- PPTController interface ----------------------------------------
+
+    def connect(self):
+        """Start the sender; the connection itself is made in the background."""
+        if not self._running:
+            self._running = True
+            self._sender = threading.Thread(target=self._send_loop, name='RemoteSender', daemon=True)
+            self._sender.start()
+        self.is_connected = True
+        return True
+
+    def next_slide(self):
+        return self._submit("next_slide")
+
+    def previous_slide(self):
+        return self._submit("previous_slide")
+
+    def exit_presentation(self):
+        return self._submit("exit_presentation")
+
+    def disconnect(self):
+        self.is_connected = False
+
+    def release(self):
+        """Stop the sender threads and close the socket."""
+        self.is_connected = False
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._close_socket()
+        for thread in (self._sender, self._receiver):
+            if thread and thread is not threading.current_thread():
+                thread.join(timeout=1.0)
+
+    # ---- Sending ---------------------------------------------------------
+
+    def _submit(self, action):
+        """Queue an action. Never blocks; returns False if not connected."""
+        if not self.is_connected:
+            self.logger.warning("Remote controller not connected")
+            return False
+        with self._cond:
+            self._seq += 1
+            self._queue.append((self._seq, protocol.ACTION_CODES[action], time.monotonic()))
+            self._cond.notify()
+        return True
+
+    def _send_loop(self):
+        backoff = 0.1
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._due() or not self._running,
+                                    timeout=REMOTE_ACK_TIMEOUT)
+                if not self._running:
+                    return
+                while self._queue:
+                    seq, code, queued = self._queue.popleft()
+                    self._in_flight[seq] = [code, queued, 0.0, 0]
+                self._expire()
+                outgoing = self._due()
+
+            if not outgoing:
+                continue
+            if self._sock is None and not self._open_socket():
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 2.0)
+                continue
+            backoff = 0.1
+
+            sock = self._sock
+            try:
+                for seq in outgoing:
+                    self._send(sock, seq)
+            except (OSError, AttributeError) as e:
+                # AttributeError: the ack thread closed the socket meanwhile
+                self.logger.warning(f"Send to {self.host}:{self.port} failed: {e}")
+                self._close_socket()
+
+    def _due(self):
+        """
+        Sequence numbers to send now: never sent (or sent on a connection
+        that dropped), and for UDP also those whose ack timed out.
+        """
+        now = time.monotonic()
+        return [
+            seq for seq, (_, _, last_send, _) in self._in_flight.items()
+            if not last_send or (self.transport == "udp" and now - last_send >= REMOTE_ACK_TIMEOUT)
+        ]
+
+    def _expire(self):
+        """Give up on actions that would arrive too late to be useful."""
+        now = time.monotonic()
+        for seq, (_, queued, last_send, tries) in list(self._in_flight.items()):
+            timed_out = last_send and now - last_send >= REMOTE_ACK_TIMEOUT
+            if now - queued > REMOTE_ACTION_TTL or (timed_out and tries > REMOTE_MAX_RETRIES):
+                del self._in_flight[seq]
+                self.expired += 1
+                self.logger.warning(f"Action #{seq} not acknowledged, giving up")
+
+    def _send(self, sock, seq):
+        with self._cond:
+            entry = self._in_flight.get(seq)
+            if entry is None:
+                return
+            now = time.monotonic()
+            if entry[3]:
+                self.retransmits += 1
+            entry[2] = now
+            entry[3] += 1
+            code = entry[0]
+        message = protocol.pack(protocol.KIND_ACTION, code, self.session, seq, now, self.secret)
+        if self.transport == "udp":
+            sock.sendto(message, (self.host, self.port))
+        else:
+            sock.sendall(message)
+        self.sent += 1
+
+    def _open_socket(self):
+        try:
+            if self.transport == "udp":
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                sock.bind(("", 0))
+                # No connection to shut down: poll so release() is noticed
+                sock.settimeout(0.2)
+            else:
+                sock = socket.create_connection((self.host, self.port), timeout=REMOTE_CONNECT_TIMEOUT)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.settimeout(None)
+        except OSError as e:
+            if not self._unreachable:
+                self.logger.warning(f"Cannot reach receiver {self.host}:{self.port}: {e}, retrying")
+                self._unreachable = True
+            return False
+
+        self._unreachable = False
+        self._sock = sock
+        self.reconnects += 1
+        if self.reconnects > 1:
+            self.logger.info(f"Reconnected to {self.host}:{self.port}")
+        self._receiver = threading.Thread(target=self._receive_loop, args=(sock,),
+                                          name='RemoteAcks', daemon=True)
+        self._receiver.start()
+        return True
+
+    def _close_socket(self):
+        sock, self._sock = self._sock, None
+        with self._cond:
+            # Whatever was not acknowledged goes out again on the next connection
+            for entry in self._in_flight.values():
+                entry[2] = 0.0
+        if sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+    # ---- Acknowledgements ------------------------------------------------
+
+    def _receive_loop(self, sock):
+        while self._running and self._sock is sock:
+            try:
+                if self.transport == "udp":
+                    data = sock.recv(protocol.MESSAGE_SIZE)
+                else:
+                    data = _recv_exact(sock, protocol.MESSAGE_SIZE)
+                if not data:
+                    break
+                self._handle_ack(protocol.unpack(data, self.secret))
+            except socket.timeout:
+                continue
+            except protocol.ProtocolError as e:
+                self.logger.warning(f"Ignoring message from receiver: {e}")
+            except OSError:
+                break
+
+        if self._sock is sock:
+            self.logger.warning(f"Connection to {self.host}:{self.port} lost")
+            self._close_socket()
+            with self._cond:
+                self._cond.notify()
+
+    def _handle_ack(self, message):
+        kind, status, session, seq, timestamp = message
+        if kind != protocol.KIND_ACK or session != self.session:
+            return
+        rtt = time.monotonic() - timestamp
+        with self._cond:
+            if self._in_flight.pop(seq, None) is None:
+                return  # Ack of a retransmission already acknowledged
+            self.acked += 1
+            if status == protocol.STATUS_DUPLICATE:
+                self.duplicates += 1
+            elif status != protocol.STATUS_OK:
+                self.failed += 1
+        self.last_rtt = rtt
+        self.metrics.record(REMOTE_RTT, rtt)
+
+    def wait_acked(self, timeout=None):
+        """Wait until every queued action has been acknowledged or given up."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if not self._queue and not self._in_flight:
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+
+    def get_stats(self):
+        """Get message counters and round-trip times."""
+        rtt = self.metrics.histogram(REMOTE_RTT).snapshot()
+        with self._cond:
+            return {
+                'sent': self.sent,
+                'acked': self.acked,
+                'duplicates': self.duplicates,
+                'failed': self.failed,
+                'retransmits': self.retransmits,
+                'expired': self.expired,
+                'reconnects': max(0, self.reconnects - 1),
+                'pending': len(self._queue) + len(self._in_flight),
+                'rtt_last': self.last_rtt,
+                'rtt_p50': rtt.percentile(0.5),
+                'rtt_p95': rtt.percentile(0.95),
+            }
+
+
+def _recv_exact(sock, size):
+    """Read exactly size bytes, or b"" if the peer closed the connection."""
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return b""
+        data += chunk
+    return data
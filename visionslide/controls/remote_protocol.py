@@ -0,0 +1,90 @@
+"""
+Wire format of the remote presenter protocol.
+
+Every message is 30 bytes, big-endian:
+
+    magic     2s  b"VS"
+    version   B
+    kind      B   KIND_ACTION or KIND_ACK
+    code      B   action code (ACTION) or status (ACK)
+    (pad)     x
+    session   I   random id of the sender, fresh per process
+    seq       I   sequence number within the session
+    timestamp d   sender's monotonic send time, echoed in the ack
+    tag       8s  truncated HMAC-SHA256 of the above, zeros without secret
+
+The receiver answers every action with an ack carrying the same session,
+seq and timestamp, so the sender measures round trips on its own clock.
+"""
+import hashlib
+import hmac
+import struct
+
+MAGIC = b"VS"
+VERSION = 1
+
+KIND_ACTION = 1
+KIND_ACK = 2
+
+STATUS_OK = 0
+STATUS_DUPLICATE = 1
+STATUS_FAILED = 2
+STATUS_UNKNOWN_ACTION = 3
+
+ACTIONS = ("next_slide", "previous_slide", "exit_presentation")
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS, start=1)}
+
+_HEADER = struct.Struct("!2sBBBxIId")
+TAG_SIZE = 8
+MESSAGE_SIZE = _HEADER.size + TAG_SIZE
+_NO_TAG = bytes(TAG_SIZE)
+
+
+class ProtocolError(ValueError):
+    """Malformed or unauthenticated message."""
+
+
+def _tag(header, secret):
+    if not secret:
+        return _NO_TAG
+    return hmac.new(secret, header, hashlib.sha256).digest()[:TAG_SIZE]
+
+
+def pack(kind, code, session, seq, timestamp, secret=None):
+    """Encode one message."""
+    header = _HEADER.pack(MAGIC, VERSION, kind, code, session, seq, timestamp)
+    return header + _tag(header, secret)
+
+
+def unpack(data, secret=None):
+    """Decode one message into (kind, code, session, seq, timestamp)."""
+    if len(data) != MESSAGE_SIZE:
+        raise ProtocolError(f"expected {MESSAGE_SIZE} bytes, got {len(data)}")
+    header, tag = data[:_HEADER.size], data[_HEADER.size:]
+    magic, version, kind, code, session, seq, timestamp = _HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise ProtocolError("not a VisionSlide message")
+    if not hmac.compare_digest(tag, _tag(header, secret)):
+        raise ProtocolError("bad message tag")
+    return kind, code, session, seq, timestamp
+
+
+class SeqWindow:
+    """Sequence numbers already seen in one session, within a sliding window."""
+
+    def __init__(self, size=256):
+        self.size = size
+        self.highest = -1
+        self._seen = set()
+
+    def accept(self, seq):
+        """True the first time a sequence number is seen, False for duplicates."""
+        if seq <= self.highest - self.size or seq in self._seen:
+            return False
+        self._seen.add(seq)
+        if seq > self.highest:
+            self.highest = seq
+            if len(self._seen) > 2 * self.size:
+                floor = self.highest - self.size
+                self._seen = {s for s in self._seen if s > floor}
+        return True
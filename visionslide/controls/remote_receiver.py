@@ -0,0 +1,220 @@
+"""
+Receiver daemon for remote presenter control.
+
+Runs on the machine showing the slides, receives action messages from
+RemoteController and presses the keys with the local key backend.
+
+Usage: visionslide-receiver [--host HOST --secret KEY] [--port PORT] [--udp]
+                            [--key-backend NAME]
+"""
+import argparse
+import ipaddress
+import socket
+import socketserver
+import threading
+from visionslide.config import *
+from visionslide.controls import remote_protocol as protocol
+from visionslide.utils.logger import setup_logger
+
+# Sessions remembered for deduplication (one per sender process)
+MAX_SESSIONS = 64
+
+
+class RemoteReceiver:
+    """Performs the actions received over TCP or UDP and acknowledges each one."""
+
+    def __init__(self, controller, host=REMOTE_LISTEN_HOST, port=REMOTE_PORT, transport=REMOTE_TRANSPORT,
+                 secret=REMOTE_SECRET):
+        self.logger = setup_logger('RemoteReceiver')
+        self.controller = controller
+        self.host = host
+        self.port = port
+        self.transport = transport
+        self.secret = secret.encode() if isinstance(secret, str) else secret
+
+        self._sessions = {}  # session id -> SeqWindow
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+        # Statistics
+        self.performed = 0
+        self.failed = 0
+        self.duplicates = 0
+        self.rejected = 0
+
+    def handle_message(self, data):
+        """Process one message; returns the ack to send back, or None."""
+        try:
+            kind, code, session, seq, timestamp = protocol.unpack(data, self.secret)
+        except protocol.ProtocolError as e:
+            self.rejected += 1
+            self.logger.warning(f"Rejected message: {e}")
+            return None
+        if kind != protocol.KIND_ACTION:
+            return None
+
+        # Serialized: key presses from several senders must not interleave
+        with self._lock:
+            window = self._sessions.get(session)
+            if window is None:
+                if len(self._sessions) >= MAX_SESSIONS:
+                    del self._sessions[next(iter(self._sessions))]
+                window = self._sessions[session] = protocol.SeqWindow()
+
+            if not window.accept(seq):
+                self.duplicates += 1
+                status = protocol.STATUS_DUPLICATE
+            else:
+                status = self._perform(code)
+
+        return protocol.pack(protocol.KIND_ACK, status, session, seq, timestamp, self.secret)
+
+    def _perform(self, code):
+        if not 1 <= code <= len(protocol.ACTIONS):
+            return protocol.STATUS_UNKNOWN_ACTION
+        action = protocol.ACTIONS[code - 1]
+        try:
+            performed = getattr(self.controller, action)()
+        except Exception as e:
+            self.logger.error(f"Action '{action}' failed: {e}")
+            performed = False
+
+        if performed:
+            self.performed += 1
+            return protocol.STATUS_OK
+        self.failed += 1
+        return protocol.STATUS_FAILED
+
+    def _make_server(self):
+        receiver = self
+
+        if self.transport == "udp":
+            class Handler(socketserver.BaseRequestHandler):
+                def handle(self):
+                    data, sock = self.request
+                    reply = receiver.handle_message(data)
+                    if reply:
+                        sock.sendto(reply, self.client_address)
+
+            # One datagram at a time keeps the actions in order
+            server_class = socketserver.UDPServer
+        else:
+            class Handler(socketserver.StreamRequestHandler):
+                def setup(self):
+                    super().setup()
+                    self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+                def handle(self):
+                    receiver.logger.info(f"Sender connected from {self.client_address[0]}")
+                    while True:
+                        data = self.rfile.read(protocol.MESSAGE_SIZE)
+                        if len(data) < protocol.MESSAGE_SIZE:
+                            break
+                        reply = receiver.handle_message(data)
+                        if reply:
+                            self.wfile.write(reply)
+                    receiver.logger.info(f"Sender {self.client_address[0]} disconnected")
+
+            server_class = socketserver.ThreadingTCPServer
+
+        class Server(server_class):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        server = Server((self.host, self.port), Handler)
+        self.port = server.server_address[1]
+        return server
+
+    def start(self):
+        """Serve on a background thread."""
+        self._server = self._make_server()
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='RemoteReceiver', daemon=True)
+        self._thread.start()
+        self.logger.info(f"Receiving actions on {self.host}:{self.port} ({self.transport})")
+        return self
+
+    def serve_forever(self):
+        """Serve on the calling thread until stop() or Ctrl+C."""
+        self._server = self._make_server()
+        self.logger.info(f"Receiving actions on {self.host}:{self.port} ({self.transport})")
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stop serving and close the socket; safe after serve_forever() returned."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def get_stats(self):
+        """Get counts of performed, failed, duplicate and rejected actions."""
+        return {
+            'performed': self.performed,
+            'failed': self.failed,
+            'duplicates': self.duplicates,
+            'rejected': self.rejected,
+            'sessions': len(self._sessions),
+        }
+
+
+def is_loopback(host):
+    """True if host only accepts connections from this machine."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def main(argv=None):
+    """Run the receiver daemon."""
+    from visionslide.controls.key_backends import KEY_BACKENDS, select_backend
+    from visionslide.controls.ppt_controller import PPTController
+
+    parser = argparse.ArgumentParser(
+        prog="visionslide-receiver",
+        description="Press presentation keys sent by a remote VisionSlide camera box."
+    )
+    parser.add_argument("--host", default=REMOTE_LISTEN_HOST,
+                        help=f"address to listen on (default {REMOTE_LISTEN_HOST}, this machine only; "
+                             "0.0.0.0 for all interfaces, which requires --secret)")
+    parser.add_argument("--port", type=int, default=REMOTE_PORT)
+    parser.add_argument("--udp", action="store_true", help="listen on UDP instead of TCP")
+    parser.add_argument("--secret", default=REMOTE_SECRET,
+                        help="shared key; messages not signed with it are rejected")
+    parser.add_argument("--allow-unsigned", action="store_true",
+                        help="listen on a network address without --secret: anyone who "
+                             "can reach the port can press keys")
+    parser.add_argument("--key-backend", choices=["auto"] + sorted(KEY_BACKENDS), default=KEY_BACKEND)
+    parser.add_argument("--target", default=PRESENTATION_TARGET, help="presentation key profile")
+    args = parser.parse_args(argv)
+    if not args.secret and not is_loopback(args.host):
+        if not args.allow_unsigned:
+            parser.error(f"listening on {args.host} needs --secret "
+                         "(or --allow-unsigned on a trusted network)")
+        setup_logger('RemoteReceiver').warning(
+            f"Listening on {args.host} without a secret: any host can press keys"
+        )
+
+    controller = PPTController(target=args.target, backend=select_backend(args.key_backend))
+    controller.connect()
+    receiver = RemoteReceiver(controller, args.host, args.port, "udp" if args.udp else "tcp",
+                              secret=args.secret)
+    try:
+        receiver.serve_forever()
+    except KeyboardInterrupt:
+        print("\nReceiver stopped")
+    finally:
+        receiver.stop()
+        controller.release()
+        print(f"Receiver stats: {receiver.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
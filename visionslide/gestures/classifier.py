@@ -0,0 +1,232 @@
+"""
+Trainable gesture classifier: a tiny NumPy MLP over normalized landmarks.
+
+Landmarks are made relative to the wrist, rotated so the palm points up
+and scaled by the palm size, so the features do not depend on where the
+hand is, how far it is or how it is tilted. The network classifies the
+hand pose ("pointing", "open_hand", "unknown", ...); as with the rules,
+a pointing hand then becomes point_left/point_right from its position.
+
+Training reads timeline stores recorded with --timeline. Labels are the
+recorded gestures, or a labels CSV (start,end,gesture) for sessions
+annotated by hand. The model is a single .npz file.
+
+Usage: visionslide train STORE [STORE ...] -o MODEL.npz [--labels CSV] [--hidden H] [--epochs E]
+       (or python -m visionslide.gestures.classifier)
+"""
+import argparse
+import csv
+import numpy as np
+from visionslide.config import *
+from visionslide.gestures.landmarks import (
+    NUM_LANDMARKS, WRIST, MIDDLE_MCP, hand_positions,
+    GESTURE_UNKNOWN, GESTURE_POINTING, GESTURE_POINT_LEFT, GESTURE_POINT_RIGHT
+)
+from visionslide.utils.logger import setup_logger
+
+MODEL_VERSION = 1
+
+# Recorded gestures and the pose they are trained as
+POSES = {GESTURE_POINT_LEFT: GESTURE_POINTING, GESTURE_POINT_RIGHT: GESTURE_POINTING}
+# Not a pose: no training sample
+UNLABELED = ("no_hand", "error", "swipe_left", "swipe_right")
+
+
+def landmark_features(landmarks):
+    """(N, 60) position, scale and rotation invariant features of (N, 21, 3) hands."""
+    landmarks = np.asarray(landmarks, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+    relative = landmarks - landmarks[:, WRIST:WRIST + 1]
+    palm = relative[:, MIDDLE_MCP, :2]
+    scale = np.maximum(np.linalg.norm(palm, axis=1), 1e-6)
+    ux, uy = (palm / scale[:, None]).T
+
+    # Rotate the wrist -> middle MCP direction onto "up" (0, -1)
+    x, y, z = relative[..., 0], relative[..., 1], relative[..., 2]
+    features = np.empty((len(landmarks), NUM_LANDMARKS - 1, 3), dtype=np.float32)
+    features[..., 0] = (-uy[:, None] * x + ux[:, None] * y)[:, 1:]
+    features[..., 1] = (-ux[:, None] * x - uy[:, None] * y)[:, 1:]
+    features[..., 2] = z[:, 1:]
+    features /= scale[:, None, None]
+    return features.reshape(len(landmarks), -1)
+
+
+def mirror(landmarks):
+    """The same hands seen as the other hand (x flipped)."""
+    mirrored = np.array(landmarks, dtype=np.float32)
+    mirrored[..., 0] = 1.0 - mirrored[..., 0]
+    return mirrored
+
+
+class GestureClassifier:
+    """One hidden layer MLP; predict() takes a batch of (N, 21, 3) hands."""
+
+    def __init__(self, classes, weights, mean, std, min_probability=GESTURE_MODEL_MIN_PROBABILITY):
+        self.classes = np.asarray(classes, dtype=object)
+        self.w1, self.b1, self.w2, self.b2 = weights
+        self.mean = mean
+        self.std = std
+        self.min_probability = min_probability
+        # Standardization folded into the first layer: one matmul per batch
+        self._w1 = (self.w1 / std[:, None]).astype(np.float32)
+        self._b1 = (self.b1 - (mean / std) @ self.w1).astype(np.float32)
+
+    # ---- Inference -------------------------------------------------------
+
+    def predict_proba(self, landmarks):
+        """(N, classes) pose probabilities."""
+        hidden = np.maximum(landmark_features(landmarks) @ self._w1 + self._b1, 0.0)
+        logits = hidden @ self.w2 + self.b2
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        return probabilities
+
+    def predict_poses(self, landmarks):
+        """(N,) pose names, "unknown" when the model is not confident."""
+        probabilities = self.predict_proba(landmarks)
+        best = probabilities.argmax(axis=1)
+        poses = self.classes[best]
+        poses[probabilities[np.arange(len(best)), best] < self.min_probability] = GESTURE_UNKNOWN
+        return poses
+
+    def predict(self, landmarks):
+        """(N,) gesture names, with the same vocabulary as classify_landmarks."""
+        landmarks = np.asarray(landmarks, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+        gestures = self.predict_poses(landmarks)
+        pointing = gestures == GESTURE_POINTING
+        positions = hand_positions(landmarks)
+        gestures[pointing & (positions < 0)] = GESTURE_POINT_LEFT
+        gestures[pointing & (positions > 0)] = GESTURE_POINT_RIGHT
+        return gestures
+
+    # ---- Training --------------------------------------------------------
+
+    @classmethod
+    def train(cls, landmarks, labels, hidden=32, epochs=300, learning_rate=0.01, seed=0):
+        """Fit on (N, 21, 3) hands and their gesture names (full-batch Adam)."""
+        labels = np.array([POSES.get(label, label) for label in labels], dtype=object)
+        # Both hands: every sample also counts mirrored
+        landmarks = np.concatenate([landmarks, mirror(landmarks)])
+        labels = np.concatenate([labels, labels])
+
+        classes = sorted(set(labels))
+        targets = np.searchsorted(classes, labels)
+        features = landmark_features(landmarks)
+        mean = features.mean(axis=0)
+        std = features.std(axis=0) + 1e-6
+        features = (features - mean) / std
+
+        rng = np.random.default_rng(seed)
+        weights = [
+            rng.normal(0, np.sqrt(2 / features.shape[1]), (features.shape[1], hidden)).astype(np.float32),
+            np.zeros(hidden, dtype=np.float32),
+            rng.normal(0, np.sqrt(1 / hidden), (hidden, len(classes))).astype(np.float32),
+            np.zeros(len(classes), dtype=np.float32),
+        ]
+        moments = [np.zeros_like(w) for w in weights]
+        velocities = [np.zeros_like(w) for w in weights]
+        one_hot = np.eye(len(classes), dtype=np.float32)[targets]
+
+        for step in range(1, epochs + 1):
+            w1, b1, w2, b2 = weights
+            pre = features @ w1 + b1
+            hidden_out = np.maximum(pre, 0.0)
+            logits = hidden_out @ w2 + b2
+            logits -= logits.max(axis=1, keepdims=True)
+            probabilities = np.exp(logits)
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+
+            # Cross-entropy gradients
+            d_logits = (probabilities - one_hot) / len(features)
+            d_hidden = (d_logits @ w2.T) * (pre > 0)
+            gradients = [features.T @ d_hidden, d_hidden.sum(axis=0),
+                         hidden_out.T @ d_logits, d_logits.sum(axis=0)]
+
+            for w, g, m, v in zip(weights, gradients, moments, velocities):
+                m *= 0.9
+                m += 0.1 * g
+                v *= 0.999
+                v += 0.001 * g * g
+                w -= learning_rate * (m / (1 - 0.9 ** step)) / (np.sqrt(v / (1 - 0.999 ** step)) + 1e-8)
+
+        return cls(classes, weights, mean.astype(np.float32), std.astype(np.float32))
+
+    # ---- Storage ---------------------------------------------------------
+
+    def save(self, path):
+        np.savez(path, version=MODEL_VERSION, classes=np.asarray(self.classes, dtype=str),
+                 w1=self.w1, b1=self.b1, w2=self.w2, b2=self.b2, mean=self.mean, std=self.std)
+
+    @classmethod
+    def load(cls, path, min_probability=GESTURE_MODEL_MIN_PROBABILITY):
+        with np.load(path) as data:
+            if int(data['version']) != MODEL_VERSION:
+                raise ValueError(f"Unsupported gesture model version {int(data['version'])} in {path}")
+            weights = (data['w1'], data['b1'], data['w2'], data['b2'])
+            return cls(data['classes'].tolist(), weights, data['mean'], data['std'], min_probability)
+
+
+def load_classifier(path=GESTURE_MODEL):
+    """The trained classifier at path, or None to keep the rules."""
+    if not path:
+        return None
+    logger = setup_logger('GestureClassifier')
+    try:
+        classifier = GestureClassifier.load(path)
+        logger.info(f"Gesture model {path} loaded ({', '.join(classifier.classes)})")
+        return classifier
+    except Exception as e:
+        logger.error(f"Could not load gesture model {path}, using the rules: {e}")
+        return None
+
+
+def training_set(stores, labels=None):
+    """(landmarks, labels) of every frame with a hand and a pose label."""
+    all_landmarks, all_labels = [], []
+    for store in stores:
+        rows = np.flatnonzero(store.hand_mask)
+        names = store.decode_gestures(rows)
+        if labels is not None:
+            names = np.full(len(rows), GESTURE_UNKNOWN, dtype=object)
+            times = store.timestamp[rows]
+            for start, end, gesture in labels:
+                names[(times >= start) & (times <= end)] = gesture
+        keep = ~np.isin(names, UNLABELED)
+        all_landmarks.append(np.asarray(store.landmarks[rows[keep]]))
+        all_labels.append(names[keep])
+    return np.concatenate(all_landmarks), np.concatenate(all_labels)
+
+
+def main(argv=None):
+    from visionslide.gestures.timeline_store import TimelineStore
+
+    parser = argparse.ArgumentParser(prog="visionslide train", description=__doc__.splitlines()[1])
+    parser.add_argument('stores', nargs='+', metavar='STORE', help="timeline store directories")
+    parser.add_argument('-o', '--output', required=True, help="model file to write (.npz)")
+    parser.add_argument('--labels', help="CSV of start,end,gesture; frames outside are 'unknown'")
+    parser.add_argument('--hidden', type=int, default=32)
+    parser.add_argument('--epochs', type=int, default=300)
+    parser.add_argument('--holdout', type=float, default=0.2, help="fraction kept for validation")
+    args = parser.parse_args(argv)
+
+    labels = None
+    if args.labels:
+        with open(args.labels, newline="") as f:
+            labels = [(float(row['start']), float(row['end']), row['gesture']) for row in csv.DictReader(f)]
+    landmarks, names = training_set([TimelineStore(path) for path in args.stores], labels)
+    if not len(landmarks):
+        parser.error("no labeled hand frames in the given stores")
+
+    # Contiguous holdout: neighbouring frames are near duplicates
+    split = int(len(landmarks) * (1 - args.holdout))
+    classifier = GestureClassifier.train(landmarks[:split], names[:split], args.hidden, args.epochs)
+    poses = np.array([POSES.get(name, name) for name in names], dtype=object)
+    if split < len(landmarks):
+        accuracy = np.mean(classifier.predict_poses(landmarks[split:]) == poses[split:])
+        print(f"Validation accuracy: {accuracy:.1%} on {len(landmarks) - split} frames")
+    classifier.save(args.output)
+    print(f"Model with classes {list(classifier.classes)} trained on {split} frames, saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
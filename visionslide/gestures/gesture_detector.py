@@ -1,154 +1,378 @@
 """
 Gesture detection module using MediaPipe Hands.
 """
+import time
 import cv2
 import mediapipe as mp
+import numpy as np
 from visionslide.config import *
+from visionslide.gestures.landmarks import (
+    FINGER_NAMES, landmarks_to_array, finger_states, hand_positions, classify_landmarks,
+    draw_landmark_array
+)
+from visionslide.gestures.classifier import load_classifier
+from visionslide.gestures.swipe_detector import SwipeDetector
 from visionslide.utils.logger import setup_logger
+from visionslide.utils.metrics import get_metrics, COLOR_CONVERSION, HANDS_PROCESS
 
 class GestureDetector:
     """Hand gesture detection using MediaPipe."""
     
-    def __init__(self):
+    def __init__(self, roi_mode=ROI_INFERENCE, roi_max_size=ROI_MAX_SIZE, gesture_model=GESTURE_MODEL):
         self.logger = setup_logger('GestureDetector')
+        self.metrics = get_metrics()
         
         self.mp_hands = mp.solutions.hands
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         
-        self.hands = self.mp_hands.Hands(
-            model_complexity=MODEL_COMPLEXITY,
+        self.model_complexity = MODEL_COMPLEXITY
+        self.hands = self._create_hands(MODEL_COMPLEXITY)
+        # Graphs already built, so switching complexity back and forth is instant
+        self._hands_by_complexity = {MODEL_COMPLEXITY: self.hands}
+        
+        # Preallocated RGB buffer, reused while the frame size does not change
+        self._rgb_buffer = None
+        self._landmark_cache = (None, None)
+        self.last_handedness = (None, 0.0)  # (label, score) of the last detected hand
+        self._landmark_style = self.mp_drawing_styles.get_default_hand_landmarks_style()
+        self._connection_style = self.mp_drawing_styles.get_default_hand_connections_style()
+        
+        # ROI inference: crop (and downscale) around the previous hand
+        self.roi_mode = roi_mode
+        self.roi_max_size = roi_max_size
+        self.inference_scale = 1.0  # Frames are downscaled by this before inference
+        self._roi = None            # (x0, y0, x1, y1) in pixels
+        self._roi_buffers = {}      # Reusable crop buffers, keyed by shape
+        self.roi_frames = 0
+        self.roi_misses = 0
+        self.full_frames = 0
+        
+        # Swipes need the recent trajectory, static gestures only the current frame
+        self.swipe_detector = SwipeDetector() if SWIPE_GESTURES else None
+        # Trained pose classifier when a model is configured, the rules otherwise
+        self.classifier = load_classifier(gesture_model)
+        self._classify = self.classifier.predict if self.classifier else classify_landmarks
+        
+        self.logger.info("Gesture detector initialized")
+    
+    def _create_hands(self, model_complexity):
+        """Build a MediaPipe Hands graph."""
+        return self.mp_hands.Hands(
+            model_complexity=model_complexity,
             min_detection_confidence=MIN_DETECTION_CONFIDENCE,
             min_tracking_confidence=MIN_TRACKING_CONFIDENCE,
             max_num_hands=1,
             static_image_mode=False
         )
+    
+    def warm_up(self, frame_shape=(FRAME_HEIGHT, FRAME_WIDTH, 3)):
+        """
+        Run one inference on a blank frame, so the first camera frame does
+        not pay for the lazy setup of the model (several times a normal frame).
+        """
+        try:
+            start = time.perf_counter()
+            blank = np.zeros(frame_shape, dtype=np.uint8)
+            blank.flags.writeable = False
+            self.hands.process(blank)
+            self.logger.info(f"Hand model warmed up in {(time.perf_counter() - start) * 1000:.0f} ms")
+        except Exception as e:
+            self.logger.error(f"Error warming up the hand model: {e}")
+    
+    def set_model_complexity(self, model_complexity):
+        """
+        Switch the MediaPipe model complexity at runtime.
+        Must be called from the thread that runs detection.
+        """
+        if model_complexity == self.model_complexity:
+            return
         
-        self.logger.info("Gesture detector initialized")
+        hands = self._hands_by_complexity.get(model_complexity)
+        if hands is None:
+            hands = self._hands_by_complexity[model_complexity] = self._create_hands(model_complexity)
+        self.hands = hands
+        self.model_complexity = model_complexity
+        self._roi = None
+        self.logger.info(f"Model complexity set to {model_complexity}")
+    
+    def set_inference_scale(self, inference_scale):
+        """
+        Downscale frames (and ROI crops) by this factor before MediaPipe.
+        Landmarks are normalized, so they need no remapping.
+        """
+        if inference_scale == self.inference_scale:
+            return
+        self.inference_scale = inference_scale
+        self.logger.info(f"Inference scale set to {inference_scale:g}")
     
     def detect_gestures(self, frame):
-        """Detect hand gestures in a frame."""
+        """Detect hand gestures in a frame and draw the landmarks on it."""
         if frame is None:
             return frame, None
         
+        hand_landmarks = self.detect_landmarks(frame)
+        if hand_landmarks is not None:
+            self.draw_landmarks(frame, hand_landmarks)
+        
+        return frame, hand_landmarks
+    
+    def detect_landmarks(self, frame):
+        """
+        Detect the hand landmarks in a BGR frame without drawing anything.
+        The frame is only read; returns the landmarks of the first hand or None.
+        """
+        if frame is None:
+            return None
+        
         try:
-            # Convert BGR to RGB
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            rgb_frame.flags.writeable = False
-            
-            # Process the frame
-            results = self.hands.process(rgb_frame)
-            
-            # Convert back to BGR
-            rgb_frame.flags.writeable = True
-            frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
-            
             hand_landmarks = None
+            if self.roi_mode and self._roi is not None:
+                hand_landmarks = self._detect_in_roi(frame)
+                if hand_landmarks is None:
+                    # Tracking lost: search the full frame again
+                    self.roi_misses += 1
+                    self._roi = None
             
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    self.mp_drawing.draw_landmarks(
-                        frame,
-                        hand_landmarks,
-                        self.mp_hands.HAND_CONNECTIONS,
-                        self.mp_drawing_styles.get_default_hand_landmarks_style(),
-                        self.mp_drawing_styles.get_default_hand_connections_style()
-                    )
-                hand_landmarks = results.multi_hand_landmarks[0]
+            if hand_landmarks is None:
+                self.full_frames += 1
+                hand_landmarks = self._process(self._to_rgb(frame))
             
-            return frame, hand_landmarks
+            if self.roi_mode:
+                self._update_roi(hand_landmarks, frame.shape)
+            return hand_landmarks
         
         except Exception as e:
-            self.logger.error(f"Error in gesture detection: {e}")
-            return frame, None
+            self.logger.error("Error in gesture detection: %s", e)
+            return None
+    
+    def _process(self, rgb_frame):
+        """Run MediaPipe on an RGB image and return the first hand or None."""
+        # Read-only buffer lets MediaPipe skip a copy
+        rgb_frame.flags.writeable = False
+        start = time.perf_counter()
+        results = self.hands.process(rgb_frame)
+        self.metrics.record(HANDS_PROCESS, time.perf_counter() - start)
+        
+        if results.multi_hand_landmarks:
+            if results.multi_handedness:
+                classification = results.multi_handedness[0].classification[0]
+                self.last_handedness = (classification.label, classification.score)
+            return results.multi_hand_landmarks[0]
+        self.last_handedness = (None, 0.0)
+        return None
+    
+    def _detect_in_roi(self, frame):
+        """Run MediaPipe on the padded region around the previous hand."""
+        start = time.perf_counter()
+        x0, y0, x1, y1 = self._roi
+        crop = frame[y0:y1, x0:x1]
+        crop_height, crop_width = crop.shape[:2]
+        
+        max_size = self.roi_max_size
+        if self.inference_scale < 1.0:
+            max_size = (max_size or max(crop_height, crop_width)) * self.inference_scale
+        if max_size and max(crop_height, crop_width) > max_size:
+            scale = max_size / max(crop_height, crop_width)
+            size = (max(1, round(crop_width * scale)), max(1, round(crop_height * scale)))
+            resized = self._get_roi_buffer('resized', (size[1], size[0], 3))
+            crop = cv2.resize(crop, size, dst=resized, interpolation=cv2.INTER_AREA)
+        
+        rgb_crop = self._get_roi_buffer('rgb', crop.shape)
+        cv2.cvtColor(crop, cv2.COLOR_BGR2RGB, dst=rgb_crop)
+        self.metrics.record(COLOR_CONVERSION, time.perf_counter() - start)
+        
+        hand_landmarks = self._process(rgb_crop)
+        if hand_landmarks is None:
+            return None
+        self.roi_frames += 1
+        
+        # Map ROI-normalized coordinates back to the full frame
+        frame_height, frame_width = frame.shape[:2]
+        array = landmarks_to_array(hand_landmarks)
+        array[:, 0] = (x0 + array[:, 0] * crop_width) / frame_width
+        array[:, 1] = (y0 + array[:, 1] * crop_height) / frame_height
+        array[:, 2] *= crop_width / frame_width
+        for landmark, (x, y, z) in zip(hand_landmarks.landmark, array.tolist()):
+            landmark.x, landmark.y, landmark.z = x, y, z
+        
+        self._landmark_cache = (hand_landmarks, array)
+        return hand_landmarks
+    
+    def _update_roi(self, hand_landmarks, frame_shape):
+        """Square, padded, grid-aligned ROI around the hand for the next frame."""
+        if hand_landmarks is None:
+            self._roi = None
+            return
+        
+        frame_height, frame_width = frame_shape[:2]
+        array = self.get_landmark_array(hand_landmarks)
+        xs = array[:, 0] * frame_width
+        ys = array[:, 1] * frame_height
+        
+        size = max(xs.max() - xs.min(), ys.max() - ys.min()) * (1 + 2 * ROI_PADDING)
+        size = int(np.ceil(max(size, ROI_MIN_SIZE) / ROI_ALIGN) * ROI_ALIGN)
+        if size >= min(frame_width, frame_height):
+            # Hand fills the frame, cropping would not help
+            self._roi = None
+            return
+        
+        center_x = (xs.max() + xs.min()) / 2
+        center_y = (ys.max() + ys.min()) / 2
+        x0 = int(np.clip(center_x - size / 2, 0, frame_width - size))
+        y0 = int(np.clip(center_y - size / 2, 0, frame_height - size))
+        self._roi = (x0, y0, x0 + size, y0 + size)
+    
+    def _get_roi_buffer(self, name, shape):
+        """Reusable uint8 buffer for an ROI or a downscaled frame of the given shape."""
+        key = (name, shape)
+        buffer = self._roi_buffers.get(key)
+        if buffer is None:
+            if len(self._roi_buffers) >= 16:
+                self._roi_buffers.clear()
+            buffer = self._roi_buffers[key] = np.empty(shape, dtype=np.uint8)
+        buffer.flags.writeable = True
+        return buffer
+    
+    def get_inference_stats(self):
+        """Get how many frames were processed as ROI crops or full frames."""
+        return {
+            'roi_frames': self.roi_frames,
+            'roi_misses': self.roi_misses,
+            'full_frames': self.full_frames,
+        }
+    
+    def draw_landmarks(self, frame, hand_landmarks):
+        """Draw hand landmarks (MediaPipe or a (21, 3) array) in place on a BGR frame."""
+        try:
+            if isinstance(hand_landmarks, np.ndarray):
+                return draw_landmark_array(frame, hand_landmarks)
+            self.mp_drawing.draw_landmarks(
+                frame,
+                hand_landmarks,
+                self.mp_hands.HAND_CONNECTIONS,
+                self._landmark_style,
+                self._connection_style
+            )
+        except Exception as e:
+            self.logger.error("Error drawing landmarks: %s", e)
+        return frame
+    
+    def _to_rgb(self, frame):
+        """Convert a BGR frame (downscaled first if set) into the reusable RGB buffer."""
+        start = time.perf_counter()
+        if self.inference_scale < 1.0:
+            height, width = frame.shape[:2]
+            size = (max(1, round(width * self.inference_scale)), max(1, round(height * self.inference_scale)))
+            resized = self._get_roi_buffer('scaled', (size[1], size[0], 3))
+            frame = cv2.resize(frame, size, dst=resized, interpolation=cv2.INTER_AREA)
+        if self._rgb_buffer is None or self._rgb_buffer.shape != frame.shape:
+            self._rgb_buffer = np.empty_like(frame)
+        
+        self._rgb_buffer.flags.writeable = True
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
+        self.metrics.record(COLOR_CONVERSION, time.perf_counter() - start)
+        return self._rgb_buffer
+    
+    def get_landmark_array(self, hand_landmarks):
+        """
+        Get the (21, 3) float32 array for hand landmarks.
+        Built once per detection and reused by every feature below.
+        """
+        if hand_landmarks is None:
+            return None
+        if isinstance(hand_landmarks, np.ndarray):
+            return hand_landmarks
+        
+        cached_source, cached_array = self._landmark_cache
+        if hand_landmarks is cached_source:
+            return cached_array
+        
+        array = landmarks_to_array(hand_landmarks)
+        self._landmark_cache = (hand_landmarks, array)
+        return array
     
     def get_finger_state(self, hand_landmarks):
         """Determine which fingers are extended."""
-        if not hand_landmarks:
+        if hand_landmarks is None:
             return None
         
         try:
-            finger_tips = [8, 12, 16, 20]  # Index, Middle, Ring, Pinky
-            finger_pips = [6, 10, 14, 18]
-            
-            finger_state = {
-                'index': False,
-                'middle': False,
-                'ring': False,
-                'pinky': False
-            }
-            
-            for i in range(4):
-                tip = hand_landmarks.landmark[finger_tips[i]]
-                pip = hand_landmarks.landmark[finger_pips[i]]
-                finger_name = ['index', 'middle', 'ring', 'pinky'][i]
-                finger_state[finger_name] = tip.y < pip.y
-            
-            return finger_state
+            states = finger_states(self.get_landmark_array(hand_landmarks))
+            return dict(zip(FINGER_NAMES, states.tolist()))
         
         except Exception as e:
-            self.logger.error(f"Error getting finger state: {e}")
+            self.logger.error("Error getting finger state: %s", e)
             return None
     
     def get_hand_position(self, hand_landmarks):
         """Get hand position in frame for direction."""
-        if not hand_landmarks:
+        if hand_landmarks is None:
             return "center"
         
         try:
-            wrist = hand_landmarks.landmark[0]
-            if wrist.x < 0.4:
-                return "left"
-            elif wrist.x > 0.6:
-                return "right"
-            else:
-                return "center"
+            position = hand_positions(self.get_landmark_array(hand_landmarks))
+            return {-1: "left", 0: "center", 1: "right"}[int(position)]
         except Exception as e:
-            self.logger.error(f"Error getting hand position: {e}")
+            self.logger.error("Error getting hand position: %s", e)
             return "center"
     
-    def recognize_gesture(self, hand_landmarks):
+    def recognize_gesture(self, hand_landmarks, timestamp=None):
         """
         Recognize gestures - version robuste qui retourne toujours une string.
+        Accepts MediaPipe landmarks or a (21, 3) landmark array. With the frame
+        timestamp, a swipe that just completed wins over the static gesture.
         """
-        if not hand_landmarks:
+        if hand_landmarks is None:
+            if self.swipe_detector:
+                self.swipe_detector.reset()
             return "no_hand"
         
         try:
-            finger_state = self.get_finger_state(hand_landmarks)
-            if not finger_state:
-                return "unknown"
-            
-            # 👉 Pointer (index seul)
-            if (finger_state['index'] and 
-                not finger_state['middle'] and 
-                not finger_state['ring'] and 
-                not finger_state['pinky']):
-                
-                hand_pos = self.get_hand_position(hand_landmarks)
-                if hand_pos == "right":
-                    return "point_right"
-                elif hand_pos == "left":
-                    return "point_left"
-                else:
-                    return "pointing"  # Main au centre
-            
-            # ✋ Main ouverte (tous doigts)
-            elif (finger_state['index'] and finger_state['middle'] and 
-                  finger_state['ring'] and finger_state['pinky']):
-                return "open_hand"
-            
-            # Geste non reconnu
-            return "unknown"
+            array = self.get_landmark_array(hand_landmarks)
+            if timestamp is not None and self.swipe_detector:
+                swipe = self.swipe_detector.update(array, timestamp)
+                if swipe:
+                    return swipe
+            return self._classify(array)[0]
         
         except Exception as e:
-            self.logger.error(f"Error recognizing gesture: {e}")
+            self.logger.error("Error recognizing gesture: %s", e)
             return "error"
     
+    def recognize_batch(self, landmarks):
+        """
+        Recognize gestures for a whole batch of hands in one call.
+        Takes an (N, 21, 3) array (e.g. a recorded session), returns N names.
+        """
+        try:
+            return self._classify(landmarks)
+        except Exception as e:
+            self.logger.error("Error recognizing gesture batch: %s", e)
+            return np.full(len(landmarks), "error", dtype=object)
+    
+    def reset_state(self):
+        """
+        Forget everything learned from previous frames: MediaPipe's hand
+        tracking (the graph is rebuilt), the ROI, the last hand and the
+        swipe trajectory and refractory period. For a new, unrelated
+        stream of frames, e.g. the next chunk of a batch.
+        """
+        for hands in self._hands_by_complexity.values():
+            hands.close()
+        self.hands = self._create_hands(self.model_complexity)
+        self._hands_by_complexity = {self.model_complexity: self.hands}
+        self._roi = None
+        self._landmark_cache = (None, None)
+        self.last_handedness = (None, 0.0)
+        if self.swipe_detector:
+            self.swipe_detector.reset_state()
+    
     def release(self):
         """Release resources."""
         try:
-            self.hands.close()
+            for hands in self._hands_by_complexity.values():
+                hands.close()
             self.logger.info("Gesture detector released")
         except Exception as e:
             self.logger.error(f"Error releasing gesture detector: {e}")
\ No newline at end of file
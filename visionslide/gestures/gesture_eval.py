@@ -0,0 +1,175 @@
+"""
+Trigger latency and false triggers of a gesture mapper on recorded timelines.
+
+Replays the per-frame gestures of timeline stores (visionslide --timeline)
+through a GestureMapper and compares the actions it fires with the
+intended gestures. Intended gestures are every swipe, and the runs of
+one pose with an action that last at least --min-duration seconds,
+merged across gaps shorter than --max-gap; a labels CSV (start,end,
+gesture, in timeline seconds) can replace them. Reports the latency from the start of each
+intended gesture to its action, the gestures that never fired, and the
+false triggers per minute: actions outside an intended gesture of their
+kind, or fired more than once during one.
+
+Usage: python -m visionslide.gestures.gesture_eval STORE [STORE ...] [--labels CSV] [--baseline]
+"""
+import argparse
+import csv
+import time
+import numpy as np
+from visionslide.config import *
+from visionslide.gestures.gesture_mapping import GestureMapper
+from visionslide.gestures.swipe_detector import SWIPE_GESTURES
+from visionslide.gestures.timeline_store import TimelineStore
+
+# Actions fired after the intended gesture ended still count for it
+END_TOLERANCE = 0.1
+
+
+class HoldTimerMapper:
+    """The former mapper: a fixed hold timer reset by any other gesture."""
+
+    def __init__(self, hold_duration=0.7, cooldown=GESTURE_COOLDOWN):
+        self.gesture_actions = GestureMapper().gesture_actions
+        self.hold_duration = hold_duration
+        self.cooldown = cooldown
+        self.current_gesture = None
+        self.gesture_start_time = 0
+        self.last_action_time = float('-inf')
+
+    def update_gesture(self, gesture_name, hand_landmarks, gesture_detector=None, timestamp=None,
+                       confidence=1.0):
+        current_time = time.time() if timestamp is None else timestamp
+        if gesture_name in ("unknown", "no_hand", "pointing", "error"):
+            return None
+        if current_time - self.last_action_time < self.cooldown:
+            return None
+        if gesture_name != self.current_gesture:
+            self.current_gesture = gesture_name
+            self.gesture_start_time = current_time
+            return None
+        if (current_time - self.gesture_start_time >= self.hold_duration and
+                gesture_name in self.gesture_actions):
+            self.last_action_time = current_time
+            return self.gesture_actions[gesture_name]
+        return None
+
+
+def intended_segments(store, gestures, min_duration=0.5, max_gap=0.2):
+    """(start, end, gesture) of every sustained gesture and every swipe in a store."""
+    segments = []
+    for gesture in gestures:
+        runs = store.gesture_segments(gesture)
+        if gesture in SWIPE_GESTURES:
+            # A swipe is recognized on the frame its motion completes
+            segments.extend((start, end, gesture) for start, end in runs)
+            continue
+        merged = []
+        for start, end in runs:
+            if merged and start - merged[-1][1] <= max_gap:
+                merged[-1][1] = end
+            else:
+                merged.append([start, end])
+        segments.extend((start, end, gesture) for start, end in merged if end - start >= min_duration)
+    return sorted(segments)
+
+
+def load_labels(path):
+    """(start, end, gesture) rows of a labels CSV."""
+    with open(path, newline="") as f:
+        return sorted((float(row['start']), float(row['end']), row['gesture'])
+                      for row in csv.DictReader(f))
+
+
+def replay(store, mapper):
+    """Feed every frame of a store to a mapper; returns [(time, action)]."""
+    gestures = store.decode_gestures()
+    triggers = []
+    for timestamp, gesture, score in zip(store.timestamp.tolist(), gestures, store.score.tolist()):
+        action = mapper.update_gesture(gesture, None, None, timestamp, confidence=score or 1.0)
+        if action:
+            triggers.append((timestamp, action))
+    return triggers
+
+
+def evaluate(store, mapper, segments=None):
+    """Latency, misses and false triggers of a mapper on one store."""
+    actions = mapper.gesture_actions
+    if segments is None:
+        segments = intended_segments(store, actions)
+    triggers = replay(store, mapper)
+
+    latencies = []
+    missed = 0
+    matched = set()
+    for start, end, gesture in segments:
+        hits = [i for i, (t, action) in enumerate(triggers)
+                if action == actions.get(gesture) and start <= t <= end + END_TOLERANCE]
+        if hits:
+            latencies.append(triggers[hits[0]][0] - start)
+            matched.add(hits[0])
+        else:
+            missed += 1
+
+    false_triggers = len(triggers) - len(matched)
+    duration = float(store.timestamp[-1] - store.timestamp[0]) if len(store) > 1 else 0.0
+    return {
+        'gestures': len(segments),
+        'triggers': len(triggers),
+        'missed': missed,
+        'false_triggers': false_triggers,
+        'duration': duration,
+        'false_per_minute': false_triggers / duration * 60 if duration else 0.0,
+        'latencies': latencies,
+    }
+
+
+def summarize(results):
+    """Merge per-store results into one line of totals and latency percentiles."""
+    latencies = np.concatenate([r['latencies'] for r in results]) if results else np.empty(0)
+    duration = sum(r['duration'] for r in results)
+    false_triggers = sum(r['false_triggers'] for r in results)
+    return {
+        'gestures': sum(r['gestures'] for r in results),
+        'missed': sum(r['missed'] for r in results),
+        'false_triggers': false_triggers,
+        'false_per_minute': false_triggers / duration * 60 if duration else 0.0,
+        'latency_p50': float(np.percentile(latencies, 50)) if len(latencies) else None,
+        'latency_p95': float(np.percentile(latencies, 95)) if len(latencies) else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('stores', nargs='+', metavar='STORE', help="timeline store directories")
+    parser.add_argument('--labels', help="CSV of intended gestures (one store only)")
+    parser.add_argument('--min-duration', type=float, default=0.5)
+    parser.add_argument('--max-gap', type=float, default=0.2)
+    parser.add_argument('--baseline', action='store_true', help="also evaluate the fixed hold timer")
+    args = parser.parse_args(argv)
+
+    mappers = [("evidence", GestureMapper)]
+    if args.baseline:
+        mappers.append(("hold timer", HoldTimerMapper))
+
+    print(f"  {'mapper':<12} {'gestures':>8} {'missed':>6} {'false':>5} {'false/min':>9} "
+          f"{'p50 ms':>7} {'p95 ms':>7}")
+    for name, mapper_class in mappers:
+        results = []
+        for path in args.stores:
+            store = TimelineStore(path)
+            segments = load_labels(args.labels) if args.labels else None
+            if segments is None:
+                segments = intended_segments(store, mapper_class().gesture_actions,
+                                             args.min_duration, args.max_gap)
+            results.append(evaluate(store, mapper_class(), segments))
+
+        total = summarize(results)
+        p50 = "-" if total['latency_p50'] is None else f"{total['latency_p50'] * 1000:.0f}"
+        p95 = "-" if total['latency_p95'] is None else f"{total['latency_p95'] * 1000:.0f}"
+        print(f"  {name:<12} {total['gestures']:>8} {total['missed']:>6} {total['false_triggers']:>5} "
+              f"{total['false_per_minute']:>9.2f} {p50:>7} {p95:>7}")
+
+
+if __name__ == "__main__":
+    main()
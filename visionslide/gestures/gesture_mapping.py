@@ -1,59 +1,167 @@
 """
 Gesture to action mapping.
+
+Every frame votes for the gesture it shows, weighted by its confidence
+and by how long the frame lasted. Votes sit in a fixed-size ring buffer
+and expire after GESTURE_WINDOW seconds. A gesture fires its action as
+soon as it has GESTURE_TRIGGER_EVIDENCE seconds of votes and a clear
+majority over the other gestures: a steady hand triggers quickly, and a
+missing or misclassified frame only loses its own vote instead of
+restarting a hold timer. A gesture that fired must fade below
+GESTURE_RELEASE_EVIDENCE before it can fire again (hysteresis), so
+holding it does not repeat the action.
+
+Swipes are events rather than poses: SwipeDetector already checked the
+whole motion, so they fire on their single frame (cooldown permitting).
 """
 import time
+import numpy as np
 from visionslide.config import *
+from visionslide.gestures.swipe_detector import SWIPE_GESTURES as MOTION_GESTURES
 from visionslide.utils.logger import setup_logger
 
+# Frames that do not vote: the hand was lost for a moment
+DROPOUT_GESTURES = ("no_hand", "error")
+
+NO_VOTE = 0
+
+
 class GestureMapper:
     """Maps detected gestures to actions."""
     
-    def __init__(self):
+    def __init__(self, window=GESTURE_WINDOW, trigger_evidence=GESTURE_TRIGGER_EVIDENCE,
+                 release_evidence=GESTURE_RELEASE_EVIDENCE, majority=GESTURE_MAJORITY,
+                 buffer_size=GESTURE_BUFFER_SIZE):
         self.logger = setup_logger('GestureMapper')
-        self.current_gesture = None
-        self.gesture_start_time = 0
-        self.last_action_time = 0
-        self.gesture_hold_duration = GESTURE_HOLD_DURATION
+        self.current_gesture = None   # Gesture leading the vote
+        self.latched_gesture = None   # Gesture that fired, until it fades
+        self.latch_time = float('-inf')
+        self.last_action_time = float('-inf')
         self.gesture_cooldown = GESTURE_COOLDOWN
+        self.window = window
+        self.trigger_evidence = trigger_evidence
+        self.release_evidence = release_evidence
+        self.majority = majority
         
         self.gesture_actions = {
             "point_right": "next_slide",
             "point_left": "previous_slide", 
-            "open_hand": "exit"
+            "open_hand": "exit",
+            "swipe_right": "next_slide",
+            "swipe_left": "previous_slide"
         }
     
-    def update_gesture(self, gesture_name, hand_landmarks, gesture_detector):
+        # Vote codes: 0 no vote, 1..n the gestures with an action, n + 1 any other gesture
+        self._gestures = [gesture for gesture in self.gesture_actions if gesture not in MOTION_GESTURES]
+        self._codes = {gesture: code for code, gesture in enumerate(self._gestures, start=1)}
+        self._other = len(self._gestures) + 1
+        self._thresholds = np.array(
+            [GESTURE_EVIDENCE_OVERRIDES.get(gesture, trigger_evidence) for gesture in self._gestures]
+        )
+        
+        # Ring buffer of the latest votes
+        self._times = np.full(buffer_size, -np.inf)
+        self._votes = np.zeros(buffer_size, dtype=np.intp)
+        self._weights = np.zeros(buffer_size)
+        self._index = 0
+        self._last_time = None
+        
+    def update_gesture(self, gesture_name, hand_landmarks, gesture_detector=None, timestamp=None,
+                       confidence=1.0):
         """
-        Update current gesture and check if action should be triggered.
+        Add the gesture of one frame and check if an action should be triggered.
+        Call it for every frame, with or without a hand. timestamp is the frame
+        time in seconds (defaults to now), so recorded sessions replay the same
+        way at any speed; confidence (0-1) weighs the frame's vote.
         """
         try:
-            current_time = time.time()
-            
-            # Ignorer les gestes non reconnus
-            if gesture_name in ["unknown", "no_hand", "pointing", "error"]:
-                return None
-            
-            # Check cooldown period
-            if current_time - self.last_action_time < self.gesture_cooldown:
-                return None
+            current_time = time.time() if timestamp is None else timestamp
+            if gesture_name in MOTION_GESTURES:
+                return self._fire_swipe(gesture_name, current_time)
+            self._vote(gesture_name, confidence, current_time)
+            return self._decide(self.get_evidence(current_time), current_time)
+        
+        except Exception as e:
+            self.logger.error(f"Error in gesture mapping: {e}")
+            return None
             
-            # New gesture detected
-            if gesture_name != self.current_gesture:
-                self.current_gesture = gesture_name
-                self.gesture_start_time = current_time
-                return None
+    def _vote(self, gesture_name, confidence, current_time):
+        """Store the frame's vote, worth its confidence times its duration."""
+        if self._last_time is None:
+            duration = 1.0 / FPS_TARGET
+        else:
+            # A long gap (stalled camera) is not evidence either way
+            duration = min(max(current_time - self._last_time, 0.0), GESTURE_MAX_FRAME_GAP)
+        self._last_time = current_time
+        
+        if gesture_name in DROPOUT_GESTURES or confidence < GESTURE_CONFIDENCE_THRESHOLD:
+            code = NO_VOTE
+        else:
+            code = self._codes.get(gesture_name, self._other)
             
-            # Same gesture held for required duration
-            if (current_time - self.gesture_start_time >= self.gesture_hold_duration and
-                gesture_name in self.gesture_actions):
+        index = self._index
+        self._times[index] = current_time
+        self._votes[index] = code
+        self._weights[index] = confidence * duration
+        self._index = (index + 1) % len(self._times)
+        
+    def get_evidence(self, current_time):
+        """Seconds of confident votes per code within the window."""
+        recent = self._times > current_time - self.window
+        return np.bincount(self._votes[recent], weights=self._weights[recent],
+                           minlength=self._other + 1)
+                           
+    def _decide(self, evidence, current_time):
+        if self.latched_gesture is not None:
+            # Held for at least a window, so a latch set by a swipe sees the pose
+            faded = evidence[self._codes[self.latched_gesture]] < self.release_evidence
+            if faded and current_time - self.latch_time >= self.window:
+                self.latched_gesture = None
                 
-                action = self.gesture_actions[gesture_name]
-                self.last_action_time = current_time
-                self.logger.info(f"Gesture '{gesture_name}' triggered action: {action}")
-                return action
+        scores = evidence[1:self._other]
+        best = int(np.argmax(scores))
+        score = scores[best]
+        gesture = self._gestures[best]
+        self.current_gesture = gesture if score > 0 else None
+        
+        # Enough evidence, and a clear majority among the frames with a gesture
+        if score < self._thresholds[best] or score < self.majority * evidence[1:].sum():
+            return None
+        if gesture == self.latched_gesture:
+            return None
             
+        # Check cooldown period
+        if current_time - self.last_action_time < self.gesture_cooldown:
             return None
+            
+        action = self.gesture_actions[gesture]
+        self.latched_gesture = gesture
+        self.latch_time = current_time
+        self.last_action_time = current_time
+        self.logger.info(f"Gesture '{gesture}' triggered action: {action}")
+        return action
         
-        except Exception as e:
-            self.logger.error(f"Error in gesture mapping: {e}")
-            return None
\ No newline at end of file
+    def _fire_swipe(self, gesture, current_time):
+        self._last_time = current_time
+        if current_time - self.last_action_time < self.gesture_cooldown:
+            return None
+        action = self.gesture_actions.get(gesture)
+        if action is None:
+            return None
+        # The frames of the swipe must not also count toward a pose, and a
+        # hand left pointing the same way must be lowered before it fires
+        self._times[:] = -np.inf
+        for pose in self._gestures:
+            if self.gesture_actions[pose] == action:
+                self.latched_gesture = pose
+                self.latch_time = current_time
+        self.last_action_time = current_time
+        self.logger.info(f"Swipe '{gesture}' triggered action: {action}")
+        return action
+        
+    def reset(self):
+        """Forget every vote, e.g. when the source changes."""
+        self._times[:] = -np.inf
+        self._last_time = None
+        self.current_gesture = None
+        self.latched_gesture = None
@@ -0,0 +1,124 @@
+"""
+Temporal filtering of hand landmarks.
+
+OneEuroFilter smooths the whole (21, 3) landmark array at once: each
+coordinate is low-pass filtered with a cutoff that rises with its speed,
+so a still hand stops jittering and a moving hand does not lag. The
+filtered speed also extrapolates the landmarks a short time ahead.
+
+LandmarkTracker adds keyframe inference on top: while the hand moves
+slowly, MediaPipe only runs every KEYFRAME_INTERVAL frames and the
+frames in between get landmarks predicted by the filter.
+"""
+import math
+import numpy as np
+from visionslide.config import *
+
+
+def _smoothing_factor(cutoff, dt):
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """Vectorized One Euro filter over landmark arrays."""
+
+    def __init__(self, min_cutoff=LANDMARK_MIN_CUTOFF, beta=LANDMARK_BETA, d_cutoff=LANDMARK_D_CUTOFF):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        """Forget the hand, e.g. once it leaves the frame."""
+        self.value = None      # Filtered landmarks
+        self.velocity = None   # Filtered speed, units per second
+        self.last_time = None
+        self.samples = 0
+
+    def update(self, landmarks, timestamp):
+        """Filter a new measurement; returns the smoothed array."""
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        self.samples += 1
+        if self.value is None:
+            self.value = landmarks.copy()
+            self.velocity = np.zeros_like(self.value)
+            self.last_time = timestamp
+            return self.value.copy()
+
+        dt = max(timestamp - self.last_time, 1e-3)
+        self.last_time = timestamp
+
+        speed = (landmarks - self.value) / dt
+        self.velocity += _smoothing_factor(self.d_cutoff, dt) * (speed - self.velocity)
+
+        # Per coordinate cutoff: smooth when still, responsive when moving
+        cutoff = self.min_cutoff + self.beta * np.abs(self.velocity)
+        tau = 1.0 / (2 * np.pi * cutoff)
+        alpha = 1.0 / (1.0 + tau / dt)
+        self.value += alpha * (landmarks - self.value)
+        return self.value.copy()
+
+    def predict(self, timestamp, max_horizon=LANDMARK_PREDICTION_MAX):
+        """Landmarks extrapolated at constant speed to timestamp, or None."""
+        if self.value is None:
+            return None
+        horizon = min(max(timestamp - self.last_time, 0.0), max_horizon)
+        return self.value + self.velocity * horizon
+
+    def speed(self):
+        """Fastest image-plane speed of any landmark, in frame widths per second."""
+        if self.samples < 2:
+            return float('inf')  # No speed estimate yet
+        return float(np.abs(self.velocity[..., :2]).max())
+
+
+class LandmarkTracker:
+    """
+    Smooths landmarks and decides which frames need full inference.
+    Keyframes run MediaPipe; in-between frames are filled by prediction.
+    """
+
+    def __init__(self, landmark_filter=None, keyframe_interval=KEYFRAME_INTERVAL,
+                 stable_speed=KEYFRAME_STABLE_SPEED, prediction=LANDMARK_PREDICTION):
+        self.filter = landmark_filter or OneEuroFilter()
+        self.keyframe_interval = keyframe_interval
+        self.stable_speed = stable_speed
+        self.prediction = prediction
+        self._since_keyframe = 0
+
+        # Statistics
+        self.keyframes = 0
+        self.filled_frames = 0
+
+    def needs_inference(self):
+        """True when the next frame must go through MediaPipe."""
+        if self.keyframe_interval <= 1:
+            return True
+        if self.filter.speed() > self.stable_speed:
+            return True
+        return self._since_keyframe >= self.keyframe_interval - 1
+
+    def update(self, landmarks, timestamp):
+        """Filter the landmarks of a keyframe (None when no hand was found)."""
+        self.keyframes += 1
+        self._since_keyframe = 0
+        if landmarks is None:
+            self.filter.reset()
+            return None
+        self.filter.update(landmarks, timestamp)
+        return self.filter.predict(timestamp + self.prediction, max_horizon=self.prediction)
+
+    def fill(self, timestamp):
+        """Predicted landmarks for a frame that skipped inference."""
+        self.filled_frames += 1
+        self._since_keyframe += 1
+        return self.filter.predict(timestamp + self.prediction)
+
+    def get_stats(self):
+        total = self.keyframes + self.filled_frames
+        return {
+            'keyframes': self.keyframes,
+            'filled_frames': self.filled_frames,
+            'fill_ratio': self.filled_frames / total if total else 0.0,
+        }
@@ -0,0 +1,104 @@
+"""
+NumPy representation of MediaPipe hand landmarks.
+
+A hand is a (21, 3) float32 array of normalized (x, y, z) coordinates,
+built once per frame. Every feature below is vectorized and also accepts
+a batch of hands shaped (N, 21, 3).
+"""
+import cv2
+import numpy as np
+from visionslide.config import *
+
+NUM_LANDMARKS = 21
+WRIST = 0
+MIDDLE_MCP = 9
+
+FINGER_NAMES = ('index', 'middle', 'ring', 'pinky')
+FINGER_TIPS = np.array([8, 12, 16, 20])  # Index, Middle, Ring, Pinky
+FINGER_PIPS = np.array([6, 10, 14, 18])
+
+# Same skeleton as mp.solutions.hands.HAND_CONNECTIONS, without importing MediaPipe
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+
+# Gestures returned by classify_landmarks
+GESTURE_UNKNOWN = "unknown"
+GESTURE_POINTING = "pointing"
+GESTURE_POINT_LEFT = "point_left"
+GESTURE_POINT_RIGHT = "point_right"
+GESTURE_OPEN_HAND = "open_hand"
+
+
+def landmarks_to_array(hand_landmarks, out=None):
+    """Convert a MediaPipe NormalizedLandmarkList into a (21, 3) float32 array."""
+    if isinstance(hand_landmarks, np.ndarray):
+        return hand_landmarks.astype(np.float32, copy=False)
+
+    if out is None:
+        out = np.empty((NUM_LANDMARKS, 3), dtype=np.float32)
+    out[:] = [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark]
+    return out
+
+
+def draw_landmark_array(frame, landmarks):
+    """Draw a (21, 3) landmark array in place on a BGR frame."""
+    height, width = frame.shape[:2]
+    points = (np.asarray(landmarks)[:, :2] * (width, height)).astype(int).tolist()
+    for start, end in HAND_CONNECTIONS:
+        cv2.line(frame, points[start], points[end], (224, 224, 224), 2)
+    for point in points:
+        cv2.circle(frame, point, 4, (0, 0, 255), -1)
+    return frame
+
+
+def finger_states(landmarks):
+    """Extended fingers (index, middle, ring, pinky) as a (..., 4) bool array."""
+    landmarks = np.asarray(landmarks)
+    return landmarks[..., FINGER_TIPS, 1] < landmarks[..., FINGER_PIPS, 1]
+
+
+def hand_positions(landmarks):
+    """Horizontal wrist position: -1 for left, 0 for center, 1 for right."""
+    wrist_x = np.asarray(landmarks)[..., WRIST, 0]
+    return (wrist_x > HAND_POSITION_RIGHT).astype(np.int8) - (wrist_x < HAND_POSITION_LEFT)
+
+
+def palm_size(landmarks):
+    """Wrist to middle finger MCP distance, the scale of the hand."""
+    landmarks = np.asarray(landmarks)
+    return np.linalg.norm(landmarks[..., MIDDLE_MCP, :2] - landmarks[..., WRIST, :2], axis=-1)
+
+
+def fingertip_distances(landmarks):
+    """Wrist to fingertip distances (..., 4), normalized by the palm size."""
+    landmarks = np.asarray(landmarks)
+    tips = landmarks[..., FINGER_TIPS, :2] - landmarks[..., WRIST, None, :2]
+    scale = np.maximum(palm_size(landmarks), 1e-6)
+    return np.linalg.norm(tips, axis=-1) / scale[..., None]
+
+
+def classify_landmarks(landmarks):
+    """
+    Rule-based gesture for a batch of hands (N, 21, 3).
+    Returns an (N,) object array of gesture names.
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+    states = finger_states(landmarks)
+    positions = hand_positions(landmarks)
+
+    # 👉 Pointer (index seul)
+    pointing = states[:, 0] & ~states[:, 1:].any(axis=1)
+    # ✋ Main ouverte (tous doigts)
+    open_hand = states.all(axis=1)
+
+    gestures = np.full(len(landmarks), GESTURE_UNKNOWN, dtype=object)
+    gestures[open_hand] = GESTURE_OPEN_HAND
+    gestures[pointing] = GESTURE_POINTING  # Main au centre
+    gestures[pointing & (positions < 0)] = GESTURE_POINT_LEFT
+    gestures[pointing & (positions > 0)] = GESTURE_POINT_RIGHT
+    return gestures
@@ -0,0 +1,101 @@
+"""
+Swipe gestures from the recent trajectory of the hand.
+
+The wrist and the four fingertips of every frame go into a fixed-size
+ring buffer. Each update looks at the last SWIPE_WINDOW seconds at once:
+the hand's displacement, its peak horizontal speed, how straight the
+motion was, and whether all five points moved together (a swipe moves
+the hand, not just a finger). The swipe fires on the frame where that
+profile is complete, without waiting for the hand to stop or to be
+held anywhere.
+"""
+import numpy as np
+from visionslide.config import *
+from visionslide.gestures.landmarks import WRIST, FINGER_TIPS
+
+GESTURE_SWIPE_LEFT = "swipe_left"
+GESTURE_SWIPE_RIGHT = "swipe_right"
+SWIPE_GESTURES = (GESTURE_SWIPE_LEFT, GESTURE_SWIPE_RIGHT)
+
+TRACKED_POINTS = np.concatenate(([WRIST], FINGER_TIPS))
+
+
+class SwipeDetector:
+    """Detects horizontal swipes in a stream of (21, 3) landmark arrays."""
+
+    def __init__(self, window=SWIPE_WINDOW, min_distance=SWIPE_MIN_DISTANCE,
+                 min_speed=SWIPE_MIN_SPEED, max_drift=SWIPE_MAX_DRIFT,
+                 consistency=SWIPE_CONSISTENCY, refractory=SWIPE_REFRACTORY,
+                 buffer_size=SWIPE_BUFFER_SIZE):
+        self.window = window
+        self.min_distance = min_distance
+        self.min_speed = min_speed
+        self.max_drift = max_drift
+        self.consistency = consistency
+        self.refractory = refractory
+
+        # Ring buffer of the tracked points, oldest first once unrolled
+        self._times = np.full(buffer_size, -np.inf)
+        self._points = np.zeros((buffer_size, len(TRACKED_POINTS), 2), dtype=np.float32)
+        self._index = 0
+        self._blocked_until = float('-inf')
+
+    def reset(self):
+        """Forget the trajectory, e.g. when the hand is lost."""
+        self._times[:] = -np.inf
+
+    def reset_state(self):
+        """Forget the trajectory and the refractory period, e.g. before another video."""
+        self.reset()
+        self._blocked_until = float('-inf')
+
+    def update(self, landmarks, timestamp):
+        """Add a frame; returns "swipe_left", "swipe_right" or None."""
+        if landmarks is None:
+            self.reset()
+            return None
+
+        index = self._index
+        self._times[index] = timestamp
+        self._points[index] = np.asarray(landmarks)[TRACKED_POINTS, :2]
+        self._index = (index + 1) % len(self._times)
+
+        if timestamp < self._blocked_until:
+            return None
+        swipe = self._classify(timestamp)
+        if swipe:
+            # Blocks both ways: the hand coming back must not read as a
+            # swipe the other way, nor the end of a long sweep as a second one
+            self._blocked_until = timestamp + self.refractory
+            self.reset()
+        return swipe
+
+    def _classify(self, timestamp):
+        order = np.roll(np.arange(len(self._times)), -self._index)
+        times = self._times[order]
+        recent = times > timestamp - self.window
+        if recent.sum() < 3:
+            return None
+        times = times[recent]
+        points = self._points[order][recent]          # (M, 5, 2)
+
+        moved = points[-1] - points[0]                # Per point displacement (5, 2)
+        dx, dy = moved.mean(axis=0)
+        if abs(dx) < self.min_distance or abs(dy) > self.max_drift * abs(dx):
+            return None
+
+        # Every tracked point went the same way, about as far
+        direction = np.sign(dx)
+        if (moved[:, 0] * direction < 0.5 * abs(dx)).any():
+            return None
+
+        centers = points.mean(axis=1)                 # (M, 2)
+        steps = np.diff(centers[:, 0])
+        speeds = steps / np.maximum(np.diff(times), 1e-3)
+        if (speeds * direction).max() < self.min_speed:
+            return None
+        # Straight: little back and forth along the way
+        if abs(steps.sum()) < self.consistency * np.abs(steps).sum():
+            return None
+
+        return GESTURE_SWIPE_RIGHT if direction > 0 else GESTURE_SWIPE_LEFT
@@ -0,0 +1,278 @@
+"""
+Append-only columnar store for per-frame gesture timelines.
+
+A store is a directory with one raw little-endian file per column plus a
+small meta.json holding the gesture/action vocabularies:
+
+    timestamp.bin   float64  (N,)
+    landmarks.bin   float32  (N, 21, 3)   NaN when no hand
+    handedness.bin  int8     (N,)         -1 none, 0 left, 1 right
+    score.bin       float32  (N,)         handedness confidence
+    gesture.bin     uint8    (N,)         index into meta["gestures"]
+    action.bin      uint8    (N,)         index into meta["actions"], 0 = none
+
+Columns are opened with np.memmap, so reading a session never copies it
+and the landmark column feeds GestureDetector.recognize_batch directly.
+
+A store holds one or more sessions, listed in meta["sessions"] by their
+first row: every writer that reopens a store starts a new one, and so
+does a timestamp lower than the previous one (monotonic clocks restart
+at boot, replays and batch runs at 0). Timestamps only increase within
+a session, so time queries search each session on its own.
+"""
+import json
+import os
+import numpy as np
+from visionslide.gestures.landmarks import NUM_LANDMARKS
+from visionslide.utils.logger import setup_logger
+
+FORMAT_VERSION = 1
+
+COLUMNS = {
+    'timestamp': (np.dtype('<f8'), ()),
+    'landmarks': (np.dtype('<f4'), (NUM_LANDMARKS, 3)),
+    'handedness': (np.dtype('i1'), ()),
+    'score': (np.dtype('<f4'), ()),
+    'gesture': (np.dtype('u1'), ()),
+    'action': (np.dtype('u1'), ()),
+}
+
+HANDEDNESS = {None: -1, "Left": 0, "Right": 1}
+NO_ACTION = "none"
+
+
+def _column_path(path, name):
+    return os.path.join(path, f"{name}.bin")
+
+
+def _meta_path(path):
+    return os.path.join(path, "meta.json")
+
+
+def _row_size(name):
+    dtype, shape = COLUMNS[name]
+    return dtype.itemsize * int(np.prod(shape))
+
+
+def _complete_rows(path):
+    """Rows present in every column (a writer may have stopped mid-append)."""
+    sizes = []
+    for name in COLUMNS:
+        column = _column_path(path, name)
+        sizes.append(os.path.getsize(column) // _row_size(name) if os.path.exists(column) else 0)
+    return min(sizes)
+
+
+class TimelineWriter:
+    """Buffers per-frame results and appends them to a store in chunks."""
+
+    def __init__(self, path, chunk_size=256):
+        self.logger = setup_logger('TimelineWriter')
+        self.path = path
+        self.chunk_size = chunk_size
+        os.makedirs(path, exist_ok=True)
+
+        meta = {'version': FORMAT_VERSION, 'gestures': ["no_hand"], 'actions': [NO_ACTION]}
+        if os.path.exists(_meta_path(path)):
+            with open(_meta_path(path)) as f:
+                meta = json.load(f)
+        self._gestures = list(meta['gestures'])
+        self._actions = list(meta['actions'])
+
+        # Drop the rows an interrupted writer left in some columns only,
+        # so every row appended now lines up with its timestamp
+        self.rows_written = _complete_rows(path)
+        for name in COLUMNS:
+            column = _column_path(path, name)
+            if os.path.exists(column):
+                os.truncate(column, self.rows_written * _row_size(name))
+        self._sessions = [row for row in meta.get('sessions', [0]) if row < self.rows_written] or [0]
+        if self.rows_written:
+            self._sessions.append(self.rows_written)  # This writer's frames are a new session
+        self._last_timestamp = float('-inf')
+        self._gesture_codes = {name: code for code, name in enumerate(self._gestures)}
+        self._action_codes = {name: code for code, name in enumerate(self._actions)}
+
+        self._chunk = {
+            name: np.empty((chunk_size,) + shape, dtype=dtype)
+            for name, (dtype, shape) in COLUMNS.items()
+        }
+        self._rows = 0
+        self._files = {name: open(_column_path(path, name), "ab") for name in COLUMNS}
+
+    def append(self, timestamp, landmarks=None, handedness=None, score=0.0,
+               gesture="no_hand", action=None):
+        """Add one frame. landmarks is a (21, 3) array or None."""
+        row = self._rows
+        if timestamp < self._last_timestamp:
+            # The clock went back: a new session, so time queries stay sorted
+            self._sessions.append(self.rows_written + row)
+        self._last_timestamp = timestamp
+        chunk = self._chunk
+        chunk['timestamp'][row] = timestamp
+        if landmarks is None:
+            chunk['landmarks'][row] = np.nan
+        else:
+            chunk['landmarks'][row] = landmarks
+        chunk['handedness'][row] = HANDEDNESS.get(handedness, -1)
+        chunk['score'][row] = score
+        chunk['gesture'][row] = self._code(self._gesture_codes, self._gestures, gesture or "no_hand")
+        chunk['action'][row] = self._code(self._action_codes, self._actions, action or NO_ACTION)
+
+        self._rows += 1
+        if self._rows == self.chunk_size:
+            self.flush()
+
+    def _code(self, codes, names, name):
+        code = codes.get(name)
+        if code is None:
+            if len(names) > 255:
+                raise ValueError(f"Too many distinct values to store '{name}'")
+            code = codes[name] = len(names)
+            names.append(name)
+        return code
+
+    def flush(self):
+        """Write the vocabularies and sessions, then the buffered rows, to disk."""
+        # Before the rows, so a reader never sees a code or a session start it
+        # cannot place; a temp file so it never sees half a file
+        meta = {'version': FORMAT_VERSION, 'gestures': self._gestures, 'actions': self._actions,
+                'sessions': self._sessions}
+        tmp_path = _meta_path(self.path) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, _meta_path(self.path))
+
+        if self._rows:
+            for name, f in self._files.items():
+                f.write(self._chunk[name][:self._rows].tobytes())
+                f.flush()
+            self.rows_written += self._rows
+            self._rows = 0
+
+    def close(self):
+        """Flush and close the column files."""
+        try:
+            self.flush()
+            for f in self._files.values():
+                f.close()
+            self.logger.info(f"Timeline closed: {self.rows_written} frames in {self.path}")
+        except Exception as e:
+            self.logger.error(f"Error closing timeline: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TimelineStore:
+    """Read-only, memory-mapped view of a timeline store."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(_meta_path(path)) as f:
+            meta = json.load(f)
+        if meta.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported timeline format {meta.get('version')} in {path}")
+        self.gesture_vocabulary = list(meta['gestures'])
+        self.action_vocabulary = list(meta['actions'])
+
+        # A writer may be mid-append: only expose rows complete in every column
+        self.length = _complete_rows(path)
+        starts = [row for row in meta.get('sessions', [0]) if 0 < row < self.length]
+        bounds = [0] + starts + [self.length]
+        # Row slice of every session, in which timestamps only increase
+        self.sessions = [slice(first, last) for first, last in zip(bounds, bounds[1:])]
+
+        for name, (dtype, shape) in COLUMNS.items():
+            if self.length:
+                column = np.memmap(_column_path(path, name), dtype=dtype, mode='r',
+                                   shape=(self.length,) + shape)
+            else:
+                column = np.empty((0,) + shape, dtype=dtype)
+            setattr(self, name, column)
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def hand_mask(self):
+        """True for frames where a hand was detected."""
+        return ~np.isnan(self.landmarks[:, 0, 0])
+
+    def time_range(self, start=None, end=None, session=None):
+        """
+        Row slice of the frames with start <= timestamp < end in one session.
+        session is an index into self.sessions; it may only be left out when
+        the store has a single session or no time bound is given.
+        """
+        if session is None:
+            if start is None and end is None:
+                return slice(0, self.length)
+            if len(self.sessions) > 1:
+                raise ValueError(f"{self.path} holds {len(self.sessions)} sessions, "
+                                 "pass the session to query by time")
+            session = 0
+        rows = self.sessions[session] if self.sessions else slice(0, 0)
+        timestamps = self.timestamp[rows]
+        first = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+        last = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side='left'))
+        return slice(rows.start + first, rows.start + last)
+
+    def select(self, start=None, end=None, session=None):
+        """Columns for a time range of one session, as memmap views (no copy)."""
+        rows = self.time_range(start, end, session)
+        return {name: getattr(self, name)[rows] for name in COLUMNS}
+
+    def gesture_code(self, gesture):
+        """Storage code of a gesture name, or None if it never occurs."""
+        try:
+            return self.gesture_vocabulary.index(gesture)
+        except ValueError:
+            return None
+
+    def frames_with_gesture(self, gesture, start=None, end=None):
+        """Row indices of the frames recognized as the given gesture, in every session."""
+        code = self.gesture_code(gesture)
+        if code is None:
+            return np.empty(0, dtype=np.intp)
+        found = [np.empty(0, dtype=np.intp)]
+        for session in range(len(self.sessions)):
+            rows = self.time_range(start, end, session)
+            found.append(np.flatnonzero(self.gesture[rows] == code) + rows.start)
+        return np.concatenate(found)
+
+    def frames_with_action(self, action):
+        """Row indices of the frames that emitted the given action."""
+        try:
+            code = self.action_vocabulary.index(action)
+        except ValueError:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(self.action == code)
+
+    def gesture_segments(self, gesture):
+        """(start_time, end_time) of every run of consecutive frames with a gesture."""
+        code = self.gesture_code(gesture)
+        if code is None or not self.length:
+            return np.empty((0, 2))
+        mask = self.gesture == code
+        # A run never spans two sessions
+        runs = mask.astype(np.int8)
+        first_rows = [rows.start for rows in self.sessions[1:]]
+        starts = np.flatnonzero(np.diff(np.concatenate(([0], runs))) == 1)
+        starts = np.union1d(starts, [row for row in first_rows if mask[row]]).astype(np.intp)
+        ends = np.flatnonzero(np.diff(np.concatenate((runs, [0]))) == -1)
+        ends = np.union1d(ends, [row - 1 for row in first_rows if mask[row - 1]]).astype(np.intp)
+        return np.column_stack((self.timestamp[starts], self.timestamp[ends]))
+
+    def decode_gestures(self, rows=slice(None)):
+        """Gesture names for the given rows."""
+        return np.asarray(self.gesture_vocabulary, dtype=object)[self.gesture[rows]]
+
+    def decode_actions(self, rows=slice(None)):
+        """Action names for the given rows (None when no action)."""
+        names = np.asarray(self.action_vocabulary, dtype=object)[self.action[rows]]
+        names[names == NO_ACTION] = None
+        return names
@@ -0,0 +1,162 @@
+"""
+Runtime auto-tuning of the detection cost.
+
+The tuner watches the measured latency of the pipeline and moves along
+a ladder of settings, from the best quality to the cheapest: MediaPipe
+model complexity, inference resolution and keyframe interval (frames
+that skip inference while the hand is steady). Every AUTOTUNE_INTERVAL
+seconds it compares the window's p95 capture-to-decision latency with
+the target, and the mean hand detection time with the frame budget of
+FPS_TARGET:
+
+- over budget: one step cheaper at once;
+- under AUTOTUNE_HEADROOM of the budget for AUTOTUNE_UP_WINDOWS windows
+  in a row: one step back toward quality.
+
+A level that had to be left waits twice as many windows before it is
+tried again (up to AUTOTUNE_MAX_BACKOFF times), so a machine on the
+edge between two levels does not oscillate between them.
+"""
+import time
+from visionslide.config import *
+from visionslide.pipeline.power_manager import IDLE
+from visionslide.utils.logger import setup_logger
+from visionslide.utils.metrics import get_metrics, HANDS_PROCESS, FRAME_TO_DECISION
+
+
+class AutoTuner:
+    """Steps detection settings up or down to hold a latency target."""
+
+    def __init__(self, gesture_detector, tracker=None, power_manager=None,
+                 target_latency=AUTOTUNE_TARGET_LATENCY, ladder=AUTOTUNE_LADDER,
+                 interval=AUTOTUNE_INTERVAL, registry=None):
+        self.logger = setup_logger('AutoTuner')
+        self.gesture_detector = gesture_detector
+        self.tracker = tracker
+        self.power_manager = power_manager
+        self.target_latency = target_latency
+        self.frame_budget = 1.0 / FPS_TARGET
+        self.ladder = [tuple(level) for level in ladder]
+        self.interval = interval
+        self.metrics = registry or get_metrics()
+
+        self.level = 0
+        self._applied = None
+        self._window_start = None
+        self._snapshots = None
+        self._good_windows = 0
+        self._backoff = [1] * len(self.ladder)  # Windows needed to step up to each level
+        self._warned_floor = False
+
+        # Statistics
+        self.changes = 0
+        self.last_latency = 0.0
+        self.last_detection = 0.0
+
+        if not self.metrics.enabled:
+            self.logger.warning("Metrics are disabled (METRICS_ENABLED), auto-tuning has no input")
+
+    def update(self, now=None):
+        """
+        Call once per frame from the detection thread (the detector may
+        only be reconfigured there). Returns True when the level changed.
+        """
+        now = time.monotonic() if now is None else now
+        if self._applied != self.level:
+            self._apply()
+
+        if self.power_manager and self.power_manager.state == IDLE:
+            # Idle settings and idle latency say nothing about the active load
+            self._window_start = None
+            return False
+        if self._window_start is None:
+            self._start_window(now)
+            return False
+        if now - self._window_start < self.interval:
+            return False
+
+        latency, detection, count = self._measure()
+        self._start_window(now)
+        if count < AUTOTUNE_MIN_SAMPLES:
+            return False
+        self.last_latency, self.last_detection = latency, detection
+        return self._decide(latency, detection)
+
+    def _start_window(self, now):
+        self._window_start = now
+        self._snapshots = {name: self.metrics.histogram(name).snapshot()
+                           for name in (FRAME_TO_DECISION, HANDS_PROCESS)}
+
+    def _measure(self):
+        """(p95 latency, mean detection time, frames) over the last window."""
+        latency = self.metrics.histogram(FRAME_TO_DECISION).snapshot().since(
+            self._snapshots[FRAME_TO_DECISION])
+        detection = self.metrics.histogram(HANDS_PROCESS).snapshot().since(
+            self._snapshots[HANDS_PROCESS])
+        return latency.percentile(0.95), detection.mean, latency.count
+
+    def _decide(self, latency, detection):
+        over = latency > self.target_latency or detection > self.frame_budget
+        under = (latency < AUTOTUNE_HEADROOM * self.target_latency and
+                 detection < AUTOTUNE_HEADROOM * self.frame_budget)
+
+        if over:
+            self._good_windows = 0
+            if self.level + 1 < len(self.ladder):
+                # This level could not hold the budget: retry it less eagerly
+                self._backoff[self.level] = min(self._backoff[self.level] * 2, AUTOTUNE_MAX_BACKOFF)
+                return self._step(self.level + 1, latency, detection, "over")
+            if not self._warned_floor:
+                self._warned_floor = True
+                self.logger.warning(f"p95 latency {latency * 1000:.0f} ms over budget at the "
+                                    f"cheapest level ({self.describe()})")
+            return False
+
+        if under and self.level > 0:
+            self._good_windows += 1
+            if self._good_windows >= AUTOTUNE_UP_WINDOWS * self._backoff[self.level - 1]:
+                self._good_windows = 0
+                return self._step(self.level - 1, latency, detection, "under")
+            return False
+
+        self._good_windows = 0
+        return False
+
+    def _step(self, level, latency, detection, reason):
+        previous = self.level
+        self.level = level
+        self._apply()
+        self.changes += 1
+        self.logger.info(
+            f"p95 latency {latency * 1000:.0f} ms, detection {detection * 1000:.0f} ms: {reason} "
+            f"budget ({self.target_latency * 1000:.0f} / {self.frame_budget * 1000:.0f} ms), "
+            f"level {previous} -> {level} ({self.describe(level)})"
+        )
+        return True
+
+    def _apply(self):
+        model_complexity, inference_scale, keyframe_interval = self.ladder[self.level]
+        if self.power_manager:
+            # Wake-up restores this complexity instead of MODEL_COMPLEXITY
+            self.power_manager.active_model_complexity = model_complexity
+        if not (self.power_manager and self.power_manager.state == IDLE):
+            self.gesture_detector.set_model_complexity(model_complexity)
+        self.gesture_detector.set_inference_scale(inference_scale)
+        if self.tracker:
+            self.tracker.keyframe_interval = keyframe_interval
+        self._applied = self.level
+
+    def describe(self, level=None):
+        model_complexity, inference_scale, keyframe_interval = self.ladder[
+            self.level if level is None else level]
+        return (f"model complexity {model_complexity}, scale {inference_scale:g}, "
+                f"keyframes 1/{keyframe_interval if self.tracker else 1}")
+
+    def get_stats(self):
+        return {
+            'level': self.level,
+            'settings': self.describe(),
+            'changes': self.changes,
+            'p95_latency': self.last_latency,
+            'mean_detection': self.last_detection,
+        }
@@ -0,0 +1,273 @@
+"""
+Offline gesture extraction from recorded videos (visionslide batch).
+
+Each video is split into chunks of consecutive frames that run on a pool
+of processes, each with its own GestureDetector, as fast as they decode:
+no real-time pacing and no window. A chunk starts BATCH_WARMUP seconds
+before its first frame so hand tracking, the landmark filter, the swipe
+trajectory and the gesture votes are warm when its frames are written;
+the warm-up frames themselves are dropped. Results go to one timeline
+store per video (landmarks, handedness, gestures and actions per frame),
+read back with TimelineStore or scored with gesture_eval.
+
+Usage: visionslide batch VIDEO [VIDEO ...] -o DIR [--workers N]
+"""
+import argparse
+import functools
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+from visionslide.config import *
+from visionslide.camera.frame_pool import FramePool
+from visionslide.camera.session_recorder import read_timestamps
+from visionslide.gestures.gesture_mapping import GestureMapper
+from visionslide.gestures.landmark_filter import LandmarkTracker
+from visionslide.gestures.landmarks import NUM_LANDMARKS
+from visionslide.gestures.timeline_store import TimelineWriter
+from visionslide.utils.logger import setup_logger
+
+# Chunks shorter than this many warm-up lengths would mostly redo warm-up frames
+MIN_CHUNK_WARMUPS = 4
+
+
+def default_detector_factory(gesture_model=GESTURE_MODEL):
+    from visionslide.gestures.gesture_detector import GestureDetector
+    return GestureDetector(gesture_model=gesture_model)
+
+
+_detector = None
+
+
+def _init_worker(detector_factory):
+    """Worker process: build the detector once, reset before every chunk it runs."""
+    global _detector
+    _detector = detector_factory()
+
+
+def _open_at(path, first_frame):
+    """
+    Capture positioned on first_frame. Seeking in compressed video can
+    land on a nearby keyframe instead; then decode from the start and
+    drop frames up to it, so chunks line up with their timestamps.
+    """
+    cap = cv2.VideoCapture(path)
+    if not first_frame:
+        return cap
+    cap.set(cv2.CAP_PROP_POS_FRAMES, first_frame)
+    if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == first_frame:
+        return cap
+
+    cap.release()
+    cap = cv2.VideoCapture(path)
+    for _ in range(first_frame):
+        if not cap.grab():
+            break
+    return cap
+
+
+def _process_chunk(path, first_frame, skip, timestamps):
+    """
+    Run detection, recognition and mapping on frames first_frame.. of a
+    video; the first `skip` of them only warm the state up.
+    """
+    detector = _detector
+    # The worker's previous chunk may come later in the video, or from another one
+    reset_state = getattr(detector, 'reset_state', None)
+    if reset_state:
+        reset_state()
+    mapper = GestureMapper()
+    tracker = LandmarkTracker() if LANDMARK_FILTER else None
+    rows = len(timestamps) - skip
+    landmarks = np.full((rows, NUM_LANDMARKS, 3), np.nan, dtype=np.float32)
+    handedness = [None] * rows
+    scores = np.zeros(rows, dtype=np.float32)
+    gestures = ["no_hand"] * rows
+    actions = [None] * rows
+
+    start, cpu_start = time.perf_counter(), time.process_time()
+    cap = _open_at(path, first_frame)
+    pool = FramePool()
+    frames = 0
+    for index, timestamp in enumerate(timestamps.tolist()):
+        ret, frame = pool.read(cap)
+        if not ret:
+            break
+        frames += 1
+        hand_landmarks = detector.detect_landmarks(frame)
+        landmark_array = detector.get_landmark_array(hand_landmarks)
+        if tracker:
+            landmark_array = tracker.update(landmark_array, timestamp)
+        hand = detector.last_handedness if hand_landmarks is not None else (None, 0.0)
+        gesture = detector.recognize_gesture(landmark_array, timestamp)
+        action = mapper.update_gesture(gesture, landmark_array, detector, timestamp,
+                                       confidence=hand[1] or 1.0)
+
+        row = index - skip
+        if row >= 0:
+            if landmark_array is not None:
+                landmarks[row] = landmark_array
+            handedness[row], scores[row] = hand
+            gestures[row] = gesture
+            actions[row] = action
+        pool.release(frame)
+    cap.release()
+
+    written = max(frames - skip, 0)
+    return {
+        'timestamps': timestamps[skip:skip + written],
+        'landmarks': landmarks[:written],
+        'handedness': handedness[:written],
+        'scores': scores[:written],
+        'gestures': gestures[:written],
+        'actions': actions[:written],
+        'frames': frames,                            # Warm-up frames included
+        'seconds': time.perf_counter() - start,
+        'cpu': time.process_time() - cpu_start,
+    }
+
+
+def video_timestamps(path):
+    """Timestamp of every frame: the recording sidecar, or the nominal frame rate."""
+    timestamps = read_timestamps(path)
+    if timestamps is not None:
+        return timestamps
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            return None
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        return np.arange(int(cap.get(cv2.CAP_PROP_FRAME_COUNT))) / fps
+    finally:
+        cap.release()
+
+
+class BatchProcessor:
+    """Splits videos into chunks and extracts their timelines on a process pool."""
+
+    def __init__(self, workers=BATCH_WORKERS, detector_factory=default_detector_factory,
+                 chunk_seconds=BATCH_CHUNK_SECONDS, warmup=BATCH_WARMUP):
+        self.logger = setup_logger('BatchProcessor')
+        self.workers = workers or os.cpu_count() or 1
+        self.detector_factory = detector_factory
+        self.chunk_seconds = chunk_seconds
+        self.warmup = warmup
+
+    def plan(self, timestamps):
+        """(first frame incl. warm-up, first written frame, end) of each chunk."""
+        count = len(timestamps)
+        if not count:
+            return []
+        duration = float(timestamps[-1] - timestamps[0])
+        fps = (count - 1) / duration if duration > 0 else 30.0
+        # At least one chunk per worker, but not much shorter than the warm-up
+        size = min(math.ceil(self.chunk_seconds * fps), math.ceil(count / self.workers))
+        size = max(size, math.ceil(MIN_CHUNK_WARMUPS * self.warmup * fps), 1)
+
+        chunks = []
+        for start in range(0, count, size):
+            first = int(np.searchsorted(timestamps, timestamps[start] - self.warmup, side='left'))
+            chunks.append((first, start, min(start + size, count)))
+        return chunks
+
+    def run(self, videos, output_dir):
+        """Process every video into output_dir/<name>; returns a throughput report."""
+        jobs = []
+        for path in videos:
+            timestamps = video_timestamps(path)
+            if timestamps is None or not len(timestamps):
+                self.logger.error(f"Could not read {path}, skipped")
+                continue
+            store = os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0])
+            if os.path.exists(store):
+                self.logger.error(f"{store} already exists, skipped {path}")
+                continue
+            jobs.append((path, store, timestamps, self.plan(timestamps)))
+
+        chunks = sum(len(plan) for _, _, _, plan in jobs)
+        workers = max(1, min(self.workers, chunks))
+        self.logger.info(f"{len(jobs)} videos, {chunks} chunks on {workers} processes")
+
+        written = processed = 0
+        cpu = 0.0
+        start = time.perf_counter()
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker,
+                                 initargs=(self.detector_factory,)) as executor:
+            submitted = [
+                (store, [executor.submit(_process_chunk, path, first, begin - first,
+                                         timestamps[first:end])
+                         for first, begin, end in plan])
+                for path, store, timestamps, plan in jobs
+            ]
+            # Chunks finish in any order, each store is written in frame order
+            for store, futures in submitted:
+                with TimelineWriter(store) as writer:
+                    for future in futures:
+                        result = future.result()
+                        self._write(writer, result)
+                        written += len(result['timestamps'])
+                        processed += result['frames']
+                        cpu += result['cpu']
+        wall = time.perf_counter() - start
+
+        return {
+            'videos': len(jobs),
+            'chunks': chunks,
+            'workers': workers,
+            'frames': written,
+            'processed': processed,  # Warm-up frames included
+            'seconds': wall,
+            'fps': written / wall if wall else 0.0,
+            'fps_per_core': processed / cpu if cpu else 0.0,
+            # CPU time of the chunks over the wall time: how many cores were kept
+            # busy, not a speedup (bench_batch.py measures that against one process)
+            'cores_busy': cpu / wall if wall else 0.0,
+        }
+
+    @staticmethod
+    def _write(writer, result):
+        for row in range(len(result['timestamps'])):
+            writer.append(result['timestamps'][row], result['landmarks'][row],
+                          result['handedness'][row], float(result['scores'][row]),
+                          result['gestures'][row], result['actions'][row])
+
+
+def main(argv=None):
+    """visionslide batch: gesture timelines of recorded videos."""
+    parser = argparse.ArgumentParser(
+        prog="visionslide batch",
+        description="Extract landmark, gesture and action timelines from video files, "
+                    "in parallel and without a window."
+    )
+    parser.add_argument("videos", nargs="+", metavar="VIDEO")
+    parser.add_argument("-o", "--output", required=True, metavar="DIR",
+                        help="one timeline store per video is written to DIR/<video name>")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS,
+                        help="detector processes (default: one per CPU core)")
+    parser.add_argument("--chunk-seconds", type=float, default=BATCH_CHUNK_SECONDS,
+                        help=f"longest piece of video one process handles (default {BATCH_CHUNK_SECONDS:g})")
+    parser.add_argument("--gesture-model", metavar="MODEL", default=GESTURE_MODEL,
+                        help="classify hand poses with a trained model (visionslide train)")
+    args = parser.parse_args(argv)
+
+    processor = BatchProcessor(
+        workers=args.workers, chunk_seconds=args.chunk_seconds,
+        detector_factory=functools.partial(default_detector_factory, args.gesture_model)
+    )
+    os.makedirs(args.output, exist_ok=True)
+    report = processor.run(args.videos, args.output)
+
+    print(f"{report['frames']} frames from {report['videos']} videos in {report['seconds']:.1f}s "
+          f"({report['chunks']} chunks, {report['workers']} processes)")
+    print(f"  {report['fps']:.1f} FPS overall, {report['fps_per_core']:.1f} FPS per core, "
+          f"{report['cores_busy']:.2f} cores busy")
+    return report
+
+
+if __name__ == "__main__":
+    main()
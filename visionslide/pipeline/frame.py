@@ -0,0 +1,50 @@
+"""
+Per-frame record passed between the pipeline stages.
+"""
+
+
+class Frame:
+    """
+    One camera frame and everything the pipeline learns about it.
+    __slots__ keeps it to a few pointers instead of a dict per frame.
+
+    t_capture and the t_* stage times are monotonic seconds: when the
+    frame was grabbed, and when detection, the gesture decision and
+    rendering finished with it (None until then). timestamp is the scene
+    time (capture time for a camera, recorded time for a replay).
+    """
+
+    __slots__ = (
+        'seq', 't_capture', 'timestamp', 'image', 'slot', 'pool',
+        'landmarks', 'landmark_array', 'handedness', 'gesture', 'action', 'error',
+        't_detect', 't_decide', 't_render',
+    )
+
+    def __init__(self, seq, t_capture, timestamp, image, slot=None, pool=None):
+        self.seq = seq
+        self.t_capture = t_capture
+        self.timestamp = timestamp
+        self.image = image
+        self.slot = slot           # FrameRing slot holding the image, if shared
+        self.pool = pool           # FramePool the image is borrowed from, if any
+        self.landmarks = None
+        self.landmark_array = None
+        self.handedness = (None, 0.0)
+        self.gesture = "no_hand"
+        self.action = None
+        self.error = None
+        self.t_detect = None
+        self.t_decide = None
+        self.t_render = None
+
+    def stage_latencies(self):
+        """Seconds from capture to the end of each stage reached so far."""
+        return {
+            stage: t - self.t_capture
+            for stage, t in (('detect', self.t_detect), ('decide', self.t_decide),
+                             ('render', self.t_render))
+            if t is not None
+        }
+
+    def __repr__(self):
+        return f"Frame(seq={self.seq}, gesture={self.gesture!r}, action={self.action!r})"
@@ -0,0 +1,100 @@
+"""
+Ring of preallocated frame slots in shared memory.
+
+A captured frame is copied once into a free slot. From then on the
+detector process, the preview and the recorder all read that slot as a
+NumPy view: nothing is pickled and nothing is copied again. Each reader
+retains the slot while it uses it and releases it when done; a slot is
+handed out again once nobody holds it.
+"""
+import threading
+from multiprocessing import shared_memory
+import numpy as np
+from visionslide.utils.logger import setup_logger
+
+
+class FrameRing:
+    """Fixed-size frames in one shared memory block, with reference counts."""
+
+    def __init__(self, slots, shape, dtype=np.uint8, name=None):
+        self.logger = setup_logger('FrameRing')
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = name is None
+
+        size = slots * int(np.prod(self.shape)) * self.dtype.itemsize
+        if self.owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            # Workers are our children and share our resource tracker,
+            # so attaching does not make them unlink the block on exit
+            self._shm = shared_memory.SharedMemory(name=name)
+        self.name = self._shm.name
+        self._frames = np.ndarray((slots,) + self.shape, dtype=self.dtype, buffer=self._shm.buf)
+
+        # Reference counts live in the owning process only
+        self._refs = [0] * slots
+        self._next = 0
+        self._lock = threading.Lock()
+        self.exhausted = 0
+
+    @classmethod
+    def attach(cls, name, slots, shape, dtype=np.uint8):
+        """Open a ring created by another process."""
+        return cls(slots, shape, dtype, name=name)
+
+    def acquire(self):
+        """Reserve a free slot (reference count 1), or None if all are in use."""
+        with self._lock:
+            for offset in range(self.slots):
+                slot = (self._next + offset) % self.slots
+                if not self._refs[slot]:
+                    self._refs[slot] = 1
+                    self._next = (slot + 1) % self.slots
+                    return slot
+            self.exhausted += 1
+            return None
+
+    def put(self, frame):
+        """Copy a frame into a free slot; returns the slot or None."""
+        if frame.shape != self.shape:
+            return None
+        slot = self.acquire()
+        if slot is not None:
+            np.copyto(self._frames[slot], frame)
+        return slot
+
+    def retain(self, slot):
+        """Add a reader to a slot."""
+        with self._lock:
+            self._refs[slot] += 1
+
+    def release(self, slot):
+        """Drop a reader; the slot is free again when the last one is gone."""
+        with self._lock:
+            if self._refs[slot] > 0:
+                self._refs[slot] -= 1
+
+    def array(self, slot):
+        """The frame in a slot, as a view into shared memory."""
+        return self._frames[slot]
+
+    def in_use(self):
+        with self._lock:
+            return sum(1 for refs in self._refs if refs)
+
+    def close(self):
+        """Unmap the block, and free it if this process created it."""
+        self._frames = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # A view is still referenced somewhere; the mapping goes with it
+            self.logger.warning("Frame ring closed while a frame view is still in use")
+        if self.owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
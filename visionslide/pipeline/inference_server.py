@@ -0,0 +1,491 @@
+"""
+Multi-camera inference server.
+
+Several frame sources share one pool of detector worker processes:
+
+    source 1 --capture--> latest frame --+
+    source 2 --capture--> latest frame --+--> scheduler --> worker 1..N
+    ...                                  |        ^            |
+                                         +--------+--results---+
+                                                  |
+                                   per-session GestureMapper -> controller
+
+Each session keeps only its newest frame and has at most one frame in
+flight, and the scheduler serves ready sessions round-robin, so a busy
+pool slows every stream down evenly instead of starving some. Workers
+keep one persistent GestureDetector (MediaPipe graph) per session so
+hand tracking stays continuous; a session goes back to the worker that
+served it last whenever that worker is free.
+"""
+import argparse
+import collections
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from visionslide.config import *
+from visionslide.controls.action_dispatcher import ActionDispatcher
+from visionslide.gestures.gesture_mapping import GestureMapper
+from visionslide.gestures.swipe_detector import SwipeDetector
+from visionslide.utils.logger import setup_logger
+from visionslide.utils.metrics import get_metrics, LatencyHistogram, FRAME_TO_DECISION, HANDS_PROCESS
+
+
+def default_detector_factory():
+    from visionslide.gestures.gesture_detector import GestureDetector
+    return GestureDetector()
+
+
+def _worker_main(worker_id, tasks, results, detector_factory, max_graphs):
+    """Worker process: run detection for whichever session it is handed."""
+    logger = setup_logger(f'InferenceWorker-{worker_id}')
+    detectors = collections.OrderedDict()  # session -> detector, least recently used first
+    results.put(("ready", worker_id))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        session, seq, frame = task
+
+        try:
+            detector = detectors.get(session)
+            if detector is None:
+                if len(detectors) >= max_graphs:
+                    _, evicted = detectors.popitem(last=False)
+                    evicted.release()
+                detector = detectors[session] = detector_factory()
+            detectors.move_to_end(session)
+
+            start = time.perf_counter()
+            hand_landmarks = detector.detect_landmarks(frame)
+            inference_time = time.perf_counter() - start
+            landmarks = detector.get_landmark_array(hand_landmarks)
+            if landmarks is not None:
+                landmarks = landmarks.copy()
+                gesture = detector.recognize_gesture(landmarks)
+                handedness = detector.last_handedness
+            else:
+                gesture, handedness = "no_hand", (None, 0.0)
+            results.put((worker_id, session, seq, landmarks, gesture, handedness, inference_time))
+        except Exception as e:
+            logger.error(f"Error processing frame of session {session}: {e}")
+            results.put((worker_id, session, seq, None, "error", (None, 0.0), 0.0))
+
+    for detector in detectors.values():
+        detector.release()
+
+
+class StreamSession:
+    """One frame source with its own gesture mapper and controller."""
+
+    def __init__(self, index, name, source, dispatcher):
+        self.index = index
+        self.name = name
+        self.source = source
+        self.pool = getattr(source, 'frame_pool', None)  # Buffers handed back once processed
+        self.mapper = GestureMapper()
+        # Here rather than in the workers: a stream's frames may go to any of them
+        self.swipes = SwipeDetector() if SWIPE_GESTURES else None
+        self.dispatcher = dispatcher
+
+        # Latest-frame slot filled by the capture thread
+        self.frame = None
+        self.seq = 0
+        self.t_capture = 0.0
+        self.timestamp = 0.0
+        self.in_flight = None    # (seq, t_capture, timestamp, frame) of the frame being processed
+        self.last_worker = None
+        self.ended = False
+
+        self.captured = 0
+        self.processed = 0
+        self.dropped = 0
+        self.actions = 0
+        self.last_gesture = "no_hand"
+        self.latency = LatencyHistogram()  # Capture until result
+        self._fps_mark = (time.monotonic(), 0)
+
+
+class _Worker:
+    def __init__(self, worker_id, process, tasks):
+        self.worker_id = worker_id
+        self.process = process
+        self.tasks = tasks
+        self.session = None  # Session being processed, None when idle
+        self.frames = 0
+
+
+class InferenceServer:
+    """Schedules frames of several sources fairly onto a detector process pool."""
+
+    def __init__(self, sources, workers=SERVER_WORKERS, detector_factory=default_detector_factory,
+                 graphs_per_worker=SERVER_GRAPHS_PER_WORKER):
+        """sources: list of (name, frame source, controller or None)."""
+        self.logger = setup_logger('InferenceServer')
+        self.metrics = get_metrics()
+        self.num_workers = workers or os.cpu_count() or 1
+        self.detector_factory = detector_factory
+        self.graphs_per_worker = graphs_per_worker
+
+        # One dispatcher per controller, shared by the sessions that use it
+        dispatchers = {}
+        self.sessions = []
+        for index, (name, source, controller) in enumerate(sources):
+            dispatcher = None
+            if controller is not None:
+                dispatcher = dispatchers.get(id(controller))
+                if dispatcher is None:
+                    dispatcher = dispatchers[id(controller)] = ActionDispatcher(controller)
+            self.sessions.append(StreamSession(index, name, source, dispatcher))
+        self.dispatchers = list(dispatchers.values())
+
+        self._context = multiprocessing.get_context("spawn")
+        self._results = self._context.Queue()
+        self._workers = []
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._capture_threads = []
+        self._scheduler = None
+        self._collector = None
+        self._next_session = 0
+        self.started = None
+        self.stopped = None
+
+    # ---- Lifecycle -------------------------------------------------------
+
+    def start(self):
+        """Start the workers, the capture threads and the scheduler."""
+        for worker_id in range(self.num_workers):
+            self._workers.append(self._spawn_worker(worker_id))
+        self._wait_ready()
+        for dispatcher in self.dispatchers:
+            dispatcher.start()
+
+        self.started = time.monotonic()
+        for session in self.sessions:
+            session._fps_mark = (self.started, 0)
+            thread = threading.Thread(target=self._capture_loop, args=(session,),
+                                      name=f'Capture-{session.name}', daemon=True)
+            thread.start()
+            self._capture_threads.append(thread)
+        self._collector = threading.Thread(target=self._collect_loop, name='Results', daemon=True)
+        self._collector.start()
+        self._scheduler = threading.Thread(target=self._schedule_loop, name='Scheduler', daemon=True)
+        self._scheduler.start()
+        self.logger.info(f"Serving {len(self.sessions)} streams with {self.num_workers} workers")
+        return self
+
+    def _spawn_worker(self, worker_id):
+        tasks = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main, name=f'InferenceWorker-{worker_id}',
+            args=(worker_id, tasks, self._results, self.detector_factory, self.graphs_per_worker),
+            daemon=True
+        )
+        process.start()
+        return _Worker(worker_id, process, tasks)
+
+    def _wait_ready(self, timeout=SERVER_START_TIMEOUT):
+        """Wait for the workers to import their libraries, so no early frame is dropped."""
+        pending = {worker.worker_id for worker in self._workers}
+        deadline = time.monotonic() + timeout
+        while pending:
+            try:
+                message = self._results.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                self.logger.warning(f"Workers {sorted(pending)} not ready after {timeout:.0f}s, starting anyway")
+                return
+            if message[0] == "ready":
+                pending.discard(message[1])
+
+    def run(self, stats_interval=SERVER_STATS_INTERVAL):
+        """Serve until every source has ended or stop() is called."""
+        self.start()
+        next_stats = time.monotonic() + stats_interval
+        try:
+            while not self._stop_event.wait(0.2):
+                with self._cond:
+                    done = all(session.ended and session.frame is None and session.in_flight is None
+                               for session in self.sessions)
+                if done:
+                    break
+                if time.monotonic() >= next_stats:
+                    self.log_stats()
+                    next_stats += stats_interval
+        finally:
+            self.stop()
+            self.log_stats()
+
+    def stop(self):
+        """Stop capture and scheduling, then the workers and the dispatchers."""
+        if self._stop_event.is_set():
+            return
+        self._stop_event.set()
+        self.stopped = time.monotonic()
+        with self._cond:
+            self._cond.notify_all()
+
+        for session in self.sessions:
+            session.source.release()
+        for worker in self._workers:
+            worker.tasks.put(None)
+        for worker in self._workers:
+            worker.process.join(timeout=5.0)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        for thread in [self._scheduler, self._collector] + self._capture_threads:
+            if thread:
+                thread.join(timeout=2.0)
+        for dispatcher in self.dispatchers:
+            dispatcher.close()
+
+    # ---- Capture ---------------------------------------------------------
+
+    def _capture_loop(self, session):
+        """Keep the newest frame of one source in its session slot."""
+        source = session.source
+        while not self._stop_event.is_set():
+            frame = source.read_frame()
+            if frame is None:
+                if source.is_running():
+                    continue
+                break
+
+            t_capture = getattr(source, 'last_capture_time', None) or time.monotonic()
+            timestamp = getattr(source, 'last_frame_time', None)
+            with self._cond:
+                if session.frame is not None:
+                    session.dropped += 1  # Never scheduled: the pool was busy
+                    if session.pool:
+                        session.pool.release(session.frame)
+                session.frame = frame
+                session.seq += 1
+                session.t_capture = t_capture
+                session.timestamp = t_capture if timestamp is None else timestamp
+                session.captured += 1
+                self._cond.notify_all()
+
+        with self._cond:
+            session.ended = True
+            self._cond.notify_all()
+        self.logger.info(f"Stream '{session.name}' ended")
+
+    # ---- Scheduling ------------------------------------------------------
+
+    def _schedule_loop(self):
+        while not self._stop_event.is_set():
+            with self._cond:
+                self._cond.wait_for(lambda: self._stop_event.is_set() or self._assignable(), timeout=0.5)
+                if self._stop_event.is_set():
+                    break
+                assignments = self._assign()
+
+            for worker, session, task in assignments:
+                worker.tasks.put(task)
+            self._check_workers()
+
+    def _ready(self, session):
+        return session.frame is not None and session.in_flight is None
+
+    def _assignable(self):
+        return (any(worker.session is None for worker in self._workers) and
+                any(self._ready(session) for session in self.sessions))
+
+    def _assign(self):
+        """Hand ready sessions to idle workers, round-robin over sessions."""
+        assignments = []
+        count = len(self.sessions)
+        for offset in range(count):
+            idle = [worker for worker in self._workers if worker.session is None]
+            if not idle:
+                break
+            session = self.sessions[(self._next_session + offset) % count]
+            if not self._ready(session):
+                continue
+
+            # Back to the worker that has this session's graph, if it is free
+            worker = next((w for w in idle if w.worker_id == session.last_worker), idle[0])
+            worker.session = session
+            session.last_worker = worker.worker_id
+            session.in_flight = (session.seq, session.t_capture, session.timestamp, session.frame)
+            assignments.append((worker, session, (session.index, session.seq, session.frame)))
+            session.frame = None
+            # The next round starts after the last session served
+            next_session = (session.index + 1) % count
+        if assignments:
+            self._next_session = next_session
+        return assignments
+
+    def _check_workers(self):
+        """Restart a worker process that died, releasing its session."""
+        for index, worker in enumerate(self._workers):
+            if worker.process.is_alive() or self._stop_event.is_set():
+                continue
+            self.logger.error(f"Worker {worker.worker_id} died (exit code {worker.process.exitcode}), restarting")
+            with self._cond:
+                session = worker.session
+                if session is not None and session.in_flight is not None:
+                    # Its result never comes: give the frame back to the camera
+                    if session.pool:
+                        session.pool.release(session.in_flight[3])
+                    session.in_flight = None
+                self._workers[index] = self._spawn_worker(worker.worker_id)
+                self._cond.notify_all()
+
+    # ---- Results ---------------------------------------------------------
+
+    def _collect_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                result = self._results.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if result[0] != "ready":  # A restarted worker announcing itself
+                self._handle_result(*result)
+
+    def _handle_result(self, worker_id, session_index, seq, landmarks, gesture, handedness, inference_time):
+        now = time.monotonic()
+        session = self.sessions[session_index]
+        with self._cond:
+            worker = self._workers[worker_id]
+            worker.session = None
+            worker.frames += 1
+            in_flight, session.in_flight = session.in_flight, None
+            self._cond.notify_all()
+        if in_flight is None or in_flight[0] != seq:
+            return  # Result of a worker that was restarted meanwhile
+
+        _, t_capture, timestamp, frame = in_flight
+        if session.pool:
+            # The task queue pickled the frame before the worker could answer
+            session.pool.release(frame)
+        session.processed += 1
+        if session.swipes:
+            gesture = session.swipes.update(landmarks, timestamp) or gesture
+        session.last_gesture = gesture
+        session.latency.record(now - t_capture)
+        self.metrics.record(FRAME_TO_DECISION, now - t_capture)
+        self.metrics.record(HANDS_PROCESS, inference_time)
+
+        action = session.mapper.update_gesture(gesture, landmarks, None, timestamp,
+                                               confidence=handedness[1] or 1.0)
+        if action and action != "exit" and session.dispatcher:
+            session.actions += 1
+            session.dispatcher.submit(action, t_capture)
+
+    # ---- Statistics ------------------------------------------------------
+
+    def get_stats(self):
+        """Per-stream FPS, drops and capture-to-result latency; per-worker frame counts."""
+        now = time.monotonic()
+        streams = {}
+        with self._cond:
+            for session in self.sessions:
+                mark_time, mark_count = session._fps_mark
+                elapsed = now - mark_time
+                fps = (session.processed - mark_count) / elapsed if elapsed > 0 else 0.0
+                session._fps_mark = (now, session.processed)
+                latency = session.latency.snapshot()
+                streams[session.name] = {
+                    'fps': fps,
+                    'captured': session.captured,
+                    'processed': session.processed,
+                    'dropped': session.dropped,
+                    'actions': session.actions,
+                    'gesture': session.last_gesture,
+                    'latency_p50': latency.percentile(0.5),
+                    'latency_p95': latency.percentile(0.95),
+                }
+            workers = {worker.worker_id: worker.frames for worker in self._workers}
+
+        elapsed = (self.stopped or now) - self.started if self.started else 0.0
+        total = sum(stream['processed'] for stream in streams.values())
+        return {
+            'streams': streams,
+            'workers': workers,
+            'throughput': total / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def log_stats(self):
+        stats = self.get_stats()
+        for name, stream in stats['streams'].items():
+            self.logger.info(
+                f"{name}: {stream['fps']:.1f} FPS, latency p50 {stream['latency_p50'] * 1000:.0f} ms "
+                f"p95 {stream['latency_p95'] * 1000:.0f} ms, {stream['dropped']} dropped, "
+                f"{stream['actions']} actions"
+            )
+        self.logger.info(f"Total {stats['throughput']:.1f} frames/s on {self.num_workers} workers")
+
+
+def open_source(spec):
+    """
+    Build a frame source from a command line spec:
+    a camera index ("0"), a raw BGR pipe ("pipe:PATH:WIDTHxHEIGHT", PATH "-"
+    for stdin) or a recorded video file (replayed in real time).
+    """
+    if spec.isdigit():
+        from visionslide.camera.camera_stream import CameraStream
+        return CameraStream(int(spec))
+    if spec.startswith("pipe:"):
+        from visionslide.camera.pipe_stream import PipeStream
+        path, _, size = spec[len("pipe:"):].rpartition(":")
+        width, height = (int(value) for value in size.lower().split("x"))
+        return PipeStream(path, width, height)
+    from visionslide.camera.replay_stream import ReplayStream
+    return ReplayStream(spec, realtime=True)
+
+
+def main(argv=None):
+    """visionslide serve: one process watching several cameras."""
+    parser = argparse.ArgumentParser(
+        prog="visionslide serve",
+        description="Recognize gestures on several frame sources with a shared worker pool."
+    )
+    parser.add_argument(
+        "sources", nargs="+", metavar="SOURCE[@HOST[:PORT]]",
+        help="camera index, pipe:PATH:WxH or video file; @HOST sends its actions "
+             "to a visionslide-receiver, otherwise keys are pressed locally"
+    )
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS,
+                        help="detector processes (default: one per CPU core)")
+    parser.add_argument("--stats-interval", type=float, default=SERVER_STATS_INTERVAL,
+                        help="seconds between per-stream FPS/latency log lines")
+    args = parser.parse_args(argv)
+
+    local_controller = None
+    sources = []
+    for index, spec in enumerate(args.sources):
+        source_spec, _, remote = spec.partition("@")
+        source = open_source(source_spec)
+        if not source.initialize():
+            print(f"❌ Could not open source {source_spec}")
+            continue
+
+        if remote:
+            from visionslide.controls.remote_controller import RemoteController
+            host, _, port = remote.partition(":")
+            controller = RemoteController(host, int(port or REMOTE_PORT))
+        else:
+            if local_controller is None:
+                from visionslide.controls.ppt_controller import PPTController
+                local_controller = PPTController()
+            controller = local_controller
+        controller.connect()
+        sources.append((f"stream{index}:{source_spec}", source, controller))
+
+    if not sources:
+        print("❌ No frame source could be opened")
+        return
+
+    server = InferenceServer(sources, workers=args.workers)
+    try:
+        server.run(stats_interval=args.stats_interval)
+    except KeyboardInterrupt:
+        print("\nServer interrupted by user")
+    finally:
+        server.stop()
+        for _, _, controller in sources:
+            if hasattr(controller, 'release'):
+                controller.release()
@@ -0,0 +1,127 @@
+"""
+Cached HUD overlay for the preview window.
+
+Each HUD element (FPS, gesture, action, ...) is a line of text that is
+rasterized only when its value changes, into a small patch with an
+alpha mask. The visible patches are merged into one layer covering
+their bounding box, stored premultiplied by its alpha, so every frame
+costs one multiply and one add on that box (8-bit OpenCV arithmetic),
+whatever the number of elements.
+"""
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+class _Element:
+    """One line of HUD text and its cached patch."""
+
+    __slots__ = ('origin', 'color', 'scale', 'thickness', 'text', 'patch', 'alpha', 'box')
+
+    def __init__(self, origin, color, scale, thickness):
+        self.origin = origin
+        self.color = color
+        self.scale = scale
+        self.thickness = thickness
+        self.text = None
+        self.patch = None
+        self.alpha = None
+        self.box = None  # (x0, y0, x1, y1) in frame coordinates
+
+    def rasterize(self):
+        """Draw the text once, antialiased, into a patch and its alpha mask."""
+        (width, height), baseline = cv2.getTextSize(self.text, FONT, self.scale, self.thickness)
+        pad = self.thickness + 1
+        x, y = self.origin
+        x0, y0 = x - pad, y - height - pad
+        x1, y1 = x + width + pad, y + baseline + pad
+
+        alpha = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        cv2.putText(alpha, self.text, (pad, height + pad), FONT, self.scale, 255,
+                    self.thickness, cv2.LINE_AA)
+        patch = np.empty(alpha.shape + (3,), dtype=np.uint8)
+        patch[:] = self.color
+        self.patch, self.alpha, self.box = patch, alpha, (x0, y0, x1, y1)
+
+
+class Overlay:
+    """Named text elements composited onto frames from a cached layer."""
+
+    def __init__(self):
+        self._elements = {}
+        self._layer = None    # (x0, y0, premultiplied BGR, 255 - alpha) or None if empty
+        self._dirty = False
+
+        # Statistics
+        self.rasterized = 0   # Element patches drawn (value changes)
+        self.rebuilt = 0      # Layer rebuilds
+        self.composited = 0   # Frames drawn on
+
+    def add(self, name, origin, color, scale=0.7, thickness=2):
+        """Declare an element; hidden until set() gives it a text."""
+        self._elements[name] = _Element(origin, color, scale, thickness)
+
+    def set(self, name, text):
+        """Update an element's text (None hides it). Unchanged text costs nothing."""
+        element = self._elements[name]
+        if text == element.text:
+            return
+        element.text = text
+        if text is not None:
+            element.rasterize()
+            self.rasterized += 1
+        self._dirty = True
+
+    def draw(self, frame):
+        """Blend the HUD onto a BGR frame in place."""
+        if self._dirty:
+            self._rebuild()
+        if self._layer is None:
+            return frame
+
+        x0, y0, patch, inverse = self._layer
+        height, width = frame.shape[:2]
+        # Clip to the frame (small preview sizes)
+        fx0, fy0 = max(x0, 0), max(y0, 0)
+        fx1, fy1 = min(x0 + patch.shape[1], width), min(y0 + patch.shape[0], height)
+        if fx0 < fx1 and fy0 < fy1:
+            region = (slice(fy0 - y0, fy1 - y0), slice(fx0 - x0, fx1 - x0))
+            roi = frame[fy0:fy1, fx0:fx1]
+            # frame = frame * (1 - alpha) + color * alpha
+            cv2.multiply(roi, inverse[region], dst=roi, scale=1 / 255)
+            cv2.add(roi, patch[region], dst=roi)
+        self.composited += 1
+        return frame
+
+    def _rebuild(self):
+        """Merge the visible element patches into one layer."""
+        self._dirty = False
+        visible = [element for element in self._elements.values() if element.text is not None]
+        if not visible:
+            self._layer = None
+            return
+
+        x0 = min(element.box[0] for element in visible)
+        y0 = min(element.box[1] for element in visible)
+        x1 = max(element.box[2] for element in visible)
+        y1 = max(element.box[3] for element in visible)
+        patch = np.zeros((y1 - y0, x1 - x0, 3), dtype=np.uint8)
+        alpha = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        for element in visible:
+            ex0, ey0, ex1, ey1 = element.box
+            target = (slice(ey0 - y0, ey1 - y0), slice(ex0 - x0, ex1 - x0))
+            # Later elements win where patches overlap
+            cv2.copyTo(element.patch, element.alpha, patch[target])
+            np.maximum(alpha[target], element.alpha, out=alpha[target])
+        alpha = cv2.merge((alpha, alpha, alpha))
+        premultiplied = cv2.multiply(patch, alpha, scale=1 / 255)
+        self._layer = (x0, y0, premultiplied, 255 - alpha)
+        self.rebuilt += 1
+
+    def get_stats(self):
+        return {
+            'rasterized': self.rasterized,
+            'rebuilt': self.rebuilt,
+            'composited': self.composited,
+        }
@@ -0,0 +1,448 @@
+"""
+Multi-stage executor for the VisionSlide main loop.
+
+capture -> detect -> recognize/map -> ActionDispatcher (key presses)
+                          |
+                          +-> render
+
+Each stage runs on its own thread and stages are connected by bounded
+StageQueues, so inference never waits on rendering. Actions go to an
+ActionDispatcher worker, so it never waits on key injection either.
+Rendering stays on the calling thread because cv2.imshow needs it, and
+runs at most render_fps times per second: in between, newer packets
+replace the one waiting to be shown. The HUD text comes from a cached
+Overlay, redrawn only when a value changes.
+In headless mode there is no render stage at all: nothing is drawn, no
+window is opened and the pipeline stops on SIGINT/SIGTERM.
+
+With a ProcessDetector, capture copies each frame once into a shared
+memory FrameRing slot; detection, recording and preview all read that
+slot and release it when done.
+"""
+import signal
+import threading
+import time
+import cv2
+from visionslide.config import *
+from visionslide.controls.action_dispatcher import ActionDispatcher
+from visionslide.pipeline.frame import Frame
+from visionslide.pipeline.overlay import Overlay
+from visionslide.pipeline.stage_queue import StageQueue
+from visionslide.utils.logger import setup_logger
+from visionslide.utils.metrics import (
+    get_metrics, RECOGNITION, MAPPING, RENDER, FRAME_TO_DECISION
+)
+
+WINDOW_NAME = 'VisionSlide - PowerPoint Gesture Control'
+
+# Returned by a stage function when its source is exhausted
+END_OF_STREAM = object()
+
+
+class Stage:
+    """
+    A worker thread pulling items from one queue and routing results.
+    When its input ends (queue closed and drained, or END_OF_STREAM) the
+    stage closes its outputs, so the pipeline drains front to back.
+    """
+
+    def __init__(self, name, func, input_queue, outputs=(), discard=None):
+        self.name = name
+        self.func = func
+        self.input_queue = input_queue
+        self.outputs = list(outputs)  # (queue, predicate or None)
+        self.discard = discard        # Called with an item lost to an error
+        self.processed = 0
+        self.logger = setup_logger(f'Pipeline.{name}')
+        self._thread = None
+
+    def start(self, stop_event):
+        self._thread = threading.Thread(
+            target=self._run, args=(stop_event,), name=f'Stage-{self.name}', daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, stop_event):
+        while not stop_event.is_set():
+            if self.input_queue is None:
+                item = None
+            else:
+                item = self.input_queue.get(timeout=0.1)
+                if item is None:
+                    if self.input_queue.closed:
+                        break
+                    continue
+
+            try:
+                result = self.func(item)
+            except Exception as e:
+                self.logger.error("Error in stage '%s': %s", self.name, e)
+                if self.discard and item is not None:
+                    self.discard(item)
+                continue
+
+            if result is END_OF_STREAM:
+                break
+            if result is None:
+                continue
+
+            self.processed += 1
+            for queue, predicate in self.outputs:
+                if predicate is None or predicate(result):
+                    queue.put(result)
+
+        for queue, _ in self.outputs:
+            queue.close()
+
+    def join(self, timeout=None):
+        if self._thread:
+            self._thread.join(timeout)
+
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+
+class VisionPipeline:
+    """Runs capture, detection, recognition, actions and rendering concurrently."""
+
+    def __init__(self, camera, gesture_detector, gesture_mapper, ppt_controller,
+                 queue_config=None, headless=False, power_manager=None, recorder=None,
+                 timeline=None, tracker=None, auto_tuner=None, render_fps=RENDER_FPS):
+        self.logger = setup_logger('VisionPipeline')
+        self.camera = camera
+        self.gesture_detector = gesture_detector
+        self.gesture_mapper = gesture_mapper
+        self.ppt_controller = ppt_controller
+        self.dispatcher = ActionDispatcher(ppt_controller, on_complete=self._on_action_done)
+        self.headless = headless
+        self.power_manager = power_manager
+        self.recorder = recorder
+        self.timeline = timeline
+        self.tracker = tracker
+        self.auto_tuner = auto_tuner
+        self.metrics = get_metrics()
+
+        config = dict(PIPELINE_QUEUES)
+        config.update(queue_config or {})
+        self.queues = {
+            name: StageQueue(name, maxsize=size, policy=policy, on_drop=self._release_frame)
+            for name, (size, policy) in config.items()
+        }
+
+        # Shared memory frames, when detection runs in another process
+        self.shared_frames = hasattr(gesture_detector, 'frame_ring')
+        self.frame_ring = None
+        self._display_buffer = None
+
+        # Preview: refresh rate independent of inference, cached HUD
+        self.render_interval = 1.0 / render_fps if render_fps else 0.0
+        self.hud = None if headless else self._create_hud()
+        self.rendered = 0
+        self.render_skipped = 0  # Replaced by a newer packet before being shown
+
+        self._stop_event = threading.Event()
+        self._seq = 0
+        self.last_action = None
+        self.last_action_time = 0
+
+        q = self.queues
+        recognize_outputs = [] if headless else [(q['render'], None)]
+
+        self.stages = [
+            Stage('capture', self._capture, None, [(q['detect'], None)]),
+            Stage('detect', self._detect, q['detect'], [(q['recognize'], None)],
+                  discard=self._release_frame),
+            Stage('recognize', self._recognize, q['recognize'], recognize_outputs,
+                  discard=self._release_frame),
+        ]
+
+    # ---- Stage functions -------------------------------------------------
+
+    def _capture(self, _):
+        frame = self.camera.read_frame()
+        if frame is None:
+            self.logger.warning("No more frames, draining pipeline")
+            return END_OF_STREAM
+
+        # Monotonic capture time when the camera knows it (threaded capture
+        # hands frames out later than it grabs them), otherwise now
+        t_capture = getattr(self.camera, 'last_capture_time', None) or time.monotonic()
+        # Scene time: capture time for a camera, recorded time for a replay
+        timestamp = getattr(self.camera, 'last_frame_time', None)
+        if timestamp is None:
+            timestamp = t_capture
+
+        # The camera's buffer, held by the packet until the pipeline is done
+        pool = getattr(self.camera, 'frame_pool', None)
+        slot = None
+        if self.shared_frames:
+            # The only copy of the frame: into a slot the detector process reads
+            self.frame_ring = self.gesture_detector.frame_ring(frame.shape)
+            slot = self.frame_ring.put(frame) if self.frame_ring else None
+            if pool:
+                pool.release(frame)
+                pool = None
+            if slot is None:
+                return None  # Every slot still in use (or new frame size): skip
+            frame = self.frame_ring.array(slot)
+
+        if self.recorder:
+            if slot is not None:
+                ring = self.frame_ring
+                ring.retain(slot)
+                self.recorder.write(frame, timestamp, release=lambda: ring.release(slot))
+            elif pool:
+                # Written without a copy (rendering draws on its own copy)
+                pool.retain(frame)
+                self.recorder.write(frame, timestamp, release=lambda: pool.release(frame))
+            else:
+                self.recorder.write(frame, timestamp)
+
+        self._seq += 1
+        return Frame(self._seq, t_capture, timestamp, frame, slot, pool)
+
+    def _detect(self, packet):
+        if self.auto_tuner:
+            # Reconfigures the detector, which only this thread may do
+            self.auto_tuner.update()
+        power_manager = self.power_manager
+        if power_manager and not power_manager.should_infer(packet.image, packet.timestamp):
+            # Static scene and no hand: skip MediaPipe for this frame
+            packet.t_detect = time.monotonic()
+            return packet
+
+        tracker = self.tracker
+        if tracker and not tracker.needs_inference():
+            # Keyframe mode, hand steady: the filter predicts this frame
+            packet.landmarks = packet.landmark_array = tracker.fill(packet.timestamp)
+            packet.handedness = self.gesture_detector.last_handedness
+            packet.t_detect = time.monotonic()
+            return packet
+
+        start = time.monotonic()
+        if packet.slot is not None:
+            packet.landmarks = self.gesture_detector.detect_slot(packet.slot)
+        else:
+            packet.landmarks = self.gesture_detector.detect_landmarks(packet.image)
+        if power_manager:
+            power_manager.report_hand(packet.landmarks is not None, packet.timestamp,
+                                      inference_time=time.monotonic() - start)
+        # Built once here, every recognition feature reads this array
+        packet.landmark_array = self.gesture_detector.get_landmark_array(packet.landmarks)
+        if tracker:
+            packet.landmark_array = tracker.update(packet.landmark_array, packet.timestamp)
+        if packet.landmarks is not None:
+            packet.handedness = self.gesture_detector.last_handedness
+        packet.t_detect = time.monotonic()
+        return packet
+
+    def _recognize(self, packet):
+        metrics = self.metrics
+        hand_landmarks = packet.landmark_array
+        start = time.perf_counter()
+        # Called without a hand too, so the swipe trajectory restarts
+        packet.gesture = self.gesture_detector.recognize_gesture(hand_landmarks, packet.timestamp)
+        if hand_landmarks is not None:
+            metrics.record(RECOGNITION, time.perf_counter() - start)
+
+        # Every frame votes, frames without a hand included
+        try:
+            start = time.perf_counter()
+            packet.action = self.gesture_mapper.update_gesture(
+                packet.gesture, hand_landmarks, self.gesture_detector, packet.timestamp,
+                confidence=packet.handedness[1] or 1.0
+            )
+            metrics.record(MAPPING, time.perf_counter() - start)
+        except Exception as e:
+            # Log error but continue running
+            packet.error = str(e)
+            self.logger.error("Error in gesture mapping: %s", e)
+
+        if self.timeline:
+            handedness, score = packet.handedness
+            self.timeline.append(packet.timestamp, packet.landmark_array, handedness,
+                                 score, packet.gesture, packet.action)
+
+        packet.t_decide = time.monotonic()
+        metrics.record(FRAME_TO_DECISION, packet.t_decide - packet.t_capture)
+        action = packet.action
+        if action == "exit":
+            print("Exit gesture detected - stopping VisionSlide")
+            self.stop()
+        elif action:
+            self.dispatcher.submit(action, packet.t_capture)
+        if self.headless:
+            self._release_frame(packet)
+        return packet
+
+    def _release_frame(self, packet):
+        """Give a packet's frame slot or camera buffer back once the pipeline is done with it."""
+        slot = packet.slot
+        if slot is not None:
+            packet.slot = None
+            self.frame_ring.release(slot)
+        pool = packet.pool
+        if pool is not None:
+            packet.pool = None
+            pool.release(packet.image)
+
+    def _on_action_done(self, action, t_capture, t_done):
+        """Called by the dispatcher once the key was sent."""
+        self.last_action = action
+        self.last_action_time = t_done
+
+    # ---- Rendering (caller thread) ---------------------------------------
+
+    @staticmethod
+    def _create_hud():
+        hud = Overlay()
+        hud.add('fps', (10, 30), (0, 255, 0))
+        hud.add('gesture', (10, 60), (255, 255, 255))
+        hud.add('action', (10, 90), (0, 0, 255))
+        hud.add('error', (10, 120), (0, 0, 255), scale=0.5, thickness=1)
+        hud.add('banner', (10, 150), (0, 255, 255))
+        return hud
+
+    def _render(self, packet):
+        """Draw the HUD and show the frame. Returns False when the user quits."""
+        start = time.perf_counter()
+        # Draw on a copy: the pooled frame is still held by the recorder, and
+        # by the camera, which hands it out again after a failed read
+        frame = packet.image
+        if self._display_buffer is None or self._display_buffer.shape != frame.shape:
+            self._display_buffer = frame.copy()
+        else:
+            self._display_buffer[:] = frame
+        frame = self._display_buffer
+        if packet.landmarks is not None:
+            self.gesture_detector.draw_landmarks(frame, packet.landmarks)
+
+        hud = self.hud
+        hud.set('fps', f"FPS: {self.camera.get_fps()}")
+        hud.set('gesture', f"Gesture: {packet.gesture}")
+        hud.set('action', f"Action: {packet.action}" if packet.action else None)
+        hud.set('error', f"Error: {packet.error[:20]}..." if packet.error else None)
+        # Show action confirmation
+        recent = time.monotonic() - self.last_action_time < ACTION_BANNER_DURATION
+        hud.set('banner', "ACTION EXECUTED" if recent else None)
+        hud.draw(frame)
+
+        cv2.imshow(WINDOW_NAME, frame)
+        self.metrics.record(RENDER, time.perf_counter() - start)
+        packet.t_render = time.monotonic()
+        self.rendered += 1
+
+        # Check for quit key
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord('q') or key == 27:  # 'q' or ESC
+            print("Quit signal received")
+            return False
+        return True
+
+    # ---- Lifecycle -------------------------------------------------------
+
+    def start(self):
+        """Start the action worker and the stage threads."""
+        self.dispatcher.start()
+        for stage in self.stages:
+            stage.start(self._stop_event)
+
+    def run(self):
+        """Start the worker stages and render (or wait) until stopped."""
+        self.start()
+        self.logger.info(f"Pipeline started ({'headless' if self.headless else 'windowed'})")
+
+        previous_handlers = self._install_signal_handlers() if self.headless else {}
+        render_queue = self.queues['render']
+        pending = None      # Newest packet waiting for the next refresh
+        next_render = 0.0
+        try:
+            while not self._stop_event.is_set():
+                if self.headless:
+                    if not any(stage.is_alive() for stage in self.stages):
+                        break
+                    self._stop_event.wait(0.1)
+                    continue
+                timeout = 0.1 if pending is None else max(next_render - time.monotonic(), 0.0)
+                packet = render_queue.get(timeout=timeout)
+                if packet is not None:
+                    if pending is not None:
+                        self._release_frame(pending)
+                        self.render_skipped += 1
+                    pending = packet
+                elif pending is None:
+                    if render_queue.closed:
+                        break
+                    continue
+
+                now = time.monotonic()
+                if now < next_render and not render_queue.closed:
+                    continue  # Show the last frame right away once the stream ends
+                next_render = now + self.render_interval
+                keep_running = self._render(pending)
+                self._release_frame(pending)
+                pending = None
+                if not keep_running:
+                    break
+        finally:
+            if pending is not None:
+                self._release_frame(pending)
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            self.stop()
+            for stage in self.stages:
+                stage.join(timeout=2.0)
+            for queue in self.queues.values():
+                for packet in queue.drain():
+                    self._release_frame(packet)
+            # Keys already decided are still sent
+            self.dispatcher.close()
+            self.logger.info(f"Pipeline stopped: {self.get_stats()}")
+
+    def _install_signal_handlers(self):
+        """Stop on SIGINT/SIGTERM instead of polling the keyboard."""
+        if threading.current_thread() is not threading.main_thread():
+            return {}
+
+        def handle_signal(signum, _frame):
+            print(f"Signal {signal.Signals(signum).name} received")
+            self.stop()
+
+        previous_handlers = {}
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous_handlers[signum] = signal.signal(signum, handle_signal)
+        return previous_handlers
+
+    def stop(self):
+        """Ask every stage to stop."""
+        if self._stop_event.is_set():
+            return
+        self._stop_event.set()
+        for queue in self.queues.values():
+            queue.close()
+
+    def is_running(self):
+        return not self._stop_event.is_set()
+
+    def get_stats(self):
+        """Get processed counts per stage and drop counts per queue."""
+        stats = {
+            'stages': {stage.name: stage.processed for stage in self.stages},
+            'queues': {name: queue.get_stats() for name, queue in self.queues.items()},
+            'actions': self.dispatcher.get_stats(),
+        }
+        if self.hud:
+            stats['render'] = {'rendered': self.rendered, 'skipped': self.render_skipped,
+                               'hud': self.hud.get_stats()}
+        if self.recorder:
+            stats['recording'] = self.recorder.get_stats()
+        if self.power_manager:
+            stats['power'] = self.power_manager.get_stats()
+        if self.tracker:
+            stats['landmarks'] = self.tracker.get_stats()
+        if self.auto_tuner:
+            stats['autotune'] = self.auto_tuner.get_stats()
+        if self.frame_ring:
+            stats['frame_slots'] = {'in_use': self.frame_ring.in_use(),
+                                    'exhausted': self.frame_ring.exhausted}
+        return stats
@@ -0,0 +1,124 @@
+"""
+Motion-gated inference and low-power idle state.
+
+While no hand is visible, frames that show no motion skip MediaPipe
+entirely. After IDLE_TIMEOUT seconds without a hand the camera drops to
+IDLE_FPS and the detector to IDLE_MODEL_COMPLEXITY; the first frame with
+motion restores full speed.
+"""
+import time
+from visionslide.config import *
+from visionslide.camera.motion_detector import MotionDetector
+from visionslide.utils.logger import setup_logger
+
+ACTIVE = "active"
+IDLE = "idle"
+
+
+class PowerManager:
+    """Decides per frame whether hand inference is worth running."""
+
+    def __init__(self, camera, gesture_detector, idle_timeout=IDLE_TIMEOUT,
+                 motion_detector=None):
+        self.logger = setup_logger('PowerManager')
+        self.camera = camera
+        self.gesture_detector = gesture_detector
+        self.idle_timeout = idle_timeout
+        self.motion_detector = motion_detector or MotionDetector()
+        self.active_model_complexity = MODEL_COMPLEXITY  # Restored on wake-up
+
+        self.state = ACTIVE
+        self.hand_visible = False
+        self.last_hand_time = None  # Set on the first frame (camera or recorded clock)
+        self.state_since = None
+        self._now = None
+
+        # Statistics
+        self.inferred_frames = 0
+        self.skipped_frames = 0
+        self.idle_time = 0.0
+        self.wake_count = 0
+        self.last_wake_latency = 0.0
+        self._inference_time = 0.0
+
+    def should_infer(self, frame, now=None):
+        """Return False when the frame can skip hand inference."""
+        now = self._clock(now)
+        motion = self.motion_detector.update(frame)
+
+        if motion and self.state == IDLE:
+            self._wake(now)
+
+        # A hand held still must keep being tracked
+        if motion or self.hand_visible:
+            return True
+
+        self.skipped_frames += 1
+        return False
+
+    def report_hand(self, hand_present, now=None, inference_time=0.0):
+        """Feed back the result of an inference."""
+        now = self._clock(now)
+        self.inferred_frames += 1
+        self._inference_time += inference_time
+        self.hand_visible = hand_present
+
+        if hand_present:
+            self.last_hand_time = now
+        elif self.state == ACTIVE and now - self.last_hand_time >= self.idle_timeout:
+            self._enter_idle(now)
+
+    def _clock(self, now):
+        now = time.monotonic() if now is None else now
+        if self.last_hand_time is None:
+            self.last_hand_time = self.state_since = now
+        self._now = now
+        return now
+
+    def _enter_idle(self, now):
+        self.state = IDLE
+        self.state_since = now
+        self.camera.set_fps(IDLE_FPS)
+        self.gesture_detector.set_model_complexity(IDLE_MODEL_COMPLEXITY)
+        self.logger.info(f"No hand for {self.idle_timeout:.0f}s, entering idle mode "
+                         f"({IDLE_FPS} FPS, model complexity {IDLE_MODEL_COMPLEXITY})")
+
+    def _wake(self, now):
+        start = time.monotonic()
+        self.camera.set_fps(FPS_TARGET)
+        self.gesture_detector.set_model_complexity(self.active_model_complexity)
+        self.last_wake_latency = time.monotonic() - start
+
+        self.idle_time += now - self.state_since
+        self.state = ACTIVE
+        self.state_since = now
+        # Give the hand a full timeout to show up before going idle again
+        self.last_hand_time = now
+        self.wake_count += 1
+        self.logger.info(f"Motion detected, back to full speed "
+                         f"(switch took {self.last_wake_latency * 1000:.1f} ms)")
+
+    def get_stats(self, now=None):
+        """
+        Get gating counters and savings estimates.
+        cpu_saved estimates the inference time avoided by skipped frames and
+        by the lower idle frame rate, using the mean measured inference time.
+        wake_latency_max bounds the extra gesture latency after idle: one idle
+        frame interval plus the time to switch back to full speed.
+        """
+        now = self._now if now is None else now
+        idle_time = self.idle_time + (now - self.state_since if self.state == IDLE else 0.0)
+        mean_inference = self._inference_time / self.inferred_frames if self.inferred_frames else 0.0
+        frames_not_captured = max(0.0, (FPS_TARGET - IDLE_FPS) * idle_time)
+        total = self.inferred_frames + self.skipped_frames
+
+        return {
+            'state': self.state,
+            'inferred_frames': self.inferred_frames,
+            'skipped_frames': self.skipped_frames,
+            'skip_ratio': self.skipped_frames / total if total else 0.0,
+            'idle_time': idle_time,
+            'wake_count': self.wake_count,
+            'cpu_saved': (self.skipped_frames + frames_not_captured) * mean_inference,
+            'wake_latency_max': 1.0 / IDLE_FPS + self.last_wake_latency,
+        }
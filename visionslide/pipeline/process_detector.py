@@ -0,0 +1,223 @@
+"""
+GestureDetector running in a separate process.
+
+Frames reach the detector process through a FrameRing in shared memory:
+only a slot number goes down the pipe, and only the (21, 3) landmark
+array and the handedness come back. Capture, preview and recording keep
+the main process, MediaPipe gets a core of its own.
+"""
+import multiprocessing
+import threading
+import time
+import numpy as np
+from visionslide.config import *
+from visionslide.gestures.classifier import load_classifier
+from visionslide.gestures.landmarks import classify_landmarks, draw_landmark_array
+from visionslide.gestures.swipe_detector import SwipeDetector
+from visionslide.pipeline.frame_ring import FrameRing
+from visionslide.pipeline.inference_server import default_detector_factory
+from visionslide.utils.logger import setup_logger
+from visionslide.utils.metrics import get_metrics, HANDS_PROCESS
+
+
+def _detector_main(conn, detector_factory):
+    """Detector process: answer detection requests on frames of the ring."""
+    logger = setup_logger('DetectorProcess')
+    detector = detector_factory()
+    if hasattr(detector, 'warm_up'):
+        detector.warm_up()
+    ring = None
+    conn.send(("ready",))
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+
+        command = message[0]
+        try:
+            if command == "detect":
+                start = time.perf_counter()
+                hand_landmarks = detector.detect_landmarks(ring.array(message[1]))
+                inference_time = time.perf_counter() - start
+                landmarks = detector.get_landmark_array(hand_landmarks)
+                if landmarks is None:
+                    conn.send((None, (None, 0.0), inference_time))
+                else:
+                    conn.send((np.array(landmarks, dtype=np.float32), detector.last_handedness,
+                               inference_time))
+            elif command == "ring":
+                if ring is not None:
+                    ring.close()
+                _, name, slots, shape = message
+                ring = FrameRing.attach(name, slots, shape)
+            elif command == "complexity":
+                detector.set_model_complexity(message[1])
+            elif command == "scale":
+                detector.set_inference_scale(message[1])
+            elif command == "stats":
+                conn.send(detector.get_inference_stats())
+        except Exception as e:
+            logger.error("Error in detector process: %s", e)
+            if command in ("detect", "stats"):
+                conn.send(None)
+
+    detector.release()
+    if ring is not None:
+        ring.close()
+
+
+class ProcessDetector:
+    """
+    Drop-in GestureDetector for the pipeline that runs MediaPipe in a
+    child process. Landmarks are returned as (21, 3) arrays.
+    """
+
+    def __init__(self, slots=SHARED_FRAME_SLOTS, detector_factory=default_detector_factory,
+                 start_timeout=PROCESS_START_TIMEOUT, gesture_model=GESTURE_MODEL):
+        self.logger = setup_logger('ProcessDetector')
+        self.metrics = get_metrics()
+        self.slots = slots
+        self.ring = None
+        self.model_complexity = MODEL_COMPLEXITY
+        self.inference_scale = 1.0
+        self.last_handedness = (None, 0.0)
+        self.last_inference_time = 0.0
+        self.swipe_detector = SwipeDetector() if SWIPE_GESTURES else None
+        # Gestures are classified here, only detection runs in the child
+        self.classifier = load_classifier(gesture_model)
+        self._classify = self.classifier.predict if self.classifier else classify_landmarks
+        self._lock = threading.Lock()
+        self._alive = True
+
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_detector_main, args=(child_conn, detector_factory),
+            name='DetectorProcess', daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+
+        # Importing MediaPipe takes a while, wait so the first frames are not lost
+        if self._conn.poll(start_timeout):
+            self._conn.recv()
+            self.logger.info(f"Detector process {self._process.pid} ready")
+        else:
+            self.logger.warning(f"Detector process not ready after {start_timeout:.0f}s")
+
+    def frame_ring(self, shape):
+        """The ring frames of this shape are shared through, created on first use."""
+        if self.ring is None:
+            self.ring = FrameRing(self.slots, shape)
+            self._send(("ring", self.ring.name, self.slots, self.ring.shape))
+            self.logger.info(f"Sharing frames through {self.slots} slots of {self.ring.shape}")
+        elif self.ring.shape != tuple(shape):
+            return None
+        return self.ring
+
+    def detect_slot(self, slot):
+        """Detect the hand in a ring slot; returns a (21, 3) array or None."""
+        reply = self._request(("detect", slot))
+        if reply is None:
+            self.last_handedness = (None, 0.0)
+            return None
+        landmarks, self.last_handedness, self.last_inference_time = reply
+        # Whole detection as timed in the child, its own registry is not exported
+        self.metrics.record(HANDS_PROCESS, self.last_inference_time)
+        return landmarks
+
+    def detect_landmarks(self, frame):
+        """Detect the hand in a BGR frame, copying it into the ring first."""
+        if frame is None:
+            return None
+        ring = self.frame_ring(frame.shape)
+        slot = ring.put(frame) if ring is not None else None
+        if slot is None:
+            self.logger.error("No free frame slot for detection")
+            return None
+        try:
+            return self.detect_slot(slot)
+        finally:
+            ring.release(slot)
+
+    def _send(self, message):
+        with self._lock:
+            self._conn.send(message)
+
+    def _request(self, message):
+        if not self._alive:
+            return None
+        with self._lock:
+            try:
+                self._conn.send(message)
+                return self._conn.recv()
+            except (EOFError, OSError) as e:
+                self._alive = False
+                self.logger.error(f"Detector process exited: {e}")
+                return None
+
+    def set_model_complexity(self, model_complexity):
+        """Switch the MediaPipe model complexity in the detector process."""
+        if model_complexity == self.model_complexity or not self._alive:
+            return
+        self._send(("complexity", model_complexity))
+        self.model_complexity = model_complexity
+
+    def set_inference_scale(self, inference_scale):
+        """Downscale frames by this factor before inference in the detector process."""
+        if inference_scale == self.inference_scale or not self._alive:
+            return
+        self._send(("scale", inference_scale))
+        self.inference_scale = inference_scale
+
+    def get_inference_stats(self):
+        """Get the detector process counters."""
+        return self._request(("stats",)) or {}
+
+    def get_landmark_array(self, hand_landmarks):
+        """Landmarks already come back as (21, 3) arrays."""
+        return hand_landmarks
+
+    def recognize_gesture(self, hand_landmarks, timestamp=None):
+        """Recognize the gesture of a (21, 3) landmark array, swipes included with a timestamp."""
+        if hand_landmarks is None:
+            if self.swipe_detector:
+                self.swipe_detector.reset()
+            return "no_hand"
+
+        try:
+            if timestamp is not None and self.swipe_detector:
+                swipe = self.swipe_detector.update(hand_landmarks, timestamp)
+                if swipe:
+                    return swipe
+            return self._classify(hand_landmarks)[0]
+        except Exception as e:
+            self.logger.error("Error recognizing gesture: %s", e)
+            return "error"
+
+    def draw_landmarks(self, frame, hand_landmarks):
+        """Draw a (21, 3) landmark array in place on a BGR frame."""
+        try:
+            draw_landmark_array(frame, hand_landmarks)
+        except Exception as e:
+            self.logger.error(f"Error drawing landmarks: {e}")
+        return frame
+
+    def release(self):
+        """Stop the detector process and free the shared frames."""
+        try:
+            if self._alive:
+                self._send(None)
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._conn.close()
+            if self.ring is not None:
+                self.ring.close()
+            self.logger.info("Detector process released")
+        except Exception as e:
+            self.logger.error(f"Error releasing detector process: {e}")
@@ -0,0 +1,115 @@
+"""
+Bounded queues connecting the pipeline stages.
+"""
+import collections
+import threading
+import time
+
+BLOCK = "block"              # Backpressure: the producer waits for room
+DROP_OLDEST = "drop_oldest"  # Make room by discarding the oldest item
+DROP_NEWEST = "drop_newest"  # Discard the incoming item when full
+
+POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST)
+
+
+class StageQueue:
+    """Bounded FIFO with a configurable policy when full."""
+
+    def __init__(self, name, maxsize=1, policy=DROP_OLDEST, put_timeout=None, on_drop=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy '{policy}', expected one of {POLICIES}")
+        self.name = name
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.put_timeout = put_timeout
+        self.on_drop = on_drop  # Called with every item that is dropped
+        self.dropped = 0
+        self.blocked_time = 0.0
+        self._items = collections.deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, item):
+        """
+        Enqueue an item according to the queue policy.
+        Returns False if the item was dropped or the queue is closed.
+        """
+        accepted, dropped = self._put(item)
+        if dropped is not None and self.on_drop:
+            self.on_drop(dropped)
+        return accepted
+
+    def _put(self, item):
+        """Returns (accepted, dropped item or None)."""
+        with self._cond:
+            if self._closed:
+                return False, item
+
+            dropped = None
+            if len(self._items) >= self.maxsize:
+                if self.policy == DROP_OLDEST:
+                    dropped = self._items.popleft()
+                    self.dropped += 1
+                elif self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return False, item
+                else:
+                    start = time.monotonic()
+                    has_room = self._cond.wait_for(
+                        lambda: len(self._items) < self.maxsize or self._closed,
+                        timeout=self.put_timeout
+                    )
+                    self.blocked_time += time.monotonic() - start
+                    if self._closed:
+                        return False, item
+                    if not has_room:
+                        self.dropped += 1
+                        return False, item
+
+            self._items.append(item)
+            self._cond.notify_all()
+            return True, dropped
+
+    def get(self, timeout=None):
+        """Dequeue the next item, or None on timeout or once closed and empty."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout=timeout):
+                return None
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def close(self):
+        """Close the queue and wake up every waiting producer and consumer."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def drain(self):
+        """Remove and return the items still queued."""
+        with self._cond:
+            items = list(self._items)
+            self._items.clear()
+            self._cond.notify_all()
+            return items
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def __len__(self):
+        with self._cond:
+            return len(self._items)
+
+    def get_stats(self):
+        """Get queue counters."""
+        with self._cond:
+            return {
+                'size': len(self._items),
+                'maxsize': self.maxsize,
+                'policy': self.policy,
+                'dropped': self.dropped,
+                'blocked_time': self.blocked_time,
+            }
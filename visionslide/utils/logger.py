@@ -1,19 +1,276 @@
 """
 Logging utility for VisionSlide.
+
+Loggers put their records on a queue and a single QueueListener thread
+formats and writes them, so a log call on the video path never blocks
+on stderr. A warning or error repeated word for word within
+LOG_DEDUP_WINDOW seconds is written once; when the window ends, the last
+copy is written with a repeated=N field counting the copies suppressed.
+INFO and DEBUG lines are never deduplicated.
+
+Use %-style arguments on hot paths, logger.error("Error: %s", e): the
+string is only built if the record passes the level check. It is built
+by the caller before the record is queued, so arguments may change
+afterwards; the listener thread only formats the line.
+Structured fields go in extra=fields(...) and are written as key=value
+pairs.
 """
+import atexit
+import copy
 import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from visionslide.config import *
+
+FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_exception_formatter = logging.Formatter()
+
+
+def fields(**values):
+    """extra= for a log call with structured fields: logger.info("msg", extra=fields(fps=30))."""
+    return {'fields': values}
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formats a record and appends its structured fields as key=value pairs."""
+
+    def format(self, record):
+        line = super().format(record)
+        values = getattr(record, 'fields', None)
+        if values:
+            line += " " + " ".join(f"{key}={value}" for key, value in values.items())
+        return line
+
+
+class StderrHandler(logging.StreamHandler):
+    """Writes to whatever sys.stderr is when the record is written."""
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+
+def _with_count(record, repeated):
+    record.fields = dict(getattr(record, 'fields', None) or {}, repeated=repeated)
+    return record
+
+
+class DedupFilter(logging.Filter):
+    """
+    Lets a message at level or above through once per window and counts
+    the copies it drops; expired() hands back the count of each window
+    that ended.
+    """
+
+    def __init__(self, window=LOG_DEDUP_WINDOW, level=logging.WARNING):
+        super().__init__()
+        self.window = window
+        self.level = level
+        self.suppressed = 0
+        self._seen = {}  # (logger, level, message) -> [window end, suppressed, last record]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.window <= 0 or record.levelno < self.level:
+            return True
+        # The formatted message: the same template with other values is another message
+        key = (record.name, record.levelno, record.getMessage())
+        now = record.created
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is not None and now < entry[0]:
+                entry[1] += 1
+                entry[2] = record
+                self.suppressed += 1
+                return False
+            self._seen[key] = [now + self.window, 0, None]
+        return True
+
+    def expired(self, now):
+        """
+        Last suppressed copy of each message whose window ended, with its
+        count. A message still repeating gets a new window from now.
+        """
+        records = []
+        with self._lock:
+            for key, entry in list(self._seen.items()):
+                if entry[0] > now:
+                    continue
+                if entry[1]:
+                    records.append(_with_count(entry[2], entry[1]))
+                    self._seen[key] = [now + self.window, 0, None]
+                else:
+                    del self._seen[key]
+        return records
+
+    def pending(self):
+        """Last suppressed copy of every message, with its count, and forget them."""
+        with self._lock:
+            records = [_with_count(entry[2], entry[1]) for entry in self._seen.values() if entry[1]]
+            self._seen.clear()
+        return records
+
+
+class DedupStderrHandler(StderrHandler):
+    """Synchronous fallback: deduplicates, and writes ended windows on the next record."""
+
+    def __init__(self, dedup):
+        super().__init__()
+        self.dedup = dedup
+
+    def handle(self, record):
+        for summary in self.dedup.expired(record.created):
+            super().handle(summary)
+        if self.dedup.filter(record):
+            return super().handle(record)
+        return False
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records as they are; drops them, counted, when the queue is full."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        """
+        Build the message and traceback text now: the arguments and the
+        exception may change, or hold frames alive, before the listener
+        gets to the record. Formatting the line stays on the listener.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Listener(logging.handlers.QueueListener):
+    """Writes each count of suppressed repeats as its window ends."""
+
+    def __init__(self, log_queue, dedup, *handlers):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.dedup = dedup
+        # Wake up this often when idle, so a count is never held until exit
+        self.tick = min(dedup.window, 1.0) if dedup.window > 0 else None
+        self._next_check = 0.0
+
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.tick)
+            except queue.Empty:
+                if not block:
+                    raise
+                self._write_expired(time.time())
+
+    def handle(self, record):
+        self._write_expired(record.created)
+        super().handle(record)
+
+    def _write_expired(self, now):
+        if self.tick is None or now < self._next_check:
+            return
+        self._next_check = now + self.tick
+        for summary in self.dedup.expired(now):
+            super().handle(summary)
+
+    def enqueue_sentinel(self):
+        # Wait for room: stopping must not fail on a full queue
+        self.queue.put(self._sentinel)
+
+
+class LogBackend:
+    """A queue, the handler loggers write to, and the listener thread draining it."""
+
+    def __init__(self, handlers, queue_size=LOG_QUEUE_SIZE, dedup_window=LOG_DEDUP_WINDOW):
+        self.handlers = list(handlers)
+        self.dedup = DedupFilter(dedup_window)
+        self.handler = AsyncQueueHandler(queue.Queue(maxsize=queue_size))
+        # On the caller side: repeats never take room in the queue
+        self.handler.addFilter(self.dedup)
+        self.listener = _Listener(self.handler.queue, self.dedup, *self.handlers)
+        self._started = False
+
+    def start(self):
+        if not self._started:
+            self.listener.start()
+            self._started = True
+        return self
+
+    def stop(self):
+        """Write everything still queued, then the counts of windows still open."""
+        if not self._started:
+            return
+        self.listener.stop()
+        self._started = False
+        for record in self.dedup.pending():
+            for handler in self.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+        if self.handler.dropped:
+            for handler in self.handlers:
+                handler.handle(logging.makeLogRecord({
+                    'name': 'Logging', 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                    'msg': "Log queue full, messages dropped",
+                    'fields': {'dropped': self.handler.dropped},
+                }))
+        for handler in self.handlers:
+            handler.flush()
+
+    def get_stats(self):
+        return {'suppressed': self.dedup.suppressed, 'dropped': self.handler.dropped}
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """The process-wide backend writing to stderr, started on first use."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            stream = StderrHandler()
+            stream.setFormatter(StructuredFormatter(FORMAT))
+            _backend = LogBackend([stream]).start()
+            atexit.register(shutdown_logging)
+        return _backend
+
+
+def shutdown_logging():
+    """Flush and stop the background writer (also run at exit)."""
+    if _backend is not None:
+        _backend.stop()
+
 
 def setup_logger(name):
     """Setup logger with consistent formatting."""
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
+    logger.setLevel(LOG_LEVEL)
+
     if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
+        if LOG_ASYNC:
+            handler = get_backend().handler
+        else:
+            handler = DedupStderrHandler(DedupFilter())
+            handler.setFormatter(StructuredFormatter(FORMAT))
         logger.addHandler(handler)
-    
-    return logger
\ No newline at end of file
+
+    return logger
@@ -0,0 +1,302 @@
+"""
+Low-overhead latency metrics for the real-time loop.
+
+Each stage records durations into a LatencyHistogram: fixed log-spaced
+buckets (~4% resolution from 10 us to 10 s), O(1) record, constant
+memory. Exporters publish p50/p95/p99 either as a periodic log line or
+as Prometheus text on a local HTTP endpoint.
+"""
+import abc
+import math
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from visionslide.config import *
+from visionslide.utils.logger import setup_logger
+
+# Stage names used across the pipeline
+CAPTURE = "capture"
+COLOR_CONVERSION = "color_conversion"
+HANDS_PROCESS = "hands_process"
+RECOGNITION = "recognition"
+MAPPING = "mapping"
+ACTION = "action"
+RENDER = "render"
+FRAME_TO_DECISION = "frame_to_decision"   # Capture until the gesture/action decision
+FRAME_TO_KEYSTROKE = "frame_to_keystroke"  # Capture until the key was injected
+REMOTE_RTT = "remote_rtt"                   # Remote action sent until acknowledged
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+_MIN_VALUE = 1e-5
+_GROWTH = 1.08
+_LOG_GROWTH = math.log(_GROWTH)
+_NUM_BUCKETS = int(math.ceil(math.log(10.0 / _MIN_VALUE) / _LOG_GROWTH)) + 2
+
+
+class HistogramSnapshot:
+    """Immutable copy of a histogram, subtractable for windowed percentiles."""
+
+    def __init__(self, counts, count, total, maximum):
+        self.counts = counts
+        self.count = count
+        self.total = total
+        self.max = maximum
+
+    def since(self, earlier):
+        """Histogram of the values recorded after an earlier snapshot."""
+        if earlier is None:
+            return self
+        counts = tuple(a - b for a, b in zip(self.counts, earlier.counts))
+        return HistogramSnapshot(counts, self.count - earlier.count,
+                                 self.total - earlier.total, self.max)
+
+    def percentile(self, q):
+        """Approximate q-quantile in seconds (0 when empty)."""
+        if self.count <= 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank and bucket_count:
+                return min(_bucket_value(index), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+def _bucket_value(index):
+    """Representative value (geometric middle) of a bucket."""
+    if index == 0:
+        return _MIN_VALUE
+    return _MIN_VALUE * _GROWTH ** (index - 0.5)
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram."""
+
+    def __init__(self):
+        self._counts = [0] * _NUM_BUCKETS
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        """Record one duration in seconds."""
+        if seconds <= _MIN_VALUE:
+            index = 0
+        else:
+            index = min(_NUM_BUCKETS - 1, 1 + int(math.log(seconds / _MIN_VALUE) / _LOG_GROWTH))
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._total += seconds
+            if seconds > self._max:
+                self._max = seconds
+
+    def snapshot(self):
+        with self._lock:
+            return HistogramSnapshot(tuple(self._counts), self._count, self._total, self._max)
+
+    def percentile(self, q):
+        return self.snapshot().percentile(q)
+
+
+class MetricsRegistry:
+    """Named latency histograms and counters."""
+
+    def __init__(self, enabled=METRICS_ENABLED):
+        self.enabled = enabled
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def record(self, name, seconds):
+        """Record a duration for a stage."""
+        if self.enabled:
+            self.histogram(name).record(seconds)
+
+    def increment(self, name, value=1):
+        """Add to a counter."""
+        if self.enabled:
+            with self._lock:
+                self._counters[name] = self._counters.get(name, 0) + value
+
+    @contextmanager
+    def timer(self, name):
+        """Time a block: `with metrics.timer(RENDER): ...`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def snapshot(self):
+        """Snapshots of every histogram, by name."""
+        with self._lock:
+            names = list(self._histograms)
+        return {name: self._histograms[name].snapshot() for name in names}
+
+    def counters(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def summary(self, since=None):
+        """
+        {name: {'count', 'mean', 'p50', 'p95', 'p99', 'max'}} in seconds.
+        With since (an earlier snapshot()) only the values recorded after it.
+        """
+        since = since or {}
+        summary = {}
+        for name, snapshot in self.snapshot().items():
+            window = snapshot.since(since.get(name))
+            summary[name] = {
+                'count': window.count,
+                'mean': window.mean,
+                'p50': window.percentile(0.5),
+                'p95': window.percentile(0.95),
+                'p99': window.percentile(0.99),
+                'max': window.max,
+            }
+        return summary
+
+
+_default_registry = MetricsRegistry()
+
+
+def get_metrics():
+    """The process-wide metrics registry."""
+    return _default_registry
+
+
+def format_prometheus(registry):
+    """Render the registry in the Prometheus text exposition format."""
+    lines = [
+        "# HELP visionslide_latency_seconds Per-stage latency of the VisionSlide pipeline.",
+        "# TYPE visionslide_latency_seconds summary",
+    ]
+    for name, snapshot in sorted(registry.snapshot().items()):
+        for q in QUANTILES:
+            lines.append(f'visionslide_latency_seconds{{stage="{name}",quantile="{q}"}} '
+                         f'{snapshot.percentile(q):.6f}')
+        lines.append(f'visionslide_latency_seconds_sum{{stage="{name}"}} {snapshot.total:.6f}')
+        lines.append(f'visionslide_latency_seconds_count{{stage="{name}"}} {snapshot.count}')
+
+    for name, value in sorted(registry.counters().items()):
+        lines.append(f"# TYPE visionslide_{name}_total counter")
+        lines.append(f"visionslide_{name}_total {value}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter(abc.ABC):
+    """Base class for metrics exporters."""
+
+    def __init__(self, registry=None):
+        self.registry = registry or get_metrics()
+
+    @abc.abstractmethod
+    def start(self):
+        """Start exporting; returns self."""
+
+    @abc.abstractmethod
+    def stop(self):
+        """Stop exporting and release the thread or socket."""
+
+
+class LogExporter(MetricsExporter):
+    """Logs one line of percentiles per stage every interval seconds."""
+
+    def __init__(self, interval=METRICS_LOG_INTERVAL, registry=None):
+        super().__init__(registry)
+        self.logger = setup_logger('Metrics')
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._last = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='MetricsLog', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.log_once()
+
+    def log_once(self):
+        """Log the percentiles recorded since the previous line."""
+        snapshot = self.registry.snapshot()
+        summary = self.registry.summary(since=self._last)
+        self._last = snapshot
+
+        parts = [
+            f"{name} p50={stats['p50'] * 1000:.1f} p95={stats['p95'] * 1000:.1f} "
+            f"p99={stats['p99'] * 1000:.1f}ms n={stats['count']}"
+            for name, stats in sorted(summary.items()) if stats['count']
+        ]
+        if parts:
+            self.logger.info("latency | " + " | ".join(parts))
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+
+
+class PrometheusExporter(MetricsExporter):
+    """Serves the registry as Prometheus text on http://host:port/metrics."""
+
+    def __init__(self, port=METRICS_PORT, host="127.0.0.1", registry=None):
+        super().__init__(registry)
+        self.logger = setup_logger('Metrics')
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = format_prometheus(registry).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            self.logger.error(f"Could not serve metrics on {self.host}:{self.port}: {e}")
+            return self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='MetricsHTTP', daemon=True)
+        self._thread.start()
+        self.logger.info(f"Metrics available at http://{self.host}:{self.port}/metrics")
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()